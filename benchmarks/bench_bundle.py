@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Time loading and scoring a corpus from `.forecast` files against a packed bundle.
+
+python benchmarks/bench_bundle.py --forecasts 5000
+
+"files" parses every file's YAML header and scores each forecast, as
+`forecast --no-cache` does. "bundle" memory-maps the bundle and scores the
+frame in one pass, with and without the staleness check against the sources.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Callable
+
+from forecast.bundle import load_bundle, pack
+from forecast.loader import iter_forecasts
+
+TEMPLATES = {
+    "interval": "min: {a}\nmax: {c}\nconfidence: 0.9\n",
+    "choice": "options:\n  yes: 0.7\n  no: 0.3\n",
+    "pert": "min: {a}\nmode: {b}\nmax: {c}\n",
+    "lognormal": "p5: {a}\np50: {b}\np95: {c}\n",
+    "pareto": "p90: {a}\np99: {c}\n",
+}
+
+
+def write_corpus(root: str, count: int, seed: int) -> None:
+    rng = random.Random(seed)
+    os.makedirs(root)
+    types = list(TEMPLATES)
+    for i in range(count):
+        type = types[i % len(types)]
+        a = rng.randrange(1, 50)
+        body = TEMPLATES[type].format(a=a, b=a * 2, c=a * 5)
+        if rng.random() < 0.5:
+            body += "outcome: yes\n" if type == "choice" else f"outcome: {a * 2}\n"
+        with open(os.path.join(root, f"f{i}.forecast"), "w") as f:
+            f.write(
+                f"---\nscenario: Scenario {i}\ntype: {type}\n"
+                f"end_date: 2025-0{1 + i % 9}-1{i % 10}\ntags: [team-{i % 7}]\n"
+                f"{body}---\nNotes.\n"
+            )
+
+
+def timed(fn: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--forecasts", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = os.path.join(directory, ".forecasts")
+        path = os.path.join(directory, "forecasts.bundle")
+        write_corpus(root, args.forecasts, args.seed)
+
+        def from_files() -> None:
+            for item in iter_forecasts(root, jobs=1):
+                if hasattr(item, "outcome"):
+                    item.score()
+
+        files = timed(from_files)
+        packing = timed(lambda: pack(root, path, jobs=1))
+        checked = timed(lambda: load_bundle(path).score_all())
+        unchecked = timed(lambda: load_bundle(path, check=False).score_all())
+        size = os.path.getsize(path)
+
+    print(f"{args.forecasts} forecasts, bundle {size / 1024:.0f} KiB")
+    print(f"files:                {files * 1000:9.1f} ms")
+    print(f"pack:                 {packing * 1000:9.1f} ms")
+    print(f"bundle, checked:      {checked * 1000:9.1f} ms  {files / checked:6.1f}x")
+    print(
+        f"bundle, unchecked:    {unchecked * 1000:9.1f} ms  {files / unchecked:6.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
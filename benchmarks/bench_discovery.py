@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Compare recursive discovery with a naive listdir + stat walk on a deep tree.
+
+python benchmarks/bench_discovery.py --entries 100000 --depth 8
+
+The tree mixes `.forecast` files, other files and `.gitignore`d directories,
+spread over `--depth` levels of nested directories.
+"""
+
+import argparse
+import fnmatch
+import os
+import random
+import tempfile
+import time
+from typing import Callable, List
+
+from forecast.discovery import discover
+
+
+def build_tree(root: str, entries: int, depth: int, fanout: int, seed: int) -> int:
+    """Create about `entries` files and directories; return the number of forecasts."""
+    rng = random.Random(seed)
+    directories = [root]
+    created = 0
+    forecasts = 0
+    # Directories first, breadth first, until the tree is `depth` levels deep
+    for level in range(depth):
+        for parent in directories[-(fanout**level) :]:
+            for i in range(fanout):
+                path = os.path.join(parent, f"d{level}-{i}")
+                os.mkdir(path)
+                directories.append(path)
+                created += 1
+    # Ignore a slice of the tree, like a build or vendored directory would be
+    with open(os.path.join(root, ".gitignore"), "w") as f:
+        f.write("d1-0/\n*.tmp.forecast\n")
+    while created < entries:
+        directory = rng.choice(directories)
+        kind = rng.random()
+        if kind < 0.5:
+            name = f"f{created}.forecast"
+            forecasts += 1
+        elif kind < 0.55:
+            name = f"f{created}.tmp.forecast"
+        else:
+            name = f"f{created}.md"
+        open(os.path.join(directory, name), "w").close()
+        created += 1
+    return forecasts
+
+
+def naive(root: str) -> List[str]:
+    """What a listdir-based walk costs: one stat per entry to tell files from dirs.
+
+    The tree's ignore rules are hard-coded, so both walks find the same files.
+    """
+    found = []
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if os.path.isdir(path):
+                if name not in (".git", "d1-0"):
+                    pending.append(path)
+            elif fnmatch.fnmatch(name, "*.forecast") and not fnmatch.fnmatch(
+                name, "*.tmp.forecast"
+            ):
+                found.append(os.path.relpath(path, root))
+    return found
+
+
+def best_of(repeat: int, fn: Callable[[], List[str]]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--fanout", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        build_tree(root, args.entries, args.depth, args.fanout, args.seed)
+        found = len(list(discover(root)))
+        walked = len(naive(root))
+        naive_time = best_of(args.repeat, lambda: naive(root))
+        discover_time = best_of(args.repeat, lambda: list(discover(root)))
+        first = time.perf_counter()
+        next(discover(root))
+        first = time.perf_counter() - first
+
+    print(f"{args.entries} entries, {args.depth} levels deep")
+    print(f"listdir + stat:  {naive_time * 1000:9.1f} ms  ({walked} files)")
+    print(f"discover:        {discover_time * 1000:9.1f} ms  ({found} files)")
+    print(f"first path:      {first * 1000:9.3f} ms")
+    print(f"speedup:         {naive_time / discover_time:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Compare scoring templated forecasts with and without the fitted-distribution cache.
+
+python benchmarks/bench_fitted.py --forecasts 20000 --templates 50
+
+Forecasts are drawn from `--templates` parameter sets per type, as when they
+are created from templates, and each has its own outcome. "uncached" refits the
+distribution for every forecast, as `calc()` used to.
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Callable, List
+from unittest import mock
+
+from forecast.factory import create_forecast
+from forecast.header import Metadata
+from forecast.models.math import fitted
+from forecast.models.math.lognormal import LogNormal
+from forecast.models.math.pareto import Pareto
+from forecast.models.math.PERT import PERT
+
+
+def make_forecasts(count: int, templates: int, seed: int) -> List[Any]:
+    rng = random.Random(seed)
+    params = []
+    for _ in range(templates):
+        low = rng.uniform(1, 10)
+        params.append(("pert", dict(min=low, mode=low * 2, max=low * 5)))
+        params.append(("lognormal", dict(p5=low, p50=low * 2, p95=low * 6)))
+        params.append(("pareto", dict(p90=low, p99=low * 4)))
+    forecasts = []
+    for i in range(count):
+        type, fields = rng.choice(params)
+        metadata = {
+            "scenario": f"s{i}",
+            "end_date": "2024-01-01",
+            "type": type,
+            "outcome": rng.uniform(1, 40),
+        }
+        metadata.update(fields)
+        forecasts.append(create_forecast(Metadata(metadata)))
+    return forecasts
+
+
+def best_of(repeat: int, fn: Callable[[], None]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--forecasts", type=int, default=20_000)
+    parser.add_argument("--templates", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    forecasts = make_forecasts(args.forecasts, args.templates, args.seed)
+
+    def score() -> None:
+        for forecast in forecasts:
+            forecast.calc()
+
+    with mock.patch.multiple(
+        fitted,
+        pert=lambda *p: PERT(*p),
+        lognormal=lambda *p: LogNormal(*p),
+        pareto=lambda *p: Pareto(*p),
+    ):
+        uncached = best_of(args.repeat, score)
+    fitted.cache_clear()
+    cached = best_of(args.repeat, score)
+
+    print(f"{args.forecasts} forecasts from {args.templates} templates per type")
+    print(f"uncached:  {uncached * 1000:9.1f} ms")
+    print(f"cached:    {cached * 1000:9.1f} ms")
+    print(f"speedup:   {uncached / cached:9.2f}x")
+    for name, info in fitted.cache_info().items():
+        print(f"{name:10} hits {info.hits:8}  misses {info.misses:6}")
+
+
+if __name__ == "__main__":
+    main()
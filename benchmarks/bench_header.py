@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Compare `frontmatter.load` with the header-only reader on forecasts with long bodies.
+
+python benchmarks/bench_header.py --files 2000 --body-kb 64
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import frontmatter  # type: ignore
+
+from forecast.header import read_header
+
+HEADER = """---
+scenario: benchmark {i}
+end_date: 2025-01-01
+type: pert
+tags: [bench, header]
+min: 1
+mode: 5
+max: 10
+outcome: 4
+---
+"""
+
+
+def write_corpus(directory: str, files: int, body_kb: int) -> list:
+    paths = []
+    body = ("Some long write-up about the forecast. " * 26 + "\n") * body_kb
+    for i in range(files):
+        path = os.path.join(directory, f"{i}.forecast")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(HEADER.format(i=i))
+            f.write(body)
+        paths.append(path)
+    return paths
+
+
+def best_of(repeat: int, fn, paths: list) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            fn(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--body-kb", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_corpus(directory, args.files, args.body_kb)
+        full = best_of(args.repeat, frontmatter.load, paths)
+        header = best_of(args.repeat, read_header, paths)
+
+    print(f"{args.files} files, ~{args.body_kb} KiB bodies")
+    print(f"frontmatter.load: {full * 1000:9.1f} ms")
+    print(f"read_header:      {header * 1000:9.1f} ms")
+    print(f"speedup:          {full / header:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Bytes held per in-memory forecast, measured with tracemalloc.
+
+python benchmarks/bench_memory.py --forecasts 1000000
+
+Forecasts are created the way the loader creates them: from a fresh metadata
+dict per file, whose strings (tags, option names, types) are new objects as
+they would be coming out of the YAML parser. Only the forecasts are kept, so
+the figure is what a long-running integration pays to hold a corpus.
+"""
+
+import argparse
+import datetime
+import gc
+import random
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from forecast.factory import create_forecast
+from forecast.header import Metadata
+
+TYPES = ("interval", "choice", "pert", "lognormal", "pareto")
+START = datetime.date(2024, 1, 1)
+
+
+def fresh(text: str) -> str:
+    # A new string object with the same value, as each YAML parse produces
+    return "".join(list(text))
+
+
+def make_metadata(i: int, type: str, rng: random.Random) -> Dict[str, Any]:
+    metadata: Dict[str, Any] = {
+        "scenario": f"Scenario {i}",
+        "type": fresh(type),
+        "end_date": START + datetime.timedelta(days=rng.randrange(730)),
+        "tags": [fresh(f"team-{rng.randrange(20)}"), fresh("q3")],
+    }
+    low = rng.randrange(1, 100)
+    if type == "interval":
+        metadata.update(min=low, max=low * 3, confidence=0.9)
+    elif type == "choice":
+        metadata["options"] = {fresh("yes"): 0.7, fresh("no"): 0.2, fresh("maybe"): 0.1}
+    elif type == "pert":
+        metadata.update(min=low, mode=low * 2, max=low * 5)
+    elif type == "lognormal":
+        metadata.update(p5=low, p50=low * 2, p95=low * 6)
+    else:
+        metadata.update(p90=low, p99=low * 4)
+    if rng.random() < 0.5:
+        metadata["outcome"] = fresh("yes") if type == "choice" else low * 2
+    return metadata
+
+
+def measure(count: int, types: List[str], seed: int) -> float:
+    rng = random.Random(seed)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    forecasts = [
+        create_forecast(Metadata(make_metadata(i, types[i % len(types)], rng)))
+        for i in range(count)
+    ]
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    # Don't count the list itself, only what it refers to
+    held -= 8 * len(forecasts)
+    return held / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--forecasts", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--per-type", action="store_true", help="Also measure each type on its own."
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    overall = measure(args.forecasts, list(TYPES), args.seed)
+    print(f"{args.forecasts} forecasts, all types: {overall:8.1f} bytes/forecast")
+    if args.per_type:
+        for type in TYPES:
+            per_type = measure(args.forecasts // len(TYPES), [type], args.seed)
+            print(f"{type:10} {per_type:8.1f} bytes/forecast")
+    print(f"took {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Cost and accuracy of the normal CDF/quantile against the kernels they replaced.
+
+python benchmarks/bench_normal.py --calls 200000
+
+Errors are measured against `statistics.NormalDist`, whose quantile is also
+AS241; the old quantile is shown as it was used, including the 1/sqrt(2) factor
+that should have been sqrt(2).
+"""
+
+import argparse
+import math
+import random
+import statistics
+import time
+from typing import Callable, List
+
+from forecast.models.math import normal, vectorized
+
+
+def old_erf(x: float) -> float:
+    """The previous CDF kernel: Abramowitz-Stegun 7.1.26."""
+    sign = 1 if x >= 0 else -1
+    x = abs(x)
+    t = 1 / (1 + 0.3275911 * x)
+    y = 1 - (
+        (((((1.061405429 * t - 1.453152027) * t) + 1.421413741) * t - 0.284496736) * t)
+        + 0.254829592
+    ) * t * math.exp(-x * x)
+    return sign * y
+
+
+def old_erfinv(y: float) -> float:
+    """The previous quantile kernel: Winitzki's approximation with a = 0.147."""
+    a = 0.147
+    ln = math.log(1 - y**2)
+    s = (2 / (math.pi * a)) + (ln / 2)
+    return math.copysign(math.sqrt(math.sqrt(s**2 - ln / a) - s), y)
+
+
+def old_cdf(z: float) -> float:
+    return 0.5 * (1 + old_erf(z / math.sqrt(2)))
+
+
+def old_ppf(p: float) -> float:
+    return (1 / math.sqrt(2)) * old_erfinv(2 * p - 1)
+
+
+def per_call_ns(fn: Callable[[float], float], xs: List[float]) -> float:
+    start = time.perf_counter()
+    for x in xs:
+        fn(x)
+    return (time.perf_counter() - start) / len(xs) * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    zs = [rng.gauss(0, 2) for _ in range(args.calls)]
+    ps = [rng.uniform(1e-6, 1 - 1e-6) for _ in range(args.calls)]
+    reference = statistics.NormalDist()
+
+    print("scalar                 ns/call    max abs error")
+    for name, fn, xs, exact in [
+        ("old cdf (A-S erf)", old_cdf, zs, reference.cdf),
+        ("norm_cdf (erfc)", normal.norm_cdf, zs, reference.cdf),
+        ("old ppf (Winitzki)", old_ppf, ps, reference.inv_cdf),
+        ("norm_ppf (AS241)", normal.norm_ppf, ps, reference.inv_cdf),
+    ]:
+        error = max(abs(fn(x) - exact(x)) for x in xs[:10_000])
+        print(f"{name:20} {per_call_ns(fn, xs):9.1f}    {error:12.2e}")
+    tail = normal.norm_cdf(-8)
+    print(f"relative error of cdf(-8): old {abs(old_cdf(-8) - tail) / tail:.2e}, new 0")
+
+    if not vectorized.HAS_NUMPY:
+        return
+    import numpy as np  # type: ignore
+
+    za, pa = np.array(zs), np.array(ps)
+
+    def old_cdf_array(z):
+        x = np.abs(z) / math.sqrt(2)
+        t = 1 / (1 + 0.3275911 * x)
+        poly = (
+            (((1.061405429 * t - 1.453152027) * t + 1.421413741) * t - 0.284496736) * t
+            + 0.254829592
+        ) * t
+        return 0.5 * (1 + np.sign(z) * (1 - poly * np.exp(-x * x)))
+
+    def old_ppf_array(p):
+        y = 2 * p - 1
+        ln = np.log(1 - y**2)
+        s = (2 / (math.pi * 0.147)) + (ln / 2)
+        return np.copysign(np.sqrt(np.sqrt(s**2 - ln / 0.147) - s), y) / math.sqrt(2)
+
+    # What norm_cdf did before Cody's erfc: one math.erfc call per element
+    erfc_per_element = np.frompyfunc(math.erfc, 1, 1)
+
+    def per_element_cdf_array(z):
+        return 0.5 * np.asarray(erfc_per_element(-z / math.sqrt(2)), float)
+
+    print("batched                ns/value")
+    for name, fn, xs in [
+        ("old cdf", old_cdf_array, za),
+        ("math.erfc per value", per_element_cdf_array, za),
+        ("norm_cdf", vectorized.norm_cdf, za),
+        ("old ppf", old_ppf_array, pa),
+        ("norm_ppf", vectorized.norm_ppf, pa),
+    ]:
+        start = time.perf_counter()
+        fn(xs)
+        print(f"{name:20} {(time.perf_counter() - start) / len(xs) * 1e9:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Per-call cost of `PERT.cdf` and `PERT.ppf` against the implementations they replaced.
+
+python benchmarks/bench_pert.py --calls 20000
+"""
+
+import argparse
+import math
+import random
+import time
+
+from forecast.models.math import vectorized
+from forecast.models.math.PERT import PERT
+
+
+def riemann_cdf(pert: PERT, x: float) -> float:
+    """The previous implementation: a left Riemann sum over a gamma-based pdf."""
+    if x <= pert.xmin:
+        return 0.0
+    if x >= pert.xmax:
+        return 1.0
+    u = (x - pert.xmin) / pert.range
+    a, b = pert.alpha, pert.beta
+
+    def pdf(t: float) -> float:
+        if t <= 0 or t >= 1:
+            return 0.0
+        B = math.gamma(a) * math.gamma(b) / math.gamma(a + b)
+        return (t ** (a - 1)) * ((1 - t) ** (b - 1)) / B
+
+    steps = 100
+    dx = u / steps
+    return sum(pdf(i * dx) for i in range(1, steps + 1)) * dx
+
+
+def bisection_ppf(pert: PERT, p: float) -> float:
+    """The previous implementation: bisection to 1e-5 in probability."""
+    low, high = pert.xmin, pert.xmax
+    for _ in range(100):
+        mid = (low + high) / 2
+        cdf_val = riemann_cdf(pert, mid)
+        if abs(cdf_val - p) < 1e-5:
+            return mid
+        if cdf_val < p:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+
+def per_call_us(fn, cases: list) -> float:
+    start = time.perf_counter()
+    for pert, x in cases:
+        fn(pert, x)
+    return (time.perf_counter() - start) / len(cases) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cases = []
+    for _ in range(args.calls):
+        lo = rng.uniform(0, 100)
+        hi = lo + rng.uniform(1, 100)
+        pert = PERT(lo, rng.uniform(lo, hi), hi)
+        cases.append((pert, rng.uniform(lo, hi)))
+
+    old = per_call_us(riemann_cdf, cases)
+    new = per_call_us(PERT.cdf, cases)
+    worst = max(abs(riemann_cdf(p, x) - p.cdf(x)) for p, x in cases)
+    print(f"Riemann sum cdf:       {old:8.2f} us/call")
+    print(f"incomplete beta cdf:   {new:8.2f} us/call")
+    print(f"speedup:               {old / new:8.1f}x")
+    print(f"max |old - new|:       {worst:8.2e}")
+
+    summaries = [(pert, 0.05) for pert, _ in cases[: max(1, args.calls // 100)]]
+    old = per_call_us(bisection_ppf, summaries)
+    new = per_call_us(PERT.ppf, summaries)
+    many = per_call_us(lambda pert, _: pert.ppf_many([0.05, 0.5, 0.95]), summaries) / 3
+    print(f"bisection ppf:         {old:8.2f} us/call")
+    print(f"Newton ppf:            {new:8.2f} us/call")
+    print(f"ppf_many (p5/p50/p95): {many:8.2f} us/quantile")
+
+    if not vectorized.HAS_NUMPY:
+        return
+    import numpy as np  # type: ignore
+
+    xs = np.array([x for _, x in cases])
+    params = [
+        np.array([getattr(p, name) for p, _ in cases])
+        for name in ("xmin", "mode", "xmax")
+    ]
+    print("batched (one array)    scalar us/call   batched us/value")
+    for name, scalar, batched in [
+        ("cdf", PERT.cdf, vectorized.pert_cdf),
+        ("pdf", PERT.pdf, vectorized.pert_pdf),
+        ("crps", PERT.crps, vectorized.pert_crps),
+        ("log_score", PERT.log_score, vectorized.pert_log_score),
+    ]:
+        start = time.perf_counter()
+        batched(xs, *params)
+        elapsed = (time.perf_counter() - start) / len(cases) * 1e6
+        print(f"{name:20} {per_call_us(scalar, cases):14.2f} {elapsed:18.3f}")
+
+
+if __name__ == "__main__":
+    main()
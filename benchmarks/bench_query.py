@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Time `--where` predicate pushdown, and measure top-k memory.
+
+python benchmarks/bench_query.py --files 10000
+
+"post-filter" loads, builds and scores every forecast and then applies the
+expression, as a filter on the finished list would. "pushdown" passes it to
+`iter_forecasts`, which drops files by their header before building them. The
+top-k rows compare the peak memory of sorting every forecast with a bounded heap;
+what remains for top-k is mostly the listing of the one flat corpus directory.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from corpus import write_corpus
+
+from forecast.loader import ForecastError, iter_forecasts
+from forecast.query import Where, parse_sort, top_k
+
+EXPRESSION = "tag = security and open and end_date < today+90d"
+
+
+def timed(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def peak(fn: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    fn()
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    where = Where(EXPRESSION)
+    keys = parse_sort("-score,end_date")
+    with tempfile.TemporaryDirectory() as directory:
+        root = os.path.join(directory, ".forecasts")
+        write_corpus(root, args.files, args.seed)
+
+        def forecasts(**kwargs: Any) -> Any:
+            return (
+                item
+                for item in iter_forecasts(root, jobs=1, **kwargs)
+                if not isinstance(item, ForecastError)
+            )
+
+        post = timed(lambda: [f for f in forecasts() if where.matches(f)])
+        pushed = timed(lambda: list(forecasts(where=where)))
+        full = peak(lambda: top_k(forecasts(), keys, None))
+        bounded = peak(lambda: top_k(forecasts(), keys, args.limit))
+
+    print(f"{args.files} forecasts, where {EXPRESSION!r}")
+    print(f"post-filter:   {post * 1000:9.1f} ms")
+    print(f"pushdown:      {pushed * 1000:9.1f} ms  {post / pushed:5.1f}x")
+    print(f"sort all:      {full / 1024:9.0f} KiB peak")
+    print(f"top {args.limit:<4}       {bounded / 1024:9.0f} KiB peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Time filtered queries against the file and SQLite storage backends.
+
+python benchmarks/bench_storage.py --files 10000
+
+"files" runs each query as `forecast --tag ...` does, with the score cache and
+metadata index warm. "sqlite" syncs the database (nothing changed) and runs the
+query in SQL. The first sqlite run, which builds the database, is timed apart.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, List
+
+from corpus import write_corpus
+
+from forecast.query import Where
+from forecast.storage import FileStorage, Query, SQLiteStorage
+
+QUERIES = {
+    "tag": Query(tag="security"),
+    "type + tag": Query(type="pert", tag="q1"),
+    "due in 30 days": Query(where=Where("end_date <= today+30d and open")),
+    "score >= 0.5": Query(where=Where("score >= 0.5")),
+}
+
+
+def timed(fn: Callable[[], List[object]]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = os.path.join(directory, ".forecasts")
+        write_corpus(root, args.files, args.seed)
+        files = FileStorage(root, jobs=1, use_cache=True)
+        sqlite = SQLiteStorage(root, jobs=1)
+        list(files.select(Query(type="pert")))  # warm the cache and index
+        build = timed(lambda: list(sqlite.select(Query())))
+
+        print(f"{args.files} forecasts, sqlite build {build * 1000:.0f} ms")
+        for name, query in QUERIES.items():
+            count = len(list(sqlite.select(query)))
+            slow = timed(lambda: list(files.select(query)))
+            fast = timed(lambda: list(sqlite.select(query)))
+            print(
+                f"{name:16} {count:6} rows  files {slow * 1000:8.1f} ms  "
+                f"sqlite {fast * 1000:8.1f} ms  {slow / fast:6.1f}x"
+            )
+        sqlite.close()
+
+
+if __name__ == "__main__":
+    main()
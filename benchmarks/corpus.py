@@ -0,0 +1,144 @@
+"""Seeded generator for synthetic `.forecast` corpora.
+
+python benchmarks/corpus.py /tmp/corpus --files 10000 --seed 1
+"""
+
+import argparse
+import datetime
+import os
+import random
+from typing import List
+
+TYPES = ("choice", "interval", "pert", "lognormal", "pareto")
+TAGS = (
+    "infra",
+    "security",
+    "q1",
+    "q2",
+    "q3",
+    "q4",
+    "hiring",
+    "product",
+    "ops",
+    "finance",
+)
+WORDS = (
+    "the forecast estimate risk project outcome team scope date launch budget".split()
+)
+
+
+def _body(rng: random.Random) -> str:
+    # Most forecasts have a short note; a few carry long write-ups
+    size = int(rng.lognormvariate(6, 1.5))
+    words = [rng.choice(WORDS) for _ in range(size // 6)]
+    return "\n".join(" ".join(words[i : i + 12]) for i in range(0, len(words), 12))
+
+
+def _choice(rng: random.Random, closed: bool) -> List[str]:
+    n = rng.randint(2, 5)
+    cuts = sorted(rng.sample(range(1, 100), n - 1))
+    percents = [b - a for a, b in zip([0] + cuts, cuts + [100])]
+    lines = ["options:"]
+    lines += [f'    "Option {i}": {p / 100}' for i, p in enumerate(percents)]
+    if closed:
+        lines.append(f'outcome: "Option {rng.randrange(n)}"')
+    return lines
+
+
+def _interval(rng: random.Random, closed: bool) -> List[str]:
+    low = rng.uniform(0, 100)
+    high = low + rng.uniform(1, 100)
+    lines = [
+        f"min: {low:.2f}",
+        f"max: {high:.2f}",
+        f"confidence: {rng.choice([0.5, 0.8, 0.9, 0.95])}",
+    ]
+    if closed:
+        lines.append(f"outcome: {rng.uniform(low - 20, high + 20):.2f}")
+    return lines
+
+
+def _pert(rng: random.Random, closed: bool) -> List[str]:
+    low = rng.uniform(0, 100)
+    high = low + rng.uniform(1, 100)
+    mode = rng.uniform(low, high)
+    lines = [f"min: {low:.2f}", f"mode: {mode:.2f}", f"max: {high:.2f}"]
+    if closed:
+        lines.append(f"outcome: {rng.uniform(low, high):.2f}")
+    return lines
+
+
+def _lognormal(rng: random.Random, closed: bool) -> List[str]:
+    p50 = rng.uniform(10, 1000)
+    spread = rng.uniform(1.2, 5)
+    lines = [f"p5: {p50 / spread:.2f}", f"p50: {p50:.2f}", f"p95: {p50 * spread:.2f}"]
+    if closed:
+        lines.append(f"outcome: {p50 * rng.lognormvariate(0, 0.5):.2f}")
+    return lines
+
+
+def _pareto(rng: random.Random, closed: bool) -> List[str]:
+    p90 = rng.uniform(10, 1000)
+    lines = [f"p90: {p90:.2f}", f"p99: {p90 * rng.uniform(1.5, 10):.2f}"]
+    if closed:
+        lines.append(f"outcome: {p90 * rng.uniform(0.5, 3):.2f}")
+    return lines
+
+
+FIELDS = {
+    "choice": _choice,
+    "interval": _interval,
+    "pert": _pert,
+    "lognormal": _lognormal,
+    "pareto": _pareto,
+}
+
+
+def forecast_text(rng: random.Random, i: int) -> str:
+    """Return the text of one random `.forecast` file."""
+    forecast_type = rng.choice(TYPES)
+    closed = rng.random() < 0.6
+    end_date = datetime.date(2025, 1, 1) + datetime.timedelta(
+        days=rng.randint(-1000, 1000)
+    )
+    lines = [
+        "---",
+        f"scenario: synthetic {forecast_type} forecast {i}",
+        f"end_date: {end_date}",
+        f"type: {forecast_type}",
+    ]
+    tags = rng.sample(TAGS, rng.randint(0, 4))
+    if tags:
+        lines.append(f"tags: [{', '.join(tags)}]")
+    lines += FIELDS[forecast_type](rng, closed)
+    lines += ["---", "", _body(rng), ""]
+    return "\n".join(lines)
+
+
+def write_corpus(directory: str, files: int, seed: int = 0) -> List[str]:
+    """Write `files` synthetic forecasts into `directory` and return their names.
+
+    The same seed always produces the same corpus.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    filenames = []
+    for i in range(files):
+        filename = f"synthetic-{i:07d}.forecast"
+        with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+            f.write(forecast_text(rng, i))
+        filenames.append(filename)
+    return filenames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("directory")
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_corpus(args.directory, args.files, args.seed)
+
+
+if __name__ == "__main__":
+    main()
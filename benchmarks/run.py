@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Time each phase of a `forecast` run on a synthetic corpus and emit JSON.
+
+    python benchmarks/run.py --files 10000 --output before.json
+    python benchmarks/run.py --files 10000 --compare before.json --threshold 0.1
+
+With --compare, phases that got slower than the baseline by more than the
+threshold are flagged and the exit status is 1.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from corpus import write_corpus
+
+from forecast.discovery import discover
+from forecast.factory import create_forecast
+from forecast.forecast import display_forecasts
+from forecast.header import read_header
+from forecast.models.math.lognormal import LogNormal
+from forecast.models.math.pareto import Pareto
+from forecast.models.math.PERT import PERT
+
+TYPES = ("choice", "interval", "pert", "lognormal", "pareto")
+MATH_CALLS = 10000
+
+
+def best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_phases(directory: str, repeat: int, seed: int) -> Dict[str, float]:
+    phases: Dict[str, float] = {}
+
+    def scan() -> List[str]:
+        return list(discover(directory))
+
+    phases["scan"] = best_of(repeat, scan)
+    paths = [os.path.join(directory, f) for f in scan()]
+
+    phases["parse"] = best_of(repeat, lambda: [read_header(p) for p in paths])
+    posts = [read_header(p) for p in paths]
+
+    phases["create_forecast"] = best_of(
+        repeat, lambda: [create_forecast(p) for p in posts]
+    )
+    forecasts = [create_forecast(p) for p in posts]
+
+    for forecast_type in TYPES:
+        closed = [
+            f for f in forecasts if f.type == forecast_type and hasattr(f, "outcome")
+        ]
+        phases[f"calc.{forecast_type}"] = best_of(
+            repeat, lambda: [f.calc() for f in closed]
+        )
+
+    rng = random.Random(seed)
+    xs = [rng.uniform(0, 1) for _ in range(MATH_CALLS)]
+    pert, lognormal, pareto = PERT(1, 4, 10), LogNormal(2, 5, 20), Pareto(3, 9)
+    phases["math.PERT.cdf"] = best_of(repeat, lambda: [pert.cdf(1 + 9 * x) for x in xs])
+    phases["math.LogNormal.ppf"] = best_of(
+        repeat, lambda: [lognormal.ppf(0.001 + 0.998 * x) for x in xs]
+    )
+    phases["math.Pareto.pdf_to_probability"] = best_of(
+        repeat, lambda: [pareto.pdf_to_probability(3 + 20 * x) for x in xs]
+    )
+
+    ordered = sorted(forecasts, key=lambda f: f.end_date)
+
+    def display() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            display_forecasts(ordered)
+
+    phases["display_forecasts"] = best_of(repeat, display)
+    return phases
+
+
+def compare(phases: Dict[str, float], baseline_path: str, threshold: float) -> bool:
+    """Print each phase against the baseline; return True if any regressed."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["phases"]
+    regressed = False
+    print(
+        f"{'phase':34} {'baseline':>10} {'current':>10} {'ratio':>7}", file=sys.stderr
+    )
+    for name, seconds in phases.items():
+        if name not in baseline:
+            continue
+        ratio = seconds / baseline[name] if baseline[name] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(
+            f"{name:34} {baseline[name] * 1000:8.2f}ms {seconds * 1000:8.2f}ms {ratio:6.2f}x{flag}",
+            file=sys.stderr,
+        )
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--output", help="Write the JSON results here instead of stdout."
+    )
+    parser.add_argument("--compare", help="A previous JSON result to compare against.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown that counts as a regression (default: 0.1).",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_corpus(directory, args.files, args.seed)
+        phases = run_phases(directory, args.repeat, args.seed)
+
+    result = {
+        "meta": {
+            "commit": git_commit(),
+            "files": args.files,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "math_calls": MATH_CALLS,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "phases": phases,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare and compare(phases, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
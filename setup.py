@@ -28,6 +28,10 @@ setup(
     ],
     python_requires=">=3.9",
     install_requires=requirements,
+    extras_require={
+        "numpy": ["numpy"],
+        "arrow": ["pyarrow"],
+    },
     entry_points={
         "console_scripts": [
             "forecast=forecast.forecast:entrypoint",
@@ -1 +1,2 @@
 from .forecast import entrypoint  # type:ignore
+from .loader import ForecastError, iter_forecasts
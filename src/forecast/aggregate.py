@@ -0,0 +1,341 @@
+# pyre-strict
+"""Mergeable score aggregates, for scoring a corpus in shards on several machines.
+
+`forecast score --shard i/n --output part.json` writes a ScoreReport over one
+slice of the files, and `forecast merge part*.json` folds the partials into the
+report a single run over every file produces. Both parts of the report merge
+exactly, whatever the order:
+
+- sums are kept as Shewchuk's exact floating point expansions, and only rounded,
+  once, when they are read;
+- quantiles come from a DDSketch-style histogram with logarithmic buckets, whose
+  counts simply add up.
+"""
+
+import json
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+# Bump when the layout of partial aggregate files changes.
+AGGREGATE_FORMAT = 1
+# Quantiles are within this relative error of a score that was recorded
+SKETCH_ACCURACY = 0.01
+# Scores at or below this go to the sketch's zero bucket
+SKETCH_MIN = 1e-9
+
+
+class ExactSum:
+    """The exact sum of a stream of floats, as non-overlapping partials.
+
+    `add` is Shewchuk's grow-expansion (the algorithm behind `math.fsum`), so no
+    rounding error is ever dropped, and `value` rounds the exact total once. Two
+    sums of the same numbers therefore agree to the last bit, however they were
+    split up and merged.
+
+    Attributes:
+        partials (list[float]): Non-overlapping floats summing to the exact total
+    """
+
+    __slots__ = ("partials",)
+
+    def __init__(self, partials: Optional[List[float]] = None) -> None:
+        self.partials: List[float] = list(partials or [])
+
+    def add(self, x: float) -> None:
+        partials = self.partials
+        i = 0
+        for y in partials:
+            if abs(x) < abs(y):
+                x, y = y, x
+            hi = x + y
+            lo = y - (hi - x)
+            if lo:
+                partials[i] = lo
+                i += 1
+            x = hi
+        partials[i:] = [x]
+
+    def merge(self, other: "ExactSum") -> None:
+        for x in other.partials:
+            self.add(x)
+
+    @property
+    def value(self) -> float:
+        return math.fsum(self.partials)
+
+
+class QuantileSketch:
+    """A mergeable quantile sketch of non-negative scores (DDSketch).
+
+    A score x > SKETCH_MIN is counted in bucket ceil(log(x) / log(gamma)), with
+    gamma = (1 + accuracy) / (1 - accuracy), so any quantile is reported within
+    `accuracy` relative error. Buckets are only created as needed: a few hundred
+    cover every Brier score. Merging adds counts, so it is exact and commutative.
+
+    Args:
+        accuracy (float): The relative accuracy of reported quantiles
+    """
+
+    __slots__ = ("accuracy", "log_gamma", "zero", "buckets")
+
+    def __init__(self, accuracy: float = SKETCH_ACCURACY) -> None:
+        self.accuracy = accuracy
+        self.log_gamma: float = math.log((1 + accuracy) / (1 - accuracy))
+        self.zero = 0
+        self.buckets: Dict[int, int] = {}
+
+    @property
+    def count(self) -> int:
+        return self.zero + sum(self.buckets.values())
+
+    def add(self, x: float) -> None:
+        if x <= SKETCH_MIN:
+            self.zero += 1
+            return
+        key = math.ceil(math.log(x) / self.log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.accuracy != self.accuracy:
+            raise ValueError("Can't merge sketches with different accuracies.")
+        self.zero += other.zero
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def quantile(self, q: float) -> float:
+        """The q-quantile (0 <= q <= 1) of the recorded scores, or NaN if empty."""
+        count = self.count
+        if count == 0:
+            return math.nan
+        rank = q * (count - 1)
+        seen = self.zero
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # The value with equal relative error to both edges of the bucket
+                gamma = math.exp(self.log_gamma)
+                return 2 * math.exp(key * self.log_gamma) / (gamma + 1)
+        return math.nan  # unreachable: the last bucket holds the largest rank
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "accuracy": self.accuracy,
+            "zero": self.zero,
+            "buckets": sorted(self.buckets.items()),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(data["accuracy"])
+        sketch.zero = data["zero"]
+        sketch.buckets = {int(key): int(count) for key, count in data["buckets"]}
+        return sketch
+
+
+class ScoreStats:
+    """Count, exact sum and sum of squares, and a quantile sketch of some scores.
+
+    Attributes:
+        n (int): Number of scores
+        total (ExactSum): Sum of the scores
+        squares (ExactSum): Sum of the squared scores
+        sketch (QuantileSketch): Distribution of the scores
+    """
+
+    __slots__ = ("n", "total", "squares", "sketch")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.total = ExactSum()
+        self.squares = ExactSum()
+        self.sketch = QuantileSketch()
+
+    def add(self, score: float) -> None:
+        self.n += 1
+        self.total.add(score)
+        self.squares.add(score * score)
+        self.sketch.add(score)
+
+    def merge(self, other: "ScoreStats") -> None:
+        self.n += other.n
+        self.total.merge(other.total)
+        self.squares.merge(other.squares)
+        self.sketch.merge(other.sketch)
+
+    @property
+    def mean(self) -> float:
+        return self.total.value / self.n if self.n else math.nan
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation."""
+        if not self.n:
+            return math.nan
+        total = self.total.value
+        variance = (self.squares.value - total * total / self.n) / self.n
+        return math.sqrt(max(variance, 0.0))
+
+    def quantile(self, q: float) -> float:
+        return self.sketch.quantile(q)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "n": self.n,
+            "sum": self.total.partials,
+            "squares": self.squares.partials,
+            "sketch": self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScoreStats":
+        stats = cls()
+        stats.n = data["n"]
+        stats.total = ExactSum(data["sum"])
+        stats.squares = ExactSum(data["squares"])
+        stats.sketch = QuantileSketch.from_dict(data["sketch"])
+        return stats
+
+
+class ScoreReport:
+    """Brier score statistics overall, per type and per tag, mergeable across shards.
+
+    Attributes:
+        overall (ScoreStats): Every scored forecast
+        by_type (dict[str, ScoreStats]): Per forecast type
+        by_tag (dict[str, ScoreStats]): Per tag; "" collects untagged forecasts
+        open (int): Forecasts without an outcome
+        unscored (int): Resolved forecasts that couldn't be scored
+        errors (int): Files that failed to load
+        shards (list[tuple[int, int]]): The shards (i, n) folded into this report
+        filters (dict[str, str | None]): The tag and type the run was filtered by
+        fingerprint (str): Hash of the scoring code, see `cache.scoring_fingerprint`
+
+    Args:
+        shard: The shard (i, n) this report covers; (1, 1) for the whole corpus
+        filters: The tag and type the run was filtered by
+        fingerprint: Hash of the scoring code that produced the scores
+    """
+
+    def __init__(
+        self,
+        shard: Tuple[int, int] = (1, 1),
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        fingerprint: str = "",
+    ) -> None:
+        self.overall = ScoreStats()
+        self.by_type: Dict[str, ScoreStats] = {}
+        self.by_tag: Dict[str, ScoreStats] = {}
+        self.open = 0
+        self.unscored = 0
+        self.errors = 0
+        self.shards: List[Tuple[int, int]] = [shard]
+        self.filters: Dict[str, Optional[str]] = dict(filters or {})
+        self.fingerprint = fingerprint
+
+    def add(self, forecast: Any) -> None:
+        """Count one forecast, scoring it if it is resolved."""
+        if not hasattr(forecast, "outcome"):
+            self.open += 1
+            return
+        try:
+            score = forecast.score()
+        except (ValueError, TypeError):
+            self.unscored += 1
+            return
+        self.overall.add(score)
+        self.by_type.setdefault(forecast.type, ScoreStats()).add(score)
+        tags = list(dict.fromkeys(str(tag) for tag in forecast.tags)) or [""]
+        for tag in tags:
+            self.by_tag.setdefault(tag, ScoreStats()).add(score)
+
+    def add_error(self) -> None:
+        """Count a file that failed to load."""
+        self.errors += 1
+
+    def merge(self, other: "ScoreReport") -> None:
+        """Fold in the report of another shard.
+
+        Raises:
+            ValueError: If the reports were filtered or scored differently, count
+                shards of a different n, or overlap
+        """
+        if other.filters != self.filters:
+            raise ValueError(
+                f"Partials were filtered differently: {self.filters} and {other.filters}."
+            )
+        if other.fingerprint != self.fingerprint:
+            raise ValueError("Partials were scored by different versions of forecast.")
+        if {n for _, n in self.shards + other.shards} != {self.shards[0][1]}:
+            raise ValueError(
+                "Partials split the corpus into different numbers of shards."
+            )
+        overlap = set(self.shards) & set(other.shards)
+        if overlap:
+            shards = ", ".join(f"{i}/{n}" for i, n in sorted(overlap))
+            raise ValueError(f"Shard {shards} was given more than once.")
+        self.overall.merge(other.overall)
+        for mine, theirs in (
+            (self.by_type, other.by_type),
+            (self.by_tag, other.by_tag),
+        ):
+            for key, stats in theirs.items():
+                mine.setdefault(key, ScoreStats()).merge(stats)
+        self.open += other.open
+        self.unscored += other.unscored
+        self.errors += other.errors
+        self.shards = sorted(self.shards + other.shards)
+
+    def missing_shards(self) -> List[Tuple[int, int]]:
+        """The shards of the corpus not folded in yet."""
+        n = self.shards[0][1]
+        return [(i, n) for i in range(1, n + 1) if (i, n) not in self.shards]
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "format": AGGREGATE_FORMAT,
+                "fingerprint": self.fingerprint,
+                "filters": self.filters,
+                "shards": self.shards,
+                "counts": {
+                    "open": self.open,
+                    "unscored": self.unscored,
+                    "errors": self.errors,
+                },
+                "overall": self.overall.to_dict(),
+                "by_type": {k: v.to_dict() for k, v in sorted(self.by_type.items())},
+                "by_tag": {k: v.to_dict() for k, v in sorted(self.by_tag.items())},
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> "ScoreReport":
+        """Read a partial written by `to_json`.
+
+        Raises:
+            ValueError: If it isn't a partial aggregate in a format this version reads
+        """
+        try:
+            data = json.loads(text)
+            if data.get("format") != AGGREGATE_FORMAT:
+                raise ValueError(
+                    f"Unsupported partial aggregate format {data.get('format')}."
+                )
+            report = cls(fingerprint=data["fingerprint"], filters=data["filters"])
+            report.shards = [(int(i), int(n)) for i, n in data["shards"]]
+            report.open = data["counts"]["open"]
+            report.unscored = data["counts"]["unscored"]
+            report.errors = data["counts"]["errors"]
+            report.overall = ScoreStats.from_dict(data["overall"])
+            report.by_type = {
+                k: ScoreStats.from_dict(v) for k, v in data["by_type"].items()
+            }
+            report.by_tag = {
+                k: ScoreStats.from_dict(v) for k, v in data["by_tag"].items()
+            }
+        except (KeyError, TypeError, AttributeError, json.JSONDecodeError) as e:
+            raise ValueError(f"Not a partial aggregate: {e}") from e
+        return report
@@ -0,0 +1,339 @@
+# pyre-strict
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from forecast.frame import NUMERIC_FIELDS, ForecastFrame
+
+# A bundle starts with MAGIC and the format version, then a directory of sections.
+# Bump BUNDLE_FORMAT when the layout changes; older readers refuse newer bundles.
+MAGIC = b"FCBUNDLE"
+BUNDLE_FORMAT = 3
+# magic, format, number of sections, number of rows
+HEADER = struct.Struct("<8sIIQ")
+# name, array typecode, (padding), byte offset, number of items
+SECTION = struct.Struct("<24sc7xQQ")
+# Sections start on multiples of this, so every column can be viewed in place
+ALIGN = 8
+DEFAULT_BUNDLE = "forecasts.bundle"
+
+# Frame columns stored as-is, by name
+COLUMNS = (
+    "end_date",
+    "type_code",
+    "has_outcome",
+    "tag_ids",
+    "tag_offsets",
+    *NUMERIC_FIELDS,
+    "option_probs",
+    "option_offsets",
+)
+
+
+class StaleBundleError(ValueError):
+    """The source files changed since the bundle was packed."""
+
+
+class PackedStrings(Sequence[str]):
+    """A read-only sequence of strings packed as UTF-8, decoded on access.
+
+    Args:
+        offsets: Item i is data[offsets[i]:offsets[i + 1]]
+        data: The concatenated UTF-8 bytes
+    """
+
+    def __init__(self, offsets: Any, data: Any) -> None:
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return bytes(self.data[start:end]).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[i] for i in range(len(self)))
+
+
+class SourceFile(NamedTuple):
+    """Fingerprint of one source file, as it was when the bundle was packed.
+
+    Attributes:
+        filename (str): Path relative to the source root
+        size (int): Size in bytes
+        mtime_ns (int): Modification time
+        digest (bytes): The file's `header_digest`, as raw bytes
+    """
+
+    filename: str
+    size: int
+    mtime_ns: int
+    digest: bytes
+
+
+class Bundle(NamedTuple):
+    """A loaded bundle.
+
+    Attributes:
+        frame (ForecastFrame): The forecasts, with columns viewing the bundle
+        source_root (str): The directory the bundle was packed from. It is stored
+            relative to the bundle's own directory, and resolved against it here
+        sources (list[SourceFile]): Every `.forecast` file found when packing,
+            including any that failed to load
+    """
+
+    frame: ForecastFrame
+    source_root: str
+    sources: List[SourceFile]
+
+
+def _pack_strings(values: Sequence[str]) -> Tuple[array, bytes]:
+    offsets = array("q", [0])
+    data = bytearray()
+    for value in values:
+        data += str(value).encode("utf-8")
+        offsets.append(len(data))
+    return offsets, bytes(data)
+
+
+def fingerprint(root: str, filename: str) -> SourceFile:
+    """The SourceFile of `filename` under `root` as it is now."""
+    from forecast.header import header_digest
+
+    path = os.path.join(root, filename)
+    st = os.stat(path)
+    digest = bytes.fromhex(header_digest(path))
+    return SourceFile(filename, st.st_size, st.st_mtime_ns, digest)
+
+
+def write_bundle(
+    path: str, frame: ForecastFrame, source_root: str, sources: Sequence[SourceFile]
+) -> None:
+    """Write `frame` and the fingerprints of its sources to `path`, atomically.
+
+    Columns are written little-endian, each aligned to ALIGN bytes, after a
+    fixed-size header and a section directory. `source_root` is stored relative
+    to the bundle's directory, so the check finds the same tree from any working
+    directory, and after moving the two together.
+    """
+    import tempfile
+
+    directory_dir = os.path.dirname(os.path.abspath(path))
+    try:
+        source_root = os.path.relpath(os.path.abspath(source_root), directory_dir)
+    except ValueError:  # on another drive
+        source_root = os.path.abspath(source_root)
+    sections: List[Tuple[str, str, bytes, int]] = []
+
+    def add(name: str, values: Any) -> None:
+        if not isinstance(values, array):
+            values = array("B", values)
+        if sys.byteorder != "little":
+            values = array(values.typecode, values)
+            values.byteswap()
+        sections.append((name, values.typecode, values.tobytes(), len(values)))
+
+    for name in COLUMNS:
+        add(name, getattr(frame, name))
+    # Strings are packed as `<name>_offsets` (q) into UTF-8 `<name>_data` (B)
+    for name, values in (
+        ("filename", frame.filename),
+        ("scenario", frame.scenario),
+        ("tag_names", frame.tag_names),
+        ("source_root", [source_root]),
+        ("source_names", [s.filename for s in sources]),
+    ):
+        offsets, data = _pack_strings(values)
+        add(f"{name}_offsets", offsets)
+        add(f"{name}_data", data)
+    add("source_sizes", array("q", [s.size for s in sources]))
+    add("source_mtimes", array("q", [s.mtime_ns for s in sources]))
+    add("source_digests", b"".join(s.digest for s in sources))
+
+    start = HEADER.size + SECTION.size * len(sections)
+    directory = bytearray()
+    body = bytearray()
+    for name, typecode, data, count in sections:
+        body += bytes(-(start + len(body)) % ALIGN)
+        offset = start + len(body)
+        directory += SECTION.pack(name.encode(), typecode.encode(), offset, count)
+        body += data
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, BUNDLE_FORMAT, len(sections), len(frame)))
+            f.write(directory)
+            f.write(body)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_bundle(path: str) -> Bundle:
+    """Memory-map a bundle; columns are views of the file, nothing is parsed.
+
+    Raises:
+        ValueError: If the file isn't a bundle, or was written by a newer format
+    """
+    import mmap
+
+    with open(path, "rb") as f:
+        try:
+            data: Any = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # an empty file can't be mapped
+            data = b""
+    view = memoryview(data)
+    if len(view) < HEADER.size:
+        raise ValueError(f"'{path}' is not a forecast bundle.")
+    magic, version, count, rows = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError(f"'{path}' is not a forecast bundle.")
+    if version != BUNDLE_FORMAT:
+        raise ValueError(
+            f"'{path}' is bundle format {version}, this version reads "
+            f"{BUNDLE_FORMAT}. Run `forecast pack` again."
+        )
+    columns = {}
+    for i in range(count):
+        name, typecode, offset, items = SECTION.unpack_from(
+            view, HEADER.size + i * SECTION.size
+        )
+        size = array(typecode.decode()).itemsize
+        column: Any = view[offset : offset + items * size].cast(typecode.decode())
+        if sys.byteorder != "little" and size > 1:
+            column = array(typecode.decode(), column)
+            column.byteswap()
+        columns[name.rstrip(b"\0").decode()] = column
+
+    def strings(name: str) -> PackedStrings:
+        return PackedStrings(columns[f"{name}_offsets"], columns[f"{name}_data"])
+
+    frame = ForecastFrame()
+    for name in COLUMNS:
+        setattr(frame, name, columns[name])
+    frame.filename = strings("filename")  # type: ignore
+    frame.scenario = strings("scenario")  # type: ignore
+    frame.tag_names = strings("tag_names")  # type: ignore
+    if len(frame) != rows:
+        raise ValueError(f"'{path}' is damaged: expected {rows} rows.")
+    digests = columns["source_digests"]
+    sources = [
+        SourceFile(name, size, mtime, bytes(digests[32 * i : 32 * (i + 1)]))
+        for i, (name, size, mtime) in enumerate(
+            zip(
+                strings("source_names"),
+                columns["source_sizes"],
+                columns["source_mtimes"],
+            )
+        )
+    ]
+    source_root = os.path.join(
+        os.path.dirname(os.path.abspath(path)), strings("source_root")[0]
+    )
+    return Bundle(frame, os.path.normpath(source_root), sources)
+
+
+def pack(
+    root: str, path: str, jobs: Optional[int] = None
+) -> Tuple[ForecastFrame, List[Tuple[str, str]]]:
+    """Load every `.forecast` file under `root` and write them to a bundle at `path`.
+
+    Files that fail to load are left out of the frame, but still fingerprinted,
+    so they don't make the bundle look stale. Each fingerprint is taken from the
+    bytes that were loaded; a file that changed while it was read gets none, so
+    the bundle is stale from the start rather than fresh with old contents.
+
+    Returns:
+        The packed frame, and (filename, error) for each file that failed to load
+    """
+    from forecast.discovery import discover
+    from forecast.loader import load_files
+
+    frame = ForecastFrame()
+    errors: List[Tuple[str, str]] = []
+    sources: List[SourceFile] = []
+    for result in load_files(root, discover(root), jobs):
+        loaded = result.fingerprint
+        if loaded is None:
+            sources.append(SourceFile(result.filename, -1, -1, bytes(32)))
+        else:
+            digest = bytes.fromhex(loaded.sha256)
+            sources.append(
+                SourceFile(result.filename, loaded.size, loaded.mtime, digest)
+            )
+        if result.error is not None:
+            errors.append((result.filename, result.error))
+            continue
+        try:
+            frame.append(result.filename, result.metadata)
+        except (KeyError, TypeError, ValueError) as e:
+            errors.append((result.filename, str(e)))
+    write_bundle(path, frame, root, sources)
+    return frame, errors
+
+
+def stale_sources(bundle: Bundle) -> Tuple[List[str], List[str], List[str]]:
+    """Compare a bundle with its source directory as it is now.
+
+    A file whose size and modification time match is taken as unchanged without
+    reading it, and one whose size changed as changed. When only the
+    modification time differs, its header is hashed, so a fresh checkout of the
+    same files is not stale.
+
+    Returns:
+        The changed, added and removed files, relative to the source root
+    """
+    from forecast.discovery import discover
+
+    packed = {source.filename: source for source in bundle.sources}
+    changed: List[str] = []
+    added: List[str] = []
+    for filename in discover(bundle.source_root):
+        source = packed.pop(filename, None)
+        if source is None:
+            added.append(filename)
+            continue
+        try:
+            st = os.stat(os.path.join(bundle.source_root, filename))
+            if st.st_size != source.size:
+                changed.append(filename)
+                continue
+            if st.st_mtime_ns == source.mtime_ns:
+                continue
+            if fingerprint(bundle.source_root, filename).digest != source.digest:
+                changed.append(filename)
+        except OSError:
+            changed.append(filename)
+    return changed, added, sorted(packed)
+
+
+def load_bundle(path: str, check: bool = True) -> ForecastFrame:
+    """Read a bundle, making sure it is up to date with its source directory.
+
+    The check is skipped when the source directory isn't there, e.g. on a
+    dashboard that only has the bundle.
+
+    Raises:
+        ValueError: If `path` isn't a readable bundle
+        StaleBundleError: If the source files changed since it was packed
+    """
+    bundle = read_bundle(path)
+    if check and os.path.isdir(bundle.source_root):
+        changed, added, removed = stale_sources(bundle)
+        if changed or added or removed:
+            raise StaleBundleError(
+                f"'{path}' is stale: {len(changed)} changed, {len(added)} added and "
+                f"{len(removed)} removed files in '{bundle.source_root}'. "
+                "Run `forecast pack` again."
+            )
+    return bundle.frame
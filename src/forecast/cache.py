@@ -0,0 +1,208 @@
+# pyre-strict
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from forecast.header import header_digest
+from forecast.loader import LoadResult
+
+CACHE_DIR = ".cache"
+CACHE_FILE = "forecasts.json"
+# Bump when the layout of the cache file changes.
+CACHE_FORMAT = 2
+MAX_ENTRIES = 100_000
+
+
+def package_version() -> str:
+    try:
+        from importlib.metadata import version
+
+        return version("forecast")
+    except Exception:
+        return "unknown"
+
+
+def scoring_fingerprint() -> str:
+    """Hash the source of the forecast models, so any change to the scoring math
+    invalidates cached scores."""
+    import forecast.models
+
+    digest = hashlib.sha256()
+    models_dir = os.path.dirname(os.path.abspath(forecast.models.__file__))
+    for root, dirs, files in os.walk(models_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".py"):
+                with open(os.path.join(root, name), "rb") as f:
+                    digest.update(name.encode())
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+def make_cache_dir(cache_dir: str) -> None:
+    """Create `cache_dir` with a `.gitignore`, so it never gets committed.
+
+    Raises:
+        OSError: If it couldn't be created, e.g. in a read-only checkout
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    gitignore = os.path.join(cache_dir, ".gitignore")
+    if not os.path.exists(gitignore):
+        with open(gitignore, "w", encoding="utf-8") as f:
+            f.write("# Created by forecast automatically.\n*\n")
+
+
+def write_cache_file(cache_dir: str, path: str, text: str) -> bool:
+    """Atomically replace `path` inside `cache_dir` with `text`.
+
+    The directory is created with a `.gitignore` so it never gets committed.
+    Returns False if it couldn't be written, e.g. in a read-only checkout.
+    """
+    try:
+        make_cache_dir(cache_dir)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        return False
+    return True
+
+
+def _encode(value: Any) -> Any:
+    """Encode YAML-decoded metadata as JSON, keeping dates and non-string keys."""
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, dict):
+        return {"__dict__": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"Cannot cache a value of type {type(value).__name__}")
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "__datetime__" in value:
+            return datetime.datetime.fromisoformat(value["__datetime__"])
+        if "__date__" in value:
+            return datetime.date.fromisoformat(value["__date__"])
+        return {_decode(k): _decode(v) for k, v in value["__dict__"]}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+class ForecastCache:
+    """A persistent cache of parsed metadata and Brier scores for `.forecast` files.
+
+    Entries are keyed by file name and validated against the file's size and
+    mtime, falling back to a hash of the header when only the mtime changed (for
+    example after a fresh checkout). The whole cache is dropped when the package
+    version or the scoring code changes. Writes go through a temporary file and
+    an atomic rename, so concurrent runs never see a half-written cache.
+
+    Args:
+        forecast_dir (str): The directory holding the `.forecast` files
+        max_entries (int): Upper bound on the number of cached files
+    """
+
+    def __init__(self, forecast_dir: str, max_entries: int = MAX_ENTRIES) -> None:
+        self.forecast_dir = forecast_dir
+        self.cache_dir: str = os.path.join(forecast_dir, CACHE_DIR)
+        self.path: str = os.path.join(self.cache_dir, CACHE_FILE)
+        self.max_entries = max_entries
+        self.header: Dict[str, Any] = {
+            "format": CACHE_FORMAT,
+            "package": package_version(),
+            "scoring": scoring_fingerprint(),
+        }
+        self.entries: Dict[str, Dict[str, Any]] = self._read()
+        self.dirty = False
+        self.now: int = int(time.time())
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("header") != self.header:
+            return {}
+        return data.get("entries", {})
+
+    def get(self, filename: str) -> Optional[LoadResult]:
+        """Return the cached result for `filename`, or None if it is missing or stale."""
+        entry = self.entries.get(filename)
+        if entry is None:
+            return None
+        path = os.path.join(self.forecast_dir, filename)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if entry["size"] != st.st_size:
+            return None
+        if entry["mtime"] != st.st_mtime_ns:
+            if entry["sha256"] != header_digest(path):
+                return None
+            entry["mtime"] = st.st_mtime_ns
+            self.dirty = True
+        # Recency is only persisted alongside real changes, so a warm run never writes.
+        entry["used"] = self.now
+        return LoadResult(filename, _decode(entry["metadata"]), entry["score"], None)
+
+    def put(self, result: LoadResult) -> None:
+        """Store a freshly loaded result under the fingerprint it was loaded from.
+
+        Invalid files, and results loaded without `record` or from a file that
+        changed while it was read, are not cached.
+        """
+        fingerprint = result.fingerprint
+        if result.error is not None or result.metadata is None or fingerprint is None:
+            return
+        try:
+            metadata = _encode(result.metadata)
+        except TypeError:
+            return
+        self.entries[result.filename] = {
+            "size": fingerprint.size,
+            "mtime": fingerprint.mtime,
+            "sha256": fingerprint.sha256,
+            "used": self.now,
+            "metadata": metadata,
+            "score": result.score,
+        }
+        self.dirty = True
+
+    def prune(self, live_filenames: Iterable[str]) -> None:
+        """Evict entries for deleted files, then the least recently used ones over the cap."""
+        live = set(live_filenames)
+        for filename in [f for f in self.entries if f not in live]:
+            del self.entries[filename]
+            self.dirty = True
+        excess = len(self.entries) - self.max_entries
+        if excess > 0:
+            oldest = sorted(self.entries, key=lambda f: self.entries[f]["used"])
+            for filename in oldest[:excess]:
+                del self.entries[filename]
+            self.dirty = True
+
+    def save(self) -> None:
+        """Atomically write the cache back to disk, if anything changed."""
+        if not self.dirty:
+            return
+        payload = json.dumps({"header": self.header, "entries": self.entries})
+        if write_cache_file(self.cache_dir, self.path, payload):
+            self.dirty = False
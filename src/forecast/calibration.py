@@ -0,0 +1,292 @@
+# pyre-strict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+DEFAULT_BINS = 10
+
+
+class Moments:
+    """Streaming count, means, variances and covariance of (x, y) pairs.
+
+    Welford's update keeps this numerically stable in one pass and constant
+    memory, and `merge` combines partial results exactly (Chan et al.).
+
+    Attributes:
+        n (int): Number of pairs
+        mean_x (float): Mean of x
+        mean_y (float): Mean of y
+        m2_x (float): Sum of squared deviations of x from its mean
+        m2_y (float): Sum of squared deviations of y from its mean
+        c_xy (float): Sum of co-deviations of x and y
+    """
+
+    __slots__ = ("n", "mean_x", "mean_y", "m2_x", "m2_y", "c_xy")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0
+
+    def add(self, x: float, y: float) -> None:
+        self.n += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.n
+        dy = y - self.mean_y
+        self.mean_y += dy / self.n
+        self.m2_x += dx * (x - self.mean_x)
+        self.m2_y += dy * (y - self.mean_y)
+        self.c_xy += dx * (y - self.mean_y)
+
+    def merge(self, other: "Moments") -> None:
+        """Fold in the pairs accumulated by `other`."""
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        weight = self.n * other.n / n
+        self.m2_x += other.m2_x + dx * dx * weight
+        self.m2_y += other.m2_y + dy * dy * weight
+        self.c_xy += other.c_xy + dx * dy * weight
+        self.mean_x += dx * other.n / n
+        self.mean_y += dy * other.n / n
+        self.n = n
+
+    @property
+    def var_x(self) -> float:
+        """Population variance of x."""
+        return self.m2_x / self.n if self.n else 0.0
+
+    @property
+    def cov_xy(self) -> float:
+        """Population covariance of x and y."""
+        return self.c_xy / self.n if self.n else 0.0
+
+
+class ReliabilityRow(NamedTuple):
+    """One probability bin of a reliability table.
+
+    Attributes:
+        low (float): Lower edge of the bin
+        high (float): Upper edge of the bin
+        count (int): Number of probability events in the bin
+        mean_forecast (float): Mean stated probability
+        observed (float): Fraction of events that happened
+        forecast_std (float): Standard deviation of the stated probabilities
+    """
+
+    low: float
+    high: float
+    count: int
+    mean_forecast: float
+    observed: float
+    forecast_std: float
+
+
+class Decomposition(NamedTuple):
+    """The Murphy decomposition of the Brier score of binary probability events.
+
+    brier == reliability - resolution + uncertainty + within_bin, where
+    within_bin corrects for forecasts that differ within a bin (it is 0 when
+    every forecast in a bin is the same).
+
+    Attributes:
+        count (int): Number of probability events
+        brier (float): Mean squared error of the stated probabilities
+        reliability (float): Calibration error; lower is better
+        resolution (float): How far bins stray from the base rate; higher is better
+        uncertainty (float): Variance of the outcomes, base_rate * (1 - base_rate)
+        within_bin (float): Within-bin variance minus twice the within-bin covariance
+        base_rate (float): Fraction of events that happened
+    """
+
+    count: int
+    brier: float
+    reliability: float
+    resolution: float
+    uncertainty: float
+    within_bin: float
+    base_rate: float
+
+
+class Calibration:
+    """Reliability bins for (stated probability, outcome) events, in constant memory.
+
+    Args:
+        bins (int): Number of equal-width probability bins over [0, 1]
+    """
+
+    __slots__ = ("bins",)
+
+    def __init__(self, bins: int = DEFAULT_BINS) -> None:
+        self.bins: List[Moments] = [Moments() for _ in range(bins)]
+
+    def add(self, probability: float, outcome: float) -> None:
+        """Record that an event stated with `probability` happened (1) or not (0)."""
+        k = min(int(probability * len(self.bins)), len(self.bins) - 1)
+        self.bins[max(k, 0)].add(probability, outcome)
+
+    def merge(self, other: "Calibration") -> None:
+        for mine, theirs in zip(self.bins, other.bins):
+            mine.merge(theirs)
+
+    @property
+    def count(self) -> int:
+        return sum(b.n for b in self.bins)
+
+    def reliability_table(self) -> List[ReliabilityRow]:
+        """One row per non-empty bin."""
+        width = 1 / len(self.bins)
+        return [
+            ReliabilityRow(
+                k * width,
+                (k + 1) * width,
+                b.n,
+                b.mean_x,
+                b.mean_y,
+                b.var_x**0.5,
+            )
+            for k, b in enumerate(self.bins)
+            if b.n
+        ]
+
+    def decomposition(self) -> Optional[Decomposition]:
+        """The Murphy decomposition, or None if there are no events."""
+        n = self.count
+        if n == 0:
+            return None
+        base_rate = sum(b.n * b.mean_y for b in self.bins) / n
+        reliability = sum(b.n * (b.mean_x - b.mean_y) ** 2 for b in self.bins) / n
+        resolution = sum(b.n * (b.mean_y - base_rate) ** 2 for b in self.bins) / n
+        uncertainty = base_rate * (1 - base_rate)
+        within_bin = sum(b.m2_x - 2 * b.c_xy for b in self.bins) / n
+        # Per bin, sum((p - o)^2) = m2_p + m2_o - 2 c_po + n (mean_p - mean_o)^2
+        brier = (
+            sum(
+                b.m2_x + b.m2_y - 2 * b.c_xy + b.n * (b.mean_x - b.mean_y) ** 2
+                for b in self.bins
+            )
+            / n
+        )
+        return Decomposition(
+            n, brier, reliability, resolution, uncertainty, within_bin, base_rate
+        )
+
+
+class Coverage(NamedTuple):
+    """How often intervals stated at one confidence level contained the outcome.
+
+    Attributes:
+        confidence (float): The stated confidence level
+        count (int): Number of resolved intervals at that level
+        hits (int): Number whose outcome fell inside the interval
+    """
+
+    confidence: float
+    count: int
+    hits: int
+
+    @property
+    def coverage(self) -> float:
+        return self.hits / self.count
+
+
+class CalibrationReport:
+    """Everything `forecast calibration` reports, accumulated in one streaming pass.
+
+    Each option of a resolved Choice forecast is one probability event, and so is
+    each resolved Interval (its confidence against whether the outcome fell
+    inside). Memory depends only on the number of bins, tags and confidence
+    levels, never on the number of forecasts.
+
+    Attributes:
+        overall (Calibration): Bins over every event
+        by_tag (dict[str, Calibration]): Bins per tag; "" collects untagged forecasts
+        coverage (dict[float, list[int]]): [count, hits] of intervals per confidence level
+        forecasts (int): Number of resolved forecasts counted
+        skipped (int): Resolved forecasts that couldn't be scored, e.g. an unknown outcome
+
+    Args:
+        bins (int): Number of equal-width probability bins over [0, 1]
+    """
+
+    def __init__(self, bins: int = DEFAULT_BINS) -> None:
+        self.bins = bins
+        self.overall = Calibration(bins)
+        self.by_tag: Dict[str, Calibration] = {}
+        self.coverage: Dict[float, List[int]] = {}
+        self.forecasts = 0
+        self.skipped = 0
+
+    def add(self, forecast: Any) -> None:
+        """Count one forecast; open ones and other types are ignored."""
+        events = _events(forecast)
+        if events is None:
+            return
+        if not events:
+            self.skipped += 1
+            return
+        self.forecasts += 1
+        tags = list(dict.fromkeys(str(tag) for tag in forecast.tags)) or [""]
+        for tag in tags:
+            if tag not in self.by_tag:
+                self.by_tag[tag] = Calibration(self.bins)
+        for probability, outcome in events:
+            self.overall.add(probability, outcome)
+            for tag in tags:
+                self.by_tag[tag].add(probability, outcome)
+        if forecast.type == "interval":
+            counts = self.coverage.setdefault(round(forecast.confidence, 6), [0, 0])
+            counts[0] += 1
+            counts[1] += int(events[0][1])
+
+    def merge(self, other: "CalibrationReport") -> None:
+        """Fold in a report accumulated elsewhere, e.g. over another shard."""
+        self.overall.merge(other.overall)
+        for tag, calibration in other.by_tag.items():
+            self.by_tag.setdefault(tag, Calibration(self.bins)).merge(calibration)
+        for confidence, (count, hits) in other.coverage.items():
+            counts = self.coverage.setdefault(confidence, [0, 0])
+            counts[0] += count
+            counts[1] += hits
+        self.forecasts += other.forecasts
+        self.skipped += other.skipped
+
+    def interval_coverage(self) -> List[Coverage]:
+        """Coverage per confidence level, in ascending order."""
+        return [
+            Coverage(confidence, count, hits)
+            for confidence, (count, hits) in sorted(self.coverage.items())
+        ]
+
+
+def _events(forecast: Any) -> Optional[List[Tuple[float, float]]]:
+    # None: not a resolved choice or interval. []: resolved, but not scorable.
+    if not hasattr(forecast, "outcome"):
+        return None
+    if forecast.type == "choice":
+        if forecast.outcome not in forecast.options:
+            return []
+        return [
+            (float(p), 1.0 if option == forecast.outcome else 0.0)
+            for option, p in forecast.options.items()
+        ]
+    if forecast.type == "interval":
+        try:
+            hit = forecast.min <= float(forecast.outcome) <= forecast.max
+        except (TypeError, ValueError):
+            return []
+        return [(forecast.confidence, 1.0 if hit else 0.0)]
+    return None
+
+
+def calibration_report(
+    forecasts: Iterable[Any], bins: int = DEFAULT_BINS
+) -> CalibrationReport:
+    """Accumulate a CalibrationReport over `forecasts` in a single pass."""
+    report = CalibrationReport(bins)
+    for forecast in forecasts:
+        report.add(forecast)
+    return report
@@ -0,0 +1,214 @@
+# pyre-strict
+import os
+import re
+from typing import Iterator, List, NamedTuple, Optional, Pattern, Sequence, Tuple
+
+# Read in every directory, with .gitignore semantics
+IGNORE_FILES = (".gitignore", ".forecastignore")
+# Directories that are never searched
+SKIP_DIRS = frozenset({".git"})
+
+
+def translate(pattern: str) -> str:
+    """Translate a gitignore-style glob into a regular expression.
+
+    `*` and `?` don't cross `/`, `**` matches any number of directories, and
+    `[...]` is a character class, as in gitignore(5).
+    """
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end < 0:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class Rule(NamedTuple):
+    """One compiled gitignore-style pattern.
+
+    Attributes:
+        regex (Pattern): Matches paths relative to the directory the rule is scoped to
+        negate (bool): True for `!pattern`, which re-includes a path
+        dir_only (bool): True for `pattern/`, which only matches directories
+    """
+
+    regex: Pattern[str]
+    negate: bool
+    dir_only: bool
+
+
+def compile_rule(pattern: str) -> Rule:
+    """Compile a gitignore-style pattern.
+
+    As in gitignore, a pattern without a `/` (other than a trailing one) matches a
+    name at any depth, and one with a `/` is anchored to its directory.
+    """
+    negate = pattern.startswith("!")
+    if negate:
+        pattern = pattern[1:]
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    regex = translate(pattern)
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    return Rule(re.compile(regex), negate, dir_only)
+
+
+def read_ignore_file(path: str) -> List[Rule]:
+    """Compile the rules of one ignore file, or none if it can't be read."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return []
+    rules = []
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("\\"):
+            line = line[1:]
+        rules.append(compile_rule(line))
+    return rules
+
+
+def _matches(rules: Sequence[Rule], path: str, is_dir: bool) -> Optional[bool]:
+    # The last matching rule wins; None if no rule matches
+    result = None
+    for rule in rules:
+        if (is_dir or not rule.dir_only) and rule.regex.fullmatch(path):
+            result = not rule.negate
+    return result
+
+
+# Ignore rules in effect in a directory: (prefix of the ignore file's directory, rules)
+_Scopes = Tuple[Tuple[str, Tuple[Rule, ...]], ...]
+
+
+def _ignored(scopes: _Scopes, path: str, is_dir: bool) -> bool:
+    ignored = False
+    for prefix, rules in scopes:
+        # Deeper ignore files are consulted last, so they take precedence
+        match = _matches(rules, path[len(prefix) :], is_dir)
+        if match is not None:
+            ignored = match
+    return ignored
+
+
+def discover(
+    root: str,
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+) -> Iterator[str]:
+    """Lazily yield the `.forecast` files under `root`, relative to `root`.
+
+    The tree is walked with `os.scandir`, whose entries carry the file type
+    (d_type), so no `stat` call is made per entry. Symlinked directories are not
+    followed, `.git` is skipped, and `.gitignore` / `.forecastignore` files are
+    honored in every directory, as git would.
+
+    Args:
+        root: The directory to search
+        include: Globs a file must match (any of), in addition to ending in `.forecast`
+        exclude: Globs of files and directories to leave out
+
+    Yields:
+        str: Paths relative to `root`, using `/` as the separator
+    """
+    includes = [compile_rule(p) for p in include]
+    excludes = [compile_rule(p) for p in exclude]
+    # Depth first, with an explicit stack: (directory, its prefix, ignore scopes)
+    stack: List[Tuple[str, str, _Scopes]] = [(root, "", ())]
+    while stack:
+        directory, prefix, scopes = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        names = {entry.name for entry in entries}
+        rules: List[Rule] = []
+        for name in IGNORE_FILES:
+            if name in names:
+                rules.extend(read_ignore_file(os.path.join(directory, name)))
+        if rules:
+            scopes = scopes + ((prefix, tuple(rules)),)
+
+        subdirs = []
+        for entry in entries:
+            path = prefix + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in SKIP_DIRS or _ignored(scopes, path, True):
+                    continue
+                if excludes and _matches(excludes, path, True):
+                    continue
+                subdirs.append((entry.path, path + "/", scopes))
+            elif entry.name.endswith(".forecast"):
+                if _ignored(scopes, path, False):
+                    continue
+                if excludes and _matches(excludes, path, False):
+                    continue
+                if includes and not _matches(includes, path, False):
+                    continue
+                yield path
+        # Reversed, so the stack pops subdirectories in scandir order
+        stack.extend(reversed(subdirs))
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse a shard spec "i/n" (1 <= i <= n) into (i, n).
+
+    Raises:
+        ValueError: If the spec is malformed or out of range
+    """
+    index, sep, count = value.partition("/")
+    try:
+        i, n = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"Expected a shard like 1/4, got '{value}'.")
+    if not sep or not 1 <= i <= n:
+        raise ValueError(f"Expected a shard like 1/4 with 1 <= i <= n, got '{value}'.")
+    return i, n
+
+
+def in_shard(filename: str, shard: Tuple[int, int]) -> bool:
+    """Whether `filename`, relative to its root, belongs to shard (i, n).
+
+    Files are spread by a hash of their relative path, so every machine picks
+    the same slice no matter where the checkout lives or what order files are
+    listed in, and the n shards partition the corpus.
+    """
+    import hashlib
+
+    i, n = shard
+    digest = hashlib.blake2b(filename.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % n == i - 1
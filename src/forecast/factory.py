@@ -1,24 +1,41 @@
-from frontmatter import Post  # type:ignore # type: ignore
+from importlib import import_module
+from typing import TYPE_CHECKING, Dict, Type
+
 from forecast.models.forecast import Forecast
-from forecast.models.interval import Interval
-from forecast.models.choice import Choice
-from forecast.models.pert import Pert
-from forecast.models.lognormal import LogNormal
-from forecast.models.pareto import Pareto
+
+if TYPE_CHECKING:
+    from frontmatter import Post  # type: ignore
+
+# Forecast types and the classes implementing them. A model module is only
+# imported the first time a forecast of its type is created.
+FORECAST_TYPES: Dict[str, str] = {
+    "interval": "forecast.models.interval:Interval",
+    "choice": "forecast.models.choice:Choice",
+    "pert": "forecast.models.pert:Pert",
+    "lognormal": "forecast.models.lognormal:LogNormal",
+    "pareto": "forecast.models.pareto:Pareto",
+}
+
+_forecast_classes: Dict[str, Type[Forecast]] = {}
+
+
+def forecast_class(forecast_type: str) -> Type[Forecast]:
+    """Return the Forecast subclass for `forecast_type`, importing it on first use."""
+    if forecast_type not in _forecast_classes:
+        if forecast_type not in FORECAST_TYPES:
+            raise ValueError(f"Invalid forecast type: {forecast_type}")
+        module_name, class_name = FORECAST_TYPES[forecast_type].split(":")
+        _forecast_classes[forecast_type] = getattr(
+            import_module(module_name), class_name
+        )
+    return _forecast_classes[forecast_type]
 
 
-def create_forecast(post: Post) -> Forecast:
+def create_forecast(post: "Post") -> Forecast:
     """Factory function to create the appropriate forecast type."""
     forecast_type = post.metadata["type"]
-    forecast_classes = {
-        "interval": Interval,
-        "choice": Choice,
-        "pert": Pert,
-        "lognormal": LogNormal,
-        "pareto": Pareto,
-    }
-
-    if forecast_type in forecast_classes:
-        return forecast_classes[forecast_type](post)
-
-    raise ValueError(f"Invalid forecast type: {forecast_type}")
+    try:
+        cls = forecast_class(forecast_type)
+    except TypeError:  # an unhashable type, such as a list
+        raise ValueError(f"Invalid forecast type: {forecast_type}")
+    return cls(post)
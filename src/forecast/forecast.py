@@ -1,17 +1,22 @@
 #!/usr/bin/env python3
 # pyre-strict
-import frontmatter  # type: ignore
-from frontmatter import Post  # type:ignore  # type: ignore
+import math
 import os
 import sys
 import click
 from forecast.models.forecast import Forecast
-from forecast.factory import create_forecast
+from forecast.loader import ForecastError, LoadResult, iter_forecasts
 
-from typing import Optional, List
+from typing import TYPE_CHECKING, Iterator, Optional, List, Sequence, Tuple, Union
 import datetime
-from rich.console import Console
-from rich.table import Table
+
+if TYPE_CHECKING:
+    from forecast.frame import ForecastFrame
+    from forecast.query import SortKey, Where
+    from forecast.calibration import CalibrationReport
+    from forecast.history import HistoryPoint
+    from forecast.simulate import Portfolio, SimulationResult
+    from forecast.aggregate import ScoreReport
 
 
 @click.group(invoke_without_command=True)
@@ -20,24 +25,214 @@ from rich.table import Table
     "--type",
     help="Type to filter forecasts by. (interval, choice, pert, lognormal, pareto)",
 )
+@click.option(
+    "--root",
+    "roots",
+    multiple=True,
+    type=click.Path(exists=True, file_okay=False),
+    envvar="FORECAST_ROOTS",
+    help="Directory to search recursively for `.forecast` files; repeatable. "
+    "Also read from FORECAST_ROOTS, separated like PATH. Defaults to `.forecasts`.",
+)
+@click.option(
+    "--include",
+    multiple=True,
+    help="Only load files matching this glob, relative to their root; repeatable.",
+)
+@click.option(
+    "--exclude",
+    multiple=True,
+    help="Skip files and directories matching this glob, relative to their root; repeatable.",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Number of processes used to load and score forecasts. Defaults to the CPU count.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Ignore and don't update the score cache and metadata index in `.forecasts/.cache`.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table", "jsonl", "csv", "arrow"]),
+    default="table",
+    show_default=True,
+    help="Output format. jsonl, csv and arrow stream one record per forecast as it is scored.",
+)
+@click.option(
+    "--score",
+    "rule",
+    type=click.Choice(["brier", "crps", "log"]),
+    default="brier",
+    show_default=True,
+    help="Scoring rule. crps and log score continuous forecasts with their fitted "
+    "distribution; log also scores choices. Other forecasts show n/a.",
+)
+@click.option(
+    "--bundle",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Load and score the forecasts packed into this file by `forecast pack`, "
+    "instead of reading `.forecast` files.",
+)
+@click.option(
+    "--where",
+    "where_text",
+    help="Only show forecasts matching an expression, e.g. "
+    '"end_date < today+30d and (tag = infra or tag = ops) and open". Fields: '
+    "end_date, type, scenario, tag, score (under --score); flags: open, closed; "
+    "combine with and, or, not and parentheses.",
+)
+@click.option(
+    "--sort",
+    "sort_text",
+    default="end_date",
+    show_default=True,
+    help="Comma-separated keys to sort the table by, out of end_date, scenario, "
+    "type and score; prefix a key with - for descending order, e.g. type,-score.",
+)
+@click.option(
+    "--limit",
+    type=click.IntRange(min=1),
+    help="Only show the first N forecasts in sort order.",
+)
+@click.option(
+    "--storage",
+    type=click.Choice(["files", "sqlite"]),
+    default="files",
+    show_default=True,
+    help="Where the table is read from. sqlite keeps an indexed copy of the forecasts "
+    "in `.forecasts/.cache`, updated from the files that changed, and filters and "
+    "sorts in SQL.",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Keep running, and redraw the table whenever a forecast file changes.",
+)
 @click.pass_context
 def entrypoint(
-    ctx: click.core.Context, tag: Optional[str], type: Optional[str]
+    ctx: click.core.Context,
+    tag: Optional[str],
+    type: Optional[str],
+    roots: Tuple[str, ...],
+    include: Tuple[str, ...],
+    exclude: Tuple[str, ...],
+    jobs: Optional[int],
+    no_cache: bool,
+    output_format: str,
+    rule: str,
+    bundle: Optional[str],
+    where_text: Optional[str],
+    sort_text: str,
+    limit: Optional[int],
+    storage: str,
+    watch: bool,
 ) -> None:
     if ctx.invoked_subcommand is None:
+        from forecast.query import DEFAULT_SORT, Where, parse_sort
+
+        try:
+            where = None if where_text is None else Where(where_text, rule=rule)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--where")
+        try:
+            sort = parse_sort(sort_text, rule)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--sort")
+        ordered = sort != DEFAULT_SORT or limit is not None
+        if (bundle is not None or watch) and (where is not None or ordered):
+            raise click.UsageError(
+                "--where, --sort and --limit can't be combined with --bundle or --watch."
+            )
+        if output_format != "table" and ordered:
+            raise click.UsageError(
+                "--sort and --limit only apply to the table; other formats stream "
+                "records in file order."
+            )
+        if storage != "files" and (
+            bundle is not None or watch or no_cache or output_format != "table"
+        ):
+            raise click.UsageError(
+                "--storage sqlite can't be combined with --bundle, --watch, "
+                "--no-cache or --format."
+            )
+        if bundle is not None:
+            if roots or include or exclude or watch or output_format != "table":
+                raise click.UsageError(
+                    "--bundle can't be combined with --root, --include, --exclude, "
+                    "--watch or --format."
+                )
+            display_bundle(bundle, type, tag, rule)
+            return
+
         forecast_dir = ".forecasts"
 
-        # If the .forecasts doesn't exist, create it
-        first_run(forecast_dir)
+        if roots:
+            forecast_dirs: List[str] = list(roots)
+        else:
+            # If the .forecasts doesn't exist, create it
+            first_run(forecast_dir)
+            forecast_dirs = [forecast_dir]
+
+        if output_format != "table":
+            if watch:
+                raise click.UsageError("--watch only supports the table format.")
+            stream_forecasts(
+                forecast_dirs,
+                output_format,
+                type,
+                tag,
+                jobs,
+                not no_cache,
+                include=include,
+                exclude=exclude,
+                rule=rule,
+                where=where,
+            )
+            return
+
+        if watch:
+            if roots or include or exclude:
+                raise click.UsageError(
+                    "--watch only watches `.forecasts`, and can't be combined with "
+                    "--root, --include or --exclude."
+                )
+            import functools
+
+            from forecast.watch import watch_forecasts
+
+            redraw = functools.partial(redraw_forecasts, rule=rule)
+            try:
+                watch_forecasts(forecast_dir, type, tag, jobs, redraw)
+            except KeyboardInterrupt:
+                pass
+            return
 
         # Enumerate all .forecast files in the directory
-        forecasts = process_forecast_files(forecast_dir, type, tag)
+        forecasts = process_forecast_files(
+            forecast_dirs,
+            type,
+            tag,
+            jobs,
+            use_cache=not no_cache,
+            include=include,
+            exclude=exclude,
+            storage=storage,
+            where=where,
+            sort=sort,
+            limit=limit,
+        )
+        if not forecasts:
+            click.echo("No forecast files found in the '.forecast' directory.")
+            return
 
-        # Sorting. Potentially by open date, scenario name, or default to end date. TODO
-        forecasts = sorted(forecasts, key=lambda x: x.end_date, reverse=False)
+        # Forecasts come back filtered, sorted and limited by the storage
 
         # Build the table and display it
-        display_forecasts(forecasts)
+        display_forecasts(forecasts, rule)
     else:
         pass
 
@@ -55,11 +250,465 @@ def help() -> None:
     click.echo(
         "If you have many forecasts, you can use `--tag` and `--type` to filter them."
     )
+    click.echo(
+        "Run `forecast history` to see how scores changed at every commit to `.forecasts`."
+    )
+    click.echo(
+        "Use `--score crps` or `--score log` to score continuous forecasts with their whole distribution."
+    )
+    click.echo("Run `forecast due` to list open forecasts closing in the next 14 days.")
+    click.echo(
+        "Run `forecast calibration` to see how well stated probabilities held up."
+    )
+    click.echo(
+        "Run `forecast simulate --tag TAG` to see the distribution of the total of open forecasts."
+    )
+    click.echo(
+        'Use `--where`, `--sort` and `--limit` to query, e.g. `forecast --where "open and tag = ops" --sort -end_date --limit 10`.'
+    )
+    click.echo(
+        "Use `--storage sqlite` to keep an indexed copy of a large corpus and filter it in SQL."
+    )
+    click.echo(
+        "Run `forecast pack`, then `forecast --bundle forecasts.bundle`, to load many forecasts quickly from one file."
+    )
+    click.echo(
+        "Run `forecast score --shard i/n --output part.json` on each machine, then `forecast merge part*.json`, to score a corpus in shards."
+    )
 
 
 entrypoint.add_command(help)
 
 
+@click.command()
+@click.argument("filename", required=False)
+def history(filename: Optional[str]) -> None:
+    """Show scores at every commit that touched `.forecasts`, or one file's timeline."""
+    from forecast.history import GitError, forecast_history
+
+    forecast_dir = ".forecasts"
+    if not os.path.isdir(forecast_dir):
+        click.echo("No '.forecasts' directory found.")
+        sys.exit(1)
+    try:
+        points = list(forecast_history(forecast_dir))
+    except GitError as e:
+        click.echo(f"[ERROR] Could not read the git history of '{forecast_dir}': {e}")
+        sys.exit(1)
+    if filename is None:
+        display_history(points)
+    else:
+        display_file_history(points, os.path.basename(filename))
+
+
+entrypoint.add_command(history)
+
+
+def parse_days(value: str) -> int:
+    """Parse a period like `14d`, `2w` or `14` (days) into a number of days."""
+    units = {"d": 1, "w": 7}
+    value = value.strip().lower()
+    factor = units.get(value[-1:], None)
+    number = value[:-1] if factor is not None else value
+    try:
+        return int(number) * (factor or 1)
+    except ValueError:
+        raise click.BadParameter(
+            f"'{value}' is not a period like 14d, 2w or 14.", param_hint="--within"
+        )
+
+
+@click.command()
+@click.option(
+    "--within",
+    default="14d",
+    show_default=True,
+    help="Period to look ahead, e.g. 14d or 2w.",
+)
+@click.option("--tag", help="Tag to filter forecasts by.")
+@click.option("--type", help="Type to filter forecasts by.")
+@click.option(
+    "--root",
+    "roots",
+    multiple=True,
+    type=click.Path(exists=True, file_okay=False),
+    envvar="FORECAST_ROOTS",
+    help="Directory to search recursively for `.forecast` files; repeatable.",
+)
+@click.option(
+    "--include",
+    multiple=True,
+    help="Only list files matching this glob, relative to their root; repeatable.",
+)
+@click.option(
+    "--exclude",
+    multiple=True,
+    help="Skip files and directories matching this glob, relative to their root; repeatable.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Build the metadata index from scratch, and don't save it.",
+)
+def due(
+    within: str,
+    tag: Optional[str],
+    type: Optional[str],
+    roots: Tuple[str, ...],
+    include: Tuple[str, ...],
+    exclude: Tuple[str, ...],
+    no_cache: bool,
+) -> None:
+    """List open forecasts closing within a period, served from the metadata index."""
+    from forecast.discovery import discover
+    from forecast.index import ForecastIndex
+
+    days = parse_days(within)
+    if not roots and not os.path.isdir(".forecasts"):
+        click.echo("No '.forecasts' directory found.")
+        sys.exit(1)
+    today = datetime.date.today()
+    rows = []
+    for root in roots or (".forecasts",):
+        index = ForecastIndex(root, read=not no_cache)
+        index.refresh(discover(root, include, exclude))
+        if not no_cache:
+            index.save()
+        for filename in index.select(
+            type=type,
+            tag=tag,
+            end_before=today + datetime.timedelta(days=days),
+            closed=False,
+        ):
+            entry = index.entries[filename]
+            if entry.error is not None:
+                click.echo(
+                    f"[ERROR] Failed to load forecast from '{filename}': {entry.error}"
+                )
+                continue
+            end_date = datetime.date.fromordinal(entry.end_date)
+            rows.append((end_date, entry.scenario, os.path.join(root, filename)))
+    display_due(sorted(rows), today, days)
+
+
+entrypoint.add_command(due)
+
+
+@click.command()
+@click.option(
+    "--bins",
+    type=click.IntRange(min=1, max=1000),
+    default=10,
+    show_default=True,
+    help="Number of equal-width probability bins.",
+)
+@click.option("--tag", help="Tag to filter forecasts by.")
+@click.option(
+    "--root",
+    "roots",
+    multiple=True,
+    type=click.Path(exists=True, file_okay=False),
+    envvar="FORECAST_ROOTS",
+    help="Directory to search recursively for `.forecast` files; repeatable.",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Number of processes used to load forecasts. Defaults to the CPU count.",
+)
+@click.option("--no-cache", is_flag=True, help="Ignore and don't update the cache.")
+def calibration(
+    bins: int,
+    tag: Optional[str],
+    roots: Tuple[str, ...],
+    jobs: Optional[int],
+    no_cache: bool,
+) -> None:
+    """Report calibration of resolved choice and interval forecasts."""
+    from forecast.calibration import CalibrationReport
+
+    if not roots and not os.path.isdir(".forecasts"):
+        click.echo("No '.forecasts' directory found.")
+        sys.exit(1)
+    report = CalibrationReport(bins)
+    # One streaming pass: each forecast is folded into the accumulators and dropped
+    for item in iter_forecasts(
+        list(roots) or ".forecasts", tag=tag, jobs=jobs, use_cache=not no_cache
+    ):
+        if isinstance(item, ForecastError):
+            click.echo(
+                f"[ERROR] Failed to load forecast from '{item.filename}': {item.error}"
+            )
+            continue
+        report.add(item)
+    display_calibration(report)
+
+
+entrypoint.add_command(calibration)
+
+
+@click.command()
+@click.option("--tag", help="Tag to filter forecasts by.")
+@click.option(
+    "--samples",
+    type=click.IntRange(min=1),
+    default=100_000,
+    show_default=True,
+    help="Number of samples of the total.",
+)
+@click.option("--seed", type=int, default=0, show_default=True, help="Random seed.")
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=100_000,
+    show_default=True,
+    help="Samples drawn at a time; bounds memory. Results depend on it.",
+)
+@click.option(
+    "--quantile",
+    "quantiles",
+    type=click.FloatRange(0, 1),
+    multiple=True,
+    help="Quantile of the total to report; repeatable. Defaults to 5% through 99%.",
+)
+@click.option(
+    "--threshold",
+    "thresholds",
+    type=float,
+    multiple=True,
+    help="Report the probability that the total exceeds this value; repeatable.",
+)
+@click.option(
+    "--root",
+    "roots",
+    multiple=True,
+    type=click.Path(exists=True, file_okay=False),
+    envvar="FORECAST_ROOTS",
+    help="Directory to search recursively for `.forecast` files; repeatable.",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Number of processes used to load forecasts and draw samples. "
+    "Defaults to the CPU count; results don't depend on it.",
+)
+@click.option("--no-cache", is_flag=True, help="Ignore and don't update the cache.")
+def simulate(
+    tag: Optional[str],
+    samples: int,
+    seed: int,
+    chunk_size: int,
+    quantiles: Tuple[float, ...],
+    thresholds: Tuple[float, ...],
+    roots: Tuple[str, ...],
+    jobs: Optional[int],
+    no_cache: bool,
+) -> None:
+    """Simulate the total of open PERT, LogNormal and Pareto forecasts."""
+    from forecast.models.math import vectorized
+
+    if not vectorized.HAS_NUMPY:
+        raise click.ClickException(
+            "`forecast simulate` requires NumPy: pip install forecast[numpy]"
+        )
+    from forecast import simulate as mc
+
+    if not roots and not os.path.isdir(".forecasts"):
+        click.echo("No '.forecasts' directory found.")
+        sys.exit(1)
+    portfolio = mc.Portfolio()
+    for item in iter_forecasts(
+        list(roots) or ".forecasts", tag=tag, jobs=jobs, use_cache=not no_cache
+    ):
+        if isinstance(item, ForecastError):
+            click.echo(
+                f"[ERROR] Failed to load forecast from '{item.filename}': {item.error}"
+            )
+            continue
+        try:
+            portfolio.add(item)
+        except ValueError as e:
+            click.echo(f"[ERROR] Can't simulate '{item.path}': {e}")
+    if not len(portfolio):
+        click.echo("No open pert, lognormal or pareto forecasts to simulate.")
+        return
+    result = mc.simulate(portfolio, samples, seed, chunk_size, jobs, thresholds)
+    display_simulation(portfolio, result, quantiles or mc.DEFAULT_QUANTILES, seed)
+
+
+entrypoint.add_command(simulate)
+
+
+def parse_shard_option(
+    ctx: click.core.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[Tuple[int, int]]:
+    from forecast.discovery import parse_shard
+
+    if value is None:
+        return None
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
+@click.command()
+@click.option(
+    "--shard",
+    callback=parse_shard_option,
+    metavar="I/N",
+    help="Only score shard I of N, a fixed slice of the files picked by a hash of "
+    "their path, e.g. 2/4. Combine the partials with `forecast merge`.",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False),
+    help="Write the partial aggregate to this file instead of showing the report.",
+)
+@click.option("--tag", help="Tag to filter forecasts by.")
+@click.option("--type", help="Type to filter forecasts by.")
+@click.option(
+    "--root",
+    "roots",
+    multiple=True,
+    type=click.Path(exists=True, file_okay=False),
+    envvar="FORECAST_ROOTS",
+    help="Directory to search recursively for `.forecast` files; repeatable.",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Number of processes used to load forecasts. Defaults to the CPU count.",
+)
+@click.option("--no-cache", is_flag=True, help="Ignore and don't update the cache.")
+def score(
+    shard: Optional[Tuple[int, int]],
+    output: Optional[str],
+    tag: Optional[str],
+    type: Optional[str],
+    roots: Tuple[str, ...],
+    jobs: Optional[int],
+    no_cache: bool,
+) -> None:
+    """Aggregate Brier scores overall, per type and per tag."""
+    from forecast.aggregate import ScoreReport
+    from forecast.cache import scoring_fingerprint
+
+    if shard is not None and output is None:
+        raise click.UsageError("--shard needs --output to write the partial to.")
+    if not roots and not os.path.isdir(".forecasts"):
+        click.echo("No '.forecasts' directory found.")
+        sys.exit(1)
+    report = ScoreReport(
+        shard or (1, 1), {"tag": tag, "type": type}, scoring_fingerprint()
+    )
+    for item in iter_forecasts(
+        list(roots) or ".forecasts",
+        type=type,
+        tag=tag,
+        jobs=jobs,
+        use_cache=not no_cache,
+        shard=shard,
+    ):
+        if isinstance(item, ForecastError):
+            click.echo(
+                f"[ERROR] Failed to load forecast from '{item.filename}': {item.error}",
+                err=True,
+            )
+            report.add_error()
+            continue
+        report.add(item)
+    if output is None:
+        display_scores(report)
+        return
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(report.to_json())
+    i, n = report.shards[0]
+    click.echo(
+        f"Wrote shard {i}/{n} ({report.overall.n} scored forecasts) to '{output}'."
+    )
+
+
+entrypoint.add_command(score)
+
+
+@click.command()
+@click.argument(
+    "partials", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False)
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False),
+    help="Write the merged aggregate to this file instead of showing the report.",
+)
+def merge(partials: Tuple[str, ...], output: Optional[str]) -> None:
+    """Combine partial aggregates from `forecast score --shard` into one report."""
+    from forecast.aggregate import ScoreReport
+
+    report: Optional[ScoreReport] = None
+    for path in partials:
+        try:
+            with open(path, encoding="utf-8") as f:
+                partial = ScoreReport.from_json(f.read())
+            if report is None:
+                report = partial
+            else:
+                report.merge(partial)
+        except ValueError as e:
+            raise click.ClickException(f"Can't merge '{path}': {e}")
+    assert report is not None
+    missing = report.missing_shards()
+    if missing:
+        shards = ", ".join(f"{i}/{n}" for i, n in missing)
+        click.echo(
+            f"[WARNING] Missing shards {shards}; the report is partial.", err=True
+        )
+    if output is None:
+        display_scores(report)
+        return
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(report.to_json())
+    click.echo(f"Merged {len(partials)} partials into '{output}'.")
+
+
+entrypoint.add_command(merge)
+
+
+@click.command()
+@click.option(
+    "--root",
+    default=".forecasts",
+    show_default=True,
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory to search recursively for `.forecast` files.",
+)
+@click.option(
+    "--output",
+    default="forecasts.bundle",
+    show_default=True,
+    type=click.Path(dir_okay=False),
+    help="The bundle file to write.",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Number of processes used to load forecasts. Defaults to the CPU count.",
+)
+def pack(root: str, output: str, jobs: Optional[int]) -> None:
+    """Compile a directory of forecasts into one bundle for `forecast --bundle`."""
+    from forecast.bundle import pack as pack_bundle
+
+    frame, errors = pack_bundle(root, output, jobs)
+    for filename, error in errors:
+        click.echo(
+            f"[ERROR] Failed to load forecast from '{filename}': {error}", err=True
+        )
+    click.echo(f"Packed {len(frame)} forecasts from '{root}' into '{output}'.")
+
+
+entrypoint.add_command(pack)
+
+
 def print_days_away(days: str) -> str:
     return f"{days} days"
 
@@ -82,35 +731,367 @@ def display_welcome_banner() -> None:
     click.echo("---------------------------------------------")
 
 
+def display_bundle(
+    path: str, type: Optional[str], tag: Optional[str], rule: str = "brier"
+) -> None:
+    from forecast.bundle import load_bundle
+
+    try:
+        frame = load_bundle(path)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    order = [
+        i
+        for i in frame.order_by_end_date()
+        if (type is None or frame.type(i) == type)
+        and (tag is None or tag in frame.tags(i))
+    ]
+    if not order:
+        click.echo(f"No forecasts found in '{path}'.")
+        return
+    display_forecasts(frame, rule, order)
+
+
 def process_forecast_files(
-    forecast_dir: str, type: Optional[str], tag: Optional[str]
+    forecast_dir: Union[str, Sequence[str]],
+    type: Optional[str],
+    tag: Optional[str],
+    jobs: Optional[int] = 1,
+    use_cache: bool = False,
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+    storage: str = "files",
+    where: Optional["Where"] = None,
+    sort: Optional[Sequence["SortKey"]] = None,
+    limit: Optional[int] = None,
 ) -> List[Forecast]:
-    forecasts: List[Forecast] = []
-    for filename in os.listdir(forecast_dir):
-        if filename.endswith(".forecast"):
-            filepath = os.path.join(forecast_dir, filename)
-            post: Post = frontmatter.load(filepath)
+    """Load the forecasts under one or more roots from `storage`, in `sort` order
+    (end date by default), keeping the first `limit`.
+
+    Errors are echoed as they are found.
+    """
+    import heapq
+    from itertools import islice
+
+    from forecast.query import DEFAULT_SORT, sort_key
+    from forecast.storage import Query, StorageError, open_storage
+
+    keys = tuple(sort or DEFAULT_SORT)
+    query = Query(type=type, tag=tag, where=where, sort=keys, limit=limit)
+    roots = [forecast_dir] if isinstance(forecast_dir, str) else list(forecast_dir)
+    per_root: List[List[Forecast]] = []
+    for root in roots:
+        forecasts: List[Forecast] = []
+        try:
+            backend = open_storage(storage, root, include, exclude, jobs, use_cache)
             try:
-                forecast: Forecast = create_forecast(post)
-            except Exception as e:
-                click.echo(f"[ERROR] Failed to load forecast from '{filename}': {e}")
-                continue
-            # First, process types if the option is set
-            if type is None:
-                pass
-            elif type == forecast.type:
-                pass
-            else:
+                for item in backend.select(query):
+                    if isinstance(item, ForecastError):
+                        click.echo(
+                            f"[ERROR] Failed to load forecast from '{item.filename}': {item.error}"
+                        )
+                        continue
+                    forecasts.append(item)
+            finally:
+                backend.close()
+        except StorageError as e:
+            raise click.ClickException(str(e))
+        per_root.append(forecasts)
+    if len(per_root) == 1:
+        return per_root[0]
+    # Each root is sorted and limited already; ties keep the order of the roots
+    merged = heapq.merge(*per_root, key=sort_key(keys))
+    return list(merged if limit is None else islice(merged, limit))
+
+
+def stream_forecasts(
+    forecast_dir: Union[str, Sequence[str]],
+    output_format: str,
+    type: Optional[str],
+    tag: Optional[str],
+    jobs: Optional[int] = 1,
+    use_cache: bool = False,
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+    rule: str = "brier",
+    where: Optional["Where"] = None,
+) -> None:
+    """Write one record per forecast to stdout as soon as it is scored, in file order.
+
+    Errors go to stderr so they never corrupt the records.
+    """
+    from forecast.output import forecast_record, make_writer, record_fields
+
+    try:
+        writer = make_writer(output_format, sys.stdout, record_fields(rule))
+    except ImportError:
+        raise click.ClickException(
+            "The arrow format needs pyarrow: pip install 'forecast[arrow]'"
+        )
+    today = datetime.date.today()
+    try:
+        for item in iter_forecasts(
+            forecast_dir,
+            type=type,
+            tag=tag,
+            include=include,
+            exclude=exclude,
+            jobs=jobs,
+            use_cache=use_cache,
+            where=where,
+        ):
+            if isinstance(item, ForecastError):
+                click.echo(
+                    f"[ERROR] Failed to load forecast from '{item.filename}': {item.error}",
+                    err=True,
+                )
                 continue
-            # Process tags if the option is set
-            if tag is None:
-                forecasts.append(forecast)
-            elif tag in forecast.tags:
-                forecasts.append(forecast)
-    if not forecasts:
-        click.echo("No forecast files found in the '.forecast' directory.")
-        sys.exit(0)
-    return forecasts
+            writer.write(forecast_record(item, today, rule))
+    finally:
+        writer.close()
+
+
+def redraw_forecasts(
+    forecasts: List[Forecast], errors: List[LoadResult], rule: str = "brier"
+) -> None:
+    click.clear()
+    for result in errors:
+        click.echo(
+            f"[ERROR] Failed to load forecast from '{result.filename}': {result.error}"
+        )
+    display_forecasts(forecasts, rule)
+    click.echo("Watching for changes. Press Ctrl+C to stop.")
+
+
+def display_history(points: List["HistoryPoint"]) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="Forecast history", show_header=True, header_style="bold white")
+    table.add_column("Commit", justify="left", style="cyan", no_wrap=True)
+    table.add_column("Date", justify="left", style="white")
+    table.add_column("Open", justify="center", style="yellow")
+    table.add_column("Overdue", justify="center", style="red")
+    table.add_column("Closed", justify="center", style="green")
+    table.add_column("Mean Brier Score", justify="center", style="white")
+
+    for point in points:
+        statuses = [point.status(result) for result in point.results]
+        mean = point.mean_score()
+        table.add_row(
+            point.commit[:8],
+            point.date.strftime("%Y-%m-%d %H:%M"),
+            str(statuses.count("Open")),
+            str(statuses.count("Overdue")),
+            str(statuses.count("Closed")),
+            "-" if mean is None else f"[cyan]{mean:.4f}[/cyan]",
+        )
+    Console().print(table)
+
+
+def display_file_history(points: List["HistoryPoint"], filename: str) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title=filename, show_header=True, header_style="bold white")
+    table.add_column("Commit", justify="left", style="cyan", no_wrap=True)
+    table.add_column("Date", justify="left", style="white")
+    table.add_column("Status", justify="center", style="white")
+    table.add_column("Brier Score", justify="center", style="white")
+
+    for point in points:
+        for result in point.results:
+            if result.filename == filename:
+                table.add_row(
+                    point.commit[:8],
+                    point.date.strftime("%Y-%m-%d %H:%M"),
+                    point.status(result),
+                    "-" if result.score is None else f"[cyan]{result.score:.4f}[/cyan]",
+                )
+    Console().print(table)
+
+
+def display_due(
+    rows: List[Tuple[datetime.date, str, str]], today: datetime.date, days: int
+) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(
+        title=f"Due within {days} days", show_header=True, header_style="bold white"
+    )
+    table.add_column("Status", justify="center", style="cyan", no_wrap=True)
+    table.add_column("Days until close", justify="center", style="white")
+    table.add_column("Scenario", justify="left", style="white")
+    table.add_column("File", justify="left", style="white")
+
+    for end_date, scenario, path in rows:
+        days_away = (end_date - today).days
+        if days_away < 0:
+            table.add_row(
+                "[bold red]Overdue[/bold red]",
+                f"[red]{days_away}[/red]",
+                scenario,
+                path,
+            )
+        else:
+            table.add_row(
+                "[bold yellow]Open[/bold yellow]",
+                f"[yellow]{days_away}[/yellow]",
+                scenario,
+                path,
+            )
+    Console().print(table)
+
+
+def display_calibration(report: "CalibrationReport") -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    decomposition = report.overall.decomposition()
+    if decomposition is None:
+        console.print("No resolved choice or interval forecasts to calibrate.")
+        return
+
+    table = Table(title="Reliability", show_header=True, header_style="bold white")
+    table.add_column("Stated probability", justify="center", style="cyan")
+    table.add_column("Events", justify="right", style="white")
+    table.add_column("Mean stated", justify="center", style="white")
+    table.add_column("Observed", justify="center", style="white")
+    table.add_column("Std. dev.", justify="center", style="white")
+    for row in report.overall.reliability_table():
+        table.add_row(
+            f"{row.low:.2f}-{row.high:.2f}",
+            str(row.count),
+            f"{row.mean_forecast:.3f}",
+            f"{row.observed:.3f}",
+            f"{row.forecast_std:.3f}",
+        )
+    console.print(table)
+
+    table = Table(
+        title="Brier decomposition", show_header=True, header_style="bold white"
+    )
+    table.add_column("Tag", justify="left", style="cyan")
+    table.add_column("Events", justify="right", style="white")
+    table.add_column("Brier", justify="center", style="white")
+    table.add_column("Reliability", justify="center", style="white")
+    table.add_column("Resolution", justify="center", style="white")
+    table.add_column("Uncertainty", justify="center", style="white")
+    table.add_column("Within-bin", justify="center", style="white")
+    rows = [("(all)", decomposition)]
+    for tag in sorted(report.by_tag):
+        tag_decomposition = report.by_tag[tag].decomposition()
+        if tag_decomposition is not None:
+            rows.append((tag or "(untagged)", tag_decomposition))
+    for name, d in rows:
+        table.add_row(
+            name,
+            str(d.count),
+            f"{d.brier:.4f}",
+            f"{d.reliability:.4f}",
+            f"{d.resolution:.4f}",
+            f"{d.uncertainty:.4f}",
+            f"{d.within_bin:.4f}",
+        )
+    console.print(table)
+
+    coverage = report.interval_coverage()
+    if coverage:
+        table = Table(
+            title="Interval coverage", show_header=True, header_style="bold white"
+        )
+        table.add_column("Confidence", justify="center", style="cyan")
+        table.add_column("Intervals", justify="right", style="white")
+        table.add_column("Contained outcome", justify="right", style="white")
+        table.add_column("Coverage", justify="center", style="white")
+        for level in coverage:
+            table.add_row(
+                f"{level.confidence:.0%}",
+                str(level.count),
+                str(level.hits),
+                f"{level.coverage:.1%}",
+            )
+        console.print(table)
+    console.print(
+        f"{report.forecasts} resolved forecasts. Brier is per probability event: "
+        "reliability - resolution + uncertainty + within-bin."
+    )
+    if report.skipped:
+        console.print(f"{report.skipped} resolved forecasts could not be scored.")
+
+
+def display_simulation(
+    portfolio: "Portfolio",
+    result: "SimulationResult",
+    quantiles: Sequence[float],
+    seed: int,
+) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    table = Table(title="Simulated total", show_header=True, header_style="bold white")
+    table.add_column("Statistic", justify="left", style="cyan")
+    table.add_column("Value", justify="right", style="white")
+    table.add_row("Mean", f"{result.mean:,.4g}")
+    table.add_row("Std. dev.", f"{result.std:,.4g}")
+    for q in quantiles:
+        table.add_row(f"P{q * 100:g}", f"{result.quantile(q):,.4g}")
+    console.print(table)
+
+    exceedance = result.exceedance()
+    if exceedance:
+        table = Table(title="Exceedance", show_header=True, header_style="bold white")
+        table.add_column("Total above", justify="right", style="cyan")
+        table.add_column("Probability", justify="center", style="white")
+        for threshold, probability in exceedance:
+            table.add_row(f"{threshold:,.4g}", f"{probability:.2%}")
+        console.print(table)
+    console.print(
+        f"{len(portfolio)} open forecasts ({len(portfolio.pert)} pert, "
+        f"{len(portfolio.lognormal)} lognormal, {len(portfolio.pareto)} pareto), "
+        f"{result.count:,} samples, seed {seed}."
+    )
+
+
+def display_scores(report: "ScoreReport") -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    if not report.overall.n:
+        console.print("No resolved forecasts to score.")
+    else:
+        table = Table(title="Brier scores", show_header=True, header_style="bold white")
+        table.add_column("Group", justify="left", style="cyan")
+        table.add_column("Forecasts", justify="right", style="white")
+        table.add_column("Mean", justify="center", style="white")
+        table.add_column("Std. dev.", justify="center", style="white")
+        table.add_column("Median", justify="center", style="white")
+        table.add_column("P90", justify="center", style="white")
+        rows = [("(all)", report.overall)]
+        rows += [(f"type: {t}", report.by_type[t]) for t in sorted(report.by_type)]
+        rows += [
+            (f"tag: {t}" if t else "(untagged)", report.by_tag[t])
+            for t in sorted(report.by_tag)
+        ]
+        for name, stats in rows:
+            table.add_row(
+                name,
+                str(stats.n),
+                f"{stats.mean:.4f}",
+                f"{stats.std:.4f}",
+                f"{stats.quantile(0.5):.4f}",
+                f"{stats.quantile(0.9):.4f}",
+            )
+        console.print(table)
+    console.print(
+        f"{report.overall.n} scored, {report.open} open, "
+        f"{report.unscored} could not be scored, {report.errors} failed to load. "
+        "Quantiles are within 1% of a recorded score."
+    )
 
 
 def first_run(forecast_dir: str) -> None:
@@ -139,37 +1120,71 @@ def first_run(forecast_dir: str) -> None:
             sys.exit(1)
 
 
-def display_forecasts(forecasts: List[Forecast]) -> None:
+def forecast_rows(
+    forecasts: List[Forecast], rule: str = "brier"
+) -> Iterator[Tuple[str, datetime.date, Optional[float]]]:
+    """Yield (scenario, end_date, score or None) for each forecast.
+
+    The score is NaN when the forecast's type doesn't support `rule`.
+    """
+    for forecast in forecasts:
+        # If the forecast has an outcome, calculate its score
+        if hasattr(forecast, "outcome"):
+            score = forecast.score(rule) if rule in forecast.rules else math.nan
+            yield forecast.scenario, forecast.end_date, score
+        else:
+            yield forecast.scenario, forecast.end_date, None
+
+
+# Score column titles for each scoring rule
+RULE_TITLES = {"brier": "Brier Score", "crps": "CRPS", "log": "Log Score"}
+
+
+def display_forecasts(
+    forecasts: Union[List[Forecast], "ForecastFrame"],
+    rule: str = "brier",
+    order: Optional[List[int]] = None,
+) -> None:
+    # rich is slow to import, so only pay for it when a table is rendered
+    from rich.console import Console
+    from rich.table import Table
+    from forecast.frame import ForecastFrame
+
     console = Console()
     table = Table(title="Forecasts", show_header=True, header_style="bold white")
 
     table.add_column("Status", justify="center", style="cyan", no_wrap=True)
     table.add_column("Days until close", justify="center", style="white")
     table.add_column("Scenario", justify="left", style="white")
-    table.add_column("Brier Score", justify="center", style="white")
+    table.add_column(RULE_TITLES[rule], justify="center", style="white")
 
-    for forecast in forecasts:
-        # Load this into a forecast object (Question + Answer)
+    # A ForecastFrame scores all of its rows in one batch, in end date order
+    # unless `order` picks the rows to show
+    if isinstance(forecasts, ForecastFrame):
+        if order is None:
+            order = forecasts.order_by_end_date()
+        rows = forecasts.rows(order, rule)
+    else:
+        rows = forecast_rows(forecasts, rule)
 
-        # If the forecast has an outcome, calculate the Brier score
-        if hasattr(forecast, "outcome"):
-            brier_score = forecast.calc()
+    for scenario, end_date, score in rows:
+        if score is not None:
             table.add_row(
                 "[bold green]Closed[/bold green]",
                 "-",
-                forecast.scenario,
-                f"[cyan]{brier_score:.4f}[/cyan]",
+                scenario,
+                "n/a" if math.isnan(score) else f"[cyan]{score:.4f}[/cyan]",
             )
 
-        # If the forecast has an end date, calculate the days away
-        elif hasattr(forecast, "end_date"):
-            days_away = (forecast.end_date - datetime.date.today()).days
+        # Otherwise, calculate the days away from the end date
+        else:
+            days_away = (end_date - datetime.date.today()).days
 
             if days_away < 0:
                 table.add_row(
                     "[bold red]Overdue[/bold red]",
                     f"[red]{days_away}[/red]",
-                    forecast.scenario,
+                    scenario,
                     "-",
                 )
 
@@ -177,7 +1192,7 @@ def display_forecasts(forecasts: List[Forecast]) -> None:
                 table.add_row(
                     "[bold yellow]Open[/bold yellow]",
                     f"[yellow]{days_away}[/yellow]",
-                    forecast.scenario,
+                    scenario,
                     "-",
                 )
 
@@ -0,0 +1,299 @@
+# pyre-strict
+import datetime
+import math
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from forecast.loader import LoadResult
+from forecast.models.forecast import read_tags
+
+NAN = float("nan")
+
+# Forecast types are stored as small integer codes
+TYPE_CODES: Dict[str, int] = {
+    "interval": 0,
+    "choice": 1,
+    "pert": 2,
+    "lognormal": 3,
+    "pareto": 4,
+}
+TYPE_NAMES: List[str] = sorted(TYPE_CODES, key=TYPE_CODES.__getitem__)
+
+# Numeric fields, each stored as one float column (NaN where a type doesn't use it)
+NUMERIC_FIELDS = (
+    "min",
+    "mode",
+    "max",
+    "p5",
+    "p50",
+    "p95",
+    "p90",
+    "p99",
+    "confidence",
+    "outcome",
+)
+
+
+def _end_date(raw: Any) -> datetime.date:
+    if isinstance(raw, datetime.date):
+        return raw
+    return datetime.datetime.strptime(str(raw), "%Y-%m-%d").date()
+
+
+class ForecastFrame:
+    """A columnar (struct-of-arrays) collection of forecasts.
+
+    Instead of one Forecast object per file, every field is held in its own
+    column, which lets `score_all` score each forecast type in one vectorized
+    pass. Columns are `array.array`s, so NumPy can view them without copying.
+
+    Attributes:
+        filename (list[str]): File name of each forecast
+        scenario (list[str]): Scenario of each forecast
+        end_date (array[int]): End date of each forecast, as a proleptic ordinal
+        type_code (array[int]): Index into TYPE_NAMES
+        tag_names (list[str]): The distinct tags; rows refer to them by id
+        tag_ids (array[int]): The tag ids of all rows, concatenated
+        tag_offsets (array[int]): Row i's tags are tag_ids[tag_offsets[i]:tag_offsets[i + 1]]
+        has_outcome (array[int]): 1 if the forecast has an outcome, else 0
+        min, mode, max, p5, p50, p95, p90, p99, confidence, outcome (array[float]):
+            The numeric fields of each type, NaN where a type doesn't use them.
+            For choice forecasts `outcome` is the index of the chosen option,
+            or -1 if it is not one of the options.
+        option_probs (array[float]): The option probabilities of all choice rows, concatenated
+        option_offsets (array[int]): Row i's options are option_probs[option_offsets[i]:option_offsets[i + 1]]
+    """
+
+    def __init__(self) -> None:
+        self.filename: List[str] = []
+        self.scenario: List[str] = []
+        self.end_date: array = array("q")
+        self.type_code: array = array("b")
+        self.tag_names: List[str] = []
+        self._tag_index: Dict[str, int] = {}
+        self.tag_ids: array = array("q")
+        self.tag_offsets: array = array("q", [0])
+        self.has_outcome: array = array("b")
+        for field in NUMERIC_FIELDS:
+            setattr(self, field, array("d"))
+        self.option_probs: array = array("d")
+        self.option_offsets: array = array("q", [0])
+
+    def __len__(self) -> int:
+        return len(self.scenario)
+
+    @classmethod
+    def from_results(cls, results: Iterable[LoadResult]) -> "ForecastFrame":
+        """Build a frame from loader results, skipping files that failed to load."""
+        frame = cls()
+        for result in results:
+            if result.metadata is not None:
+                frame.append(result.filename, result.metadata)
+        return frame
+
+    def append(self, filename: str, metadata: Mapping[str, Any]) -> None:
+        """Add one forecast, given its validated frontmatter metadata."""
+        forecast_type = metadata["type"]
+        values = {field: NAN for field in NUMERIC_FIELDS}
+        for field in NUMERIC_FIELDS[:-1]:
+            if field in metadata:
+                values[field] = float(metadata[field])
+
+        options: Dict[Any, float] = (
+            metadata.get("options", {}) if forecast_type == "choice" else {}
+        )
+        outcome_known = "outcome" in metadata
+        if outcome_known:
+            if forecast_type == "choice":
+                keys = list(options)
+                outcome = metadata["outcome"]
+                values["outcome"] = keys.index(outcome) if outcome in options else -1
+            else:
+                values["outcome"] = float(metadata["outcome"])
+
+        self.filename.append(filename)
+        self.scenario.append(metadata["scenario"])
+        self.end_date.append(_end_date(metadata["end_date"]).toordinal())
+        self.type_code.append(TYPE_CODES[forecast_type])
+        for tag in read_tags(metadata):
+            if tag not in self._tag_index:
+                self._tag_index[tag] = len(self.tag_names)
+                self.tag_names.append(tag)
+            self.tag_ids.append(self._tag_index[tag])
+        self.tag_offsets.append(len(self.tag_ids))
+        self.has_outcome.append(1 if outcome_known else 0)
+        for field in NUMERIC_FIELDS:
+            getattr(self, field).append(values[field])
+        self.option_probs.extend(float(p) for p in options.values())
+        self.option_offsets.append(len(self.option_probs))
+
+    def tags(self, i: int) -> List[str]:
+        """The tags of row i."""
+        ids = self.tag_ids[self.tag_offsets[i] : self.tag_offsets[i + 1]]
+        return [self.tag_names[t] for t in ids]
+
+    def type(self, i: int) -> str:
+        """The forecast type of row i."""
+        return TYPE_NAMES[self.type_code[i]]
+
+    def score_all(self, rule: str = "brier") -> List[float]:
+        """Scores for every row under `rule`, NaN for forecasts without an outcome.
+
+        With NumPy installed each forecast type is scored in one vectorized pass,
+        otherwise row by row with the scalar distributions. Rows whose type
+        doesn't support the rule (see `Forecast.rules`) are also NaN.
+
+        Args:
+            rule (str): One of `SCORING_RULES`: "brier", "crps" or "log"
+
+        Raises:
+            ValueError: If a choice outcome is not one of its options, or the
+                rule is unknown
+        """
+        from forecast.models.forecast import SCORING_RULES
+        from forecast.models.math import vectorized
+
+        if rule not in SCORING_RULES:
+            raise ValueError(f"Unknown scoring rule '{rule}'.")
+        if vectorized.HAS_NUMPY:
+            return self._score_numpy(rule).tolist()
+        return [self._score_row(i, rule) for i in range(len(self))]
+
+    def _invalid_choice(self, i: int) -> ValueError:
+        return ValueError(
+            f"The provided outcome was not in options for '{self.scenario[i]}'."
+        )
+
+    def _score_numpy(self, rule: str) -> Any:
+        import numpy as np  # type: ignore
+
+        from forecast.models.math import vectorized
+
+        def column(name: str) -> Any:
+            return np.frombuffer(getattr(self, name), dtype=np.float64)
+
+        codes = np.frombuffer(self.type_code, dtype=np.int8)
+        closed = np.frombuffer(self.has_outcome, dtype=np.int8).astype(bool)
+        outcome = column("outcome")
+        scores = np.full(len(self), NAN)
+
+        rows = closed & (codes == TYPE_CODES["interval"])
+        if rows.any() and rule == "brier":
+            hit = (column("min")[rows] <= outcome[rows]) & (
+                outcome[rows] <= column("max")[rows]
+            )
+            scores[rows] = 2 * (hit - column("confidence")[rows]) ** 2
+
+        rows = closed & (codes == TYPE_CODES["choice"])
+        if rows.any() and rule != "crps":
+            invalid = np.flatnonzero(rows & (outcome < 0))
+            if len(invalid):
+                raise self._invalid_choice(int(invalid[0]))
+            probs = np.frombuffer(self.option_probs, dtype=np.float64)
+            offsets = np.frombuffer(self.option_offsets, dtype=np.int64)
+            picked = offsets[:-1][rows] + outcome[rows].astype(np.int64)
+            if rule == "log":
+                with np.errstate(divide="ignore"):
+                    scores[rows] = -np.log(probs[picked])
+            else:
+                # Indicator of the chosen option, laid out like option_probs
+                chosen = np.zeros(len(probs))
+                chosen[picked] = 1
+                # Sum the squared errors of each row's options
+                row_of_option = np.repeat(np.arange(len(self)), np.diff(offsets))
+                sums = np.bincount(
+                    row_of_option, weights=(chosen - probs) ** 2, minlength=len(self)
+                )
+                scores[rows] = sums[rows]
+
+        # Parameter columns and (brier probability, crps, log score) kernels
+        kernels = {
+            "pert": (
+                ("min", "mode", "max"),
+                vectorized.pert_pdf_to_probability,
+                vectorized.pert_crps,
+                vectorized.pert_log_score,
+            ),
+            "lognormal": (
+                ("p5", "p50", "p95"),
+                vectorized.lognormal_pdf_to_probability,
+                vectorized.lognormal_crps,
+                vectorized.lognormal_log_score,
+            ),
+            "pareto": (
+                ("p90", "p99"),
+                vectorized.pareto_pdf_to_probability,
+                vectorized.pareto_crps,
+                vectorized.pareto_log_score,
+            ),
+        }
+        for name, (fields, probability, crps, log_score) in kernels.items():
+            rows = closed & (codes == TYPE_CODES[name])
+            if not rows.any():
+                continue
+            args = [outcome[rows]] + [column(field)[rows] for field in fields]
+            if rule == "crps":
+                scores[rows] = crps(*args)
+            elif rule == "log":
+                scores[rows] = log_score(*args)
+            else:
+                scores[rows] = 2 * (1 - probability(*args)) ** 2
+        return scores
+
+    def _score_row(self, i: int, rule: str = "brier") -> float:
+        if not self.has_outcome[i]:
+            return NAN
+        forecast_type = self.type(i)
+        outcome = self.outcome[i]
+        if forecast_type == "interval":
+            if rule != "brier":
+                return NAN
+            hit = 1 if self.min[i] <= outcome <= self.max[i] else 0
+            return 2 * (hit - self.confidence[i]) ** 2
+        if forecast_type == "choice":
+            if rule == "crps":
+                return NAN
+            if outcome < 0:
+                raise self._invalid_choice(i)
+            start, end = self.option_offsets[i], self.option_offsets[i + 1]
+            chosen = start + int(outcome)
+            if rule == "log":
+                probability = self.option_probs[chosen]
+                return -math.log(probability) if probability > 0 else math.inf
+            return sum(
+                ((1 if j == chosen else 0) - self.option_probs[j]) ** 2
+                for j in range(start, end)
+            )
+        from forecast.models.math import fitted
+
+        if forecast_type == "pert":
+            dist: Any = fitted.pert(self.min[i], self.mode[i], self.max[i])
+        elif forecast_type == "lognormal":
+            dist = fitted.lognormal(self.p5[i], self.p50[i], self.p95[i])
+        else:
+            dist = fitted.pareto(self.p90[i], self.p99[i])
+        if rule == "crps":
+            return dist.crps(outcome)
+        if rule == "log":
+            return dist.log_score(outcome)
+        return 2 * (1 - dist.pdf_to_probability(outcome)) ** 2
+
+    def order_by_end_date(self) -> List[int]:
+        """Row indices sorted by end date, keeping file order between equal dates."""
+        return sorted(range(len(self)), key=self.end_date.__getitem__)
+
+    def rows(
+        self, order: Optional[Iterable[int]] = None, rule: str = "brier"
+    ) -> Iterator[Tuple[str, datetime.date, Optional[float]]]:
+        """Yield (scenario, end_date, score or None) for display.
+
+        The score is None for open forecasts and NaN when the forecast's type
+        doesn't support `rule`.
+        """
+        scores = self.score_all(rule)
+        for i in range(len(self)) if order is None else order:
+            yield (
+                self.scenario[i],
+                datetime.date.fromordinal(self.end_date[i]),
+                scores[i] if self.has_outcome[i] else None,
+            )
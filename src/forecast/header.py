@@ -0,0 +1,156 @@
+# pyre-strict
+import hashlib
+import io
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+DELIMITER = b"---"
+
+# PyYAML is imported the first time a header is parsed
+_loader: Optional[Any] = None
+
+
+def _yaml_load(data: bytes) -> Any:
+    global _loader
+    import yaml  # type: ignore
+
+    if _loader is None:
+        # Prefer the libyaml C loader when it is available
+        _loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(data, Loader=_loader)
+
+
+class Metadata:
+    """A lightweight stand-in for `frontmatter.Post` that only carries metadata.
+
+    The Forecast models only ever read `post.metadata`, so this is all they need.
+
+    Attributes:
+        metadata (dict): The decoded YAML frontmatter
+    """
+
+    __slots__ = ("metadata",)
+
+    def __init__(self, metadata: Dict[str, Any]) -> None:
+        self.metadata = metadata
+
+
+def read_header(path: str) -> Metadata:
+    """Read only the YAML frontmatter of a `.forecast` file.
+
+    The file is read line by line up to the closing `---`, so the markdown body is
+    never loaded. Anything that isn't a plain `---` delimited YAML header is handed
+    to `frontmatter.load`, which knows about the rarer formats.
+
+    Args:
+        path: Path to the `.forecast` file
+
+    Returns:
+        Metadata: The decoded frontmatter
+    """
+    with open(path, "rb") as f:
+        post = _parse_lines(f)
+    if post is None:
+        return _read_with_frontmatter(path)
+    return post
+
+
+def parse_header(data: bytes) -> Metadata:
+    """Like `read_header`, for the contents of a `.forecast` file already in memory.
+
+    Args:
+        data: The raw file contents, e.g. a blob read from git
+
+    Returns:
+        Metadata: The decoded frontmatter
+    """
+    post = _parse_lines(io.BytesIO(data))
+    if post is None:
+        return _parse_with_frontmatter(data)
+    return post
+
+
+def read_header_digest(f: IO[bytes]) -> Tuple[Metadata, str]:
+    """Like `read_header` on an open file, also returning its `header_digest`.
+
+    The digest covers the same bytes the header is parsed from, so a plain header
+    is still read without loading the body.
+    """
+    lines = _header_lines(f)
+    post = None if lines is None else _parse_metadata(lines)
+    data = None
+    if lines is None or post is None:
+        f.seek(0)
+        data = f.read()
+    if post is None:
+        assert data is not None
+        post = _parse_with_frontmatter(data)
+    return post, _digest(lines, data)
+
+
+def header_digest(path: str) -> str:
+    """The SHA-256 of what a `.forecast` file's header is read from, in hex.
+
+    That is the `---` delimited header, delimiters included, or the whole file
+    if it doesn't start with one. Edits to the body of a file with a plain
+    header don't change it, as they can't change the forecast.
+    """
+    with open(path, "rb") as f:
+        lines = _header_lines(f)
+        if lines is None:
+            f.seek(0)
+            return _digest(None, f.read())
+        return _digest(lines, None)
+
+
+def _digest(lines: Optional[List[bytes]], data: Optional[bytes]) -> str:
+    digest = hashlib.sha256()
+    if lines is not None:
+        for line in lines:
+            digest.update(line)
+    else:
+        assert data is not None
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def _header_lines(f: IO[bytes]) -> Optional[List[bytes]]:
+    # The lines of a plain `---` delimited header, delimiters included; None if
+    # the file doesn't start with one
+    first = f.readline()
+    opening = first[3:] if first.startswith(b"\xef\xbb\xbf") else first
+    if opening.rstrip() != DELIMITER:
+        return None
+    lines = [first]
+    for line in f:
+        lines.append(line)
+        if line.rstrip() == DELIMITER:
+            return lines
+    return None
+
+
+def _parse_metadata(lines: List[bytes]) -> Optional[Metadata]:
+    # None means the header isn't the plain format and needs frontmatter
+    metadata = _yaml_load(b"".join(lines[1:-1]))
+    if metadata is None:
+        metadata = {}
+    if isinstance(metadata, dict):
+        return Metadata(metadata)
+    return None
+
+
+def _parse_lines(f: IO[bytes]) -> Optional[Metadata]:
+    # None means the header isn't the plain format and needs frontmatter
+    lines = _header_lines(f)
+    return None if lines is None else _parse_metadata(lines)
+
+
+def _parse_with_frontmatter(data: bytes) -> Metadata:
+    import frontmatter  # type: ignore
+
+    return Metadata(frontmatter.loads(data.decode("utf-8-sig")).metadata)
+
+
+def _read_with_frontmatter(path: str) -> Metadata:
+    import frontmatter  # type: ignore
+
+    return Metadata(frontmatter.load(path).metadata)
@@ -0,0 +1,169 @@
+# pyre-strict
+import datetime
+import os
+import subprocess
+from typing import IO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from forecast.header import parse_header
+from forecast.loader import LoadResult, load_post
+
+
+class GitError(Exception):
+    """Raised when git is missing, or the forecasts aren't in a git repository."""
+
+
+class HistoryPoint(NamedTuple):
+    """The state of every forecast at one commit that touched the forecast directory.
+
+    Attributes:
+        commit (str): The commit SHA
+        date (datetime.datetime): The commit date
+        results (list[LoadResult]): One result per `.forecast` file, by file name
+    """
+
+    commit: str
+    date: datetime.datetime
+    results: List[LoadResult]
+
+    def status(self, result: LoadResult) -> str:
+        """Closed, Open, Overdue (as of the commit date) or Error.
+
+        A forecast with an outcome is Closed even if it couldn't be scored; it
+        then has no score, and is left out of `mean_score`.
+        """
+        if result.error is not None:
+            return "Error"
+        if "outcome" in result.metadata:
+            return "Closed"
+        end_date = result.metadata["end_date"]
+        if isinstance(end_date, datetime.datetime):
+            end_date = end_date.date()
+        elif not isinstance(end_date, datetime.date):
+            end_date = datetime.datetime.strptime(str(end_date), "%Y-%m-%d").date()
+        return "Overdue" if end_date < self.date.date() else "Open"
+
+    def mean_score(self) -> Optional[float]:
+        """The mean Brier score of the forecasts closed at this commit."""
+        scores = [r.score for r in self.results if r.score is not None]
+        return sum(scores) / len(scores) if scores else None
+
+
+class ObjectReader:
+    """Reads git objects through one long-lived `git cat-file --batch` process.
+
+    Args:
+        cwd: Any directory inside the repository
+    """
+
+    def __init__(self, cwd: str) -> None:
+        self.process: subprocess.Popen = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def read(self, name: str) -> Optional[Tuple[str, str, bytes]]:
+        """Look up `name` (a SHA or `<rev>:<path>`); return (sha, type, data) or None."""
+        stdin: IO[bytes] = self.process.stdin
+        stdout: IO[bytes] = self.process.stdout
+        stdin.write(name.encode() + b"\n")
+        stdin.flush()
+        header = stdout.readline().split()
+        if len(header) != 3:
+            # "<name> missing", e.g. the directory doesn't exist at that commit
+            return None
+        sha, kind, size = header
+        data = stdout.read(int(size))
+        stdout.read(1)  # the newline after each object
+        return sha.decode(), kind.decode(), data
+
+    def close(self) -> None:
+        self.process.stdin.close()
+        self.process.wait()
+
+    def __enter__(self) -> "ObjectReader":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def parse_tree(data: bytes) -> Iterator[Tuple[str, str, str]]:
+    """Yield (mode, name, sha) for each entry of a raw git tree object."""
+    offset = 0
+    while offset < len(data):
+        space = data.index(b" ", offset)
+        nul = data.index(b"\0", space)
+        sha = data[nul + 1 : nul + 21].hex()
+        yield data[offset:space].decode(), os.fsdecode(data[space + 1 : nul]), sha
+        offset = nul + 21
+
+
+def _git(forecast_dir: str, *args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args],
+            cwd=forecast_dir,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    except FileNotFoundError:
+        raise GitError("git is not installed")
+    except subprocess.CalledProcessError as e:
+        raise GitError(e.stderr.strip() or str(e))
+
+
+def forecast_history(forecast_dir: str) -> Iterator[HistoryPoint]:
+    """Score every forecast at each commit that touched `forecast_dir`, oldest first.
+
+    Only two git processes are started: `git log` lists the commits, and a single
+    `git cat-file --batch` streams every tree and blob. Files are parsed and
+    scored once per blob SHA, so a file that didn't change between commits is
+    never parsed again.
+
+    Args:
+        forecast_dir: The forecast directory, inside a git repository
+
+    Raises:
+        GitError: If git fails, e.g. outside a git repository
+    """
+    prefix = _git(forecast_dir, "rev-parse", "--show-prefix").strip().rstrip("/")
+    log = _git(forecast_dir, "log", "--reverse", "--format=%H %ct", "--", ".")
+    memo: Dict[str, LoadResult] = {}
+    with ObjectReader(forecast_dir) as reader:
+        for line in log.splitlines():
+            commit, timestamp = line.split()
+            tree = reader.read(f"{commit}:{prefix}" if prefix else f"{commit}^{{tree}}")
+            results = []
+            if tree is not None and tree[1] == "tree":
+                for mode, name, sha in parse_tree(tree[2]):
+                    if not name.endswith(".forecast") or not mode.startswith("10"):
+                        continue
+                    results.append(_load_blob(reader, memo, name, sha))
+            yield HistoryPoint(
+                commit,
+                datetime.datetime.fromtimestamp(int(timestamp)),
+                sorted(results, key=lambda r: r.filename),
+            )
+
+
+def _load_blob(
+    reader: ObjectReader, memo: Dict[str, LoadResult], filename: str, sha: str
+) -> LoadResult:
+    result = memo.get(sha)
+    if result is None:
+        blob = reader.read(sha)
+        try:
+            if blob is None:
+                raise ValueError(f"blob {sha} is missing")
+            result = load_post(filename, parse_header(blob[2]))
+        except Exception as e:
+            # Old revisions may hold files that never parsed; record it and move on
+            result = LoadResult(filename, None, None, str(e))
+        memo[sha] = result
+    # The same contents may live under another name in other commits
+    if result.filename != filename:
+        result = result._replace(filename=filename)
+    return result
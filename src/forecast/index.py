@@ -0,0 +1,237 @@
+# pyre-strict
+import bisect
+import datetime
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from forecast.cache import CACHE_DIR, package_version, write_cache_file
+from forecast.factory import create_forecast
+from forecast.header import Metadata
+from forecast.loader import LoadResult, load_post, read_fingerprinted
+from forecast.models.forecast import read_tags
+
+INDEX_FILE = "index.json"
+# Bump when the layout of the index file changes.
+INDEX_FORMAT = 3
+
+
+class IndexEntry(NamedTuple):
+    """What the index knows about one `.forecast` file.
+
+    Attributes:
+        size (int): File size when the entry was made
+        mtime (int): File mtime in nanoseconds when the entry was made
+        type (str, optional): The forecast type, None if the header is invalid
+        tags (list): The forecast's tags, read as the Forecast reads them
+        end_date (int, optional): The end date as a proleptic ordinal
+        closed (bool): Whether the forecast has an outcome
+        scenario (str, optional): The scenario, for listings served from the index
+        error (str, optional): Why the header couldn't be indexed, or why the
+            forecast failed validation
+    """
+
+    size: int
+    mtime: int
+    type: Optional[str]
+    tags: List[Any]
+    end_date: Optional[int]
+    closed: bool
+    scenario: Optional[str]
+    error: Optional[str]
+
+
+def _end_ordinal(raw: Any) -> int:
+    if isinstance(raw, datetime.datetime):
+        return raw.date().toordinal()
+    if isinstance(raw, datetime.date):
+        return raw.toordinal()
+    return datetime.datetime.strptime(str(raw), "%Y-%m-%d").date().toordinal()
+
+
+def _tags(metadata: Dict[str, Any]) -> List[Any]:
+    # Keep the index JSON-serializable; other values can't equal a CLI tag anyway
+    return [
+        t if isinstance(t, (str, int, float, bool)) else str(t)
+        for t in read_tags(metadata)
+    ]
+
+
+def index_entry(post: Metadata, size: int, mtime: int) -> IndexEntry:
+    """Extract the fields the index filters on from a parsed header.
+
+    The forecast is also built, so a header that indexes fine but fails model
+    validation, like a pert without `min`, is kept as an error entry.
+    """
+    try:
+        create_forecast(post)
+        metadata = post.metadata
+        return IndexEntry(
+            size,
+            mtime,
+            str(metadata["type"]),
+            _tags(metadata),
+            _end_ordinal(metadata["end_date"]),
+            "outcome" in metadata,
+            str(metadata["scenario"]),
+            None,
+        )
+    except Exception as e:
+        return IndexEntry(size, mtime, None, [], None, False, None, str(e))
+
+
+class ForecastIndex:
+    """A persistent index from type, tag, end date and open/closed state to files.
+
+    It lives next to the score cache in `.cache/index.json`. `refresh` only
+    re-reads the headers of files whose size or mtime changed, so filtered runs
+    open just the files that match instead of parsing the whole corpus.
+
+    Entries whose header couldn't be indexed match every query, so the error
+    still surfaces when the file is loaded.
+
+    Args:
+        forecast_dir (str): The directory holding the `.forecast` files
+        read (bool): Start from the saved index. False starts empty, for runs
+            that neither read nor update `.cache`
+    """
+
+    def __init__(self, forecast_dir: str, read: bool = True) -> None:
+        self.forecast_dir = forecast_dir
+        self.cache_dir: str = os.path.join(forecast_dir, CACHE_DIR)
+        self.path: str = os.path.join(self.cache_dir, INDEX_FILE)
+        self.header: Dict[str, Any] = {
+            "format": INDEX_FORMAT,
+            "package": package_version(),
+        }
+        self.entries: Dict[str, IndexEntry] = self._read() if read else {}
+        self.dirty = False
+        self.loaded: Dict[str, LoadResult] = {}
+        self._by_type: Optional[Dict[str, Set[str]]] = None
+        self._by_tag: Dict[Any, Set[str]] = {}
+        self._by_date: List[Any] = []
+
+    def _read(self) -> Dict[str, IndexEntry]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("header") != self.header:
+            return {}
+        return {name: IndexEntry(*row) for name, row in data["entries"].items()}
+
+    def refresh(
+        self,
+        filenames: Iterable[str],
+        keep: Optional[Callable[[IndexEntry], bool]] = None,
+    ) -> None:
+        """Bring the index up to date with `filenames`, the complete current listing.
+
+        Files are only re-read when their size or mtime changed; entries for
+        files that are no longer listed are dropped.
+
+        Args:
+            filenames: Every `.forecast` file, relative to the forecast directory
+            keep: Load and score the re-read files whose entry it accepts, and
+                keep the results in `loaded`, so the caller can use them without
+                reading the files again. Only valid forecasts are kept.
+        """
+        self.loaded = {}
+        live = set()
+        for filename in filenames:
+            live.add(filename)
+            path = os.path.join(self.forecast_dir, filename)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entry = self.entries.get(filename)
+            if (
+                entry is not None
+                and entry.size == st.st_size
+                and entry.mtime == st.st_mtime_ns
+            ):
+                continue
+            self.dirty = True
+            try:
+                post, fingerprint = read_fingerprinted(path)
+            except Exception as e:
+                self.entries[filename] = IndexEntry(
+                    st.st_size, st.st_mtime_ns, None, [], None, False, None, str(e)
+                )
+                continue
+            entry = index_entry(post, st.st_size, st.st_mtime_ns)
+            self.entries[filename] = entry
+            if keep is not None and entry.error is None and keep(entry):
+                self.loaded[filename] = load_post(filename, post, True, fingerprint)
+        for filename in [f for f in self.entries if f not in live]:
+            del self.entries[filename]
+            self.dirty = True
+        if self.dirty:
+            self._by_type = None
+
+    def _build(self) -> None:
+        by_type: Dict[str, Set[str]] = {}
+        by_tag: Dict[Any, Set[str]] = {}
+        by_date = []
+        for filename, entry in self.entries.items():
+            if entry.type is None:
+                continue
+            by_type.setdefault(entry.type, set()).add(filename)
+            for tag in entry.tags:
+                by_tag.setdefault(tag, set()).add(filename)
+            by_date.append((entry.end_date, filename))
+        by_date.sort()
+        self._by_type, self._by_tag, self._by_date = by_type, by_tag, by_date
+
+    def select(
+        self,
+        type: Optional[str] = None,
+        tag: Optional[str] = None,
+        end_after: Optional[datetime.date] = None,
+        end_before: Optional[datetime.date] = None,
+        closed: Optional[bool] = None,
+    ) -> Set[str]:
+        """File names matching every given filter, plus any that couldn't be indexed.
+
+        Args:
+            type: Forecast type
+            tag: A tag the forecast must have
+            end_after: Earliest end date, inclusive
+            end_before: Latest end date, inclusive
+            closed: True for forecasts with an outcome, False for open ones
+        """
+        if self._by_type is None:
+            self._build()
+        assert self._by_type is not None
+        matches: Optional[Set[str]] = None
+        if type is not None:
+            matches = self._by_type.get(type, set())
+        if tag is not None:
+            tagged = self._by_tag.get(tag, set())
+            matches = tagged if matches is None else matches & tagged
+        if end_after is not None or end_before is not None:
+            low = 0
+            high = len(self._by_date)
+            if end_after is not None:
+                low = bisect.bisect_left(self._by_date, (end_after.toordinal(),))
+            if end_before is not None:
+                high = bisect.bisect_left(self._by_date, (end_before.toordinal() + 1,))
+            dated = {filename for _, filename in self._by_date[low:high]}
+            matches = dated if matches is None else matches & dated
+        if matches is None:
+            matches = {f for f, e in self.entries.items() if e.type is not None}
+        if closed is not None:
+            matches = {f for f in matches if self.entries[f].closed == closed}
+        invalid = {f for f, e in self.entries.items() if e.type is None}
+        return matches | invalid
+
+    def save(self) -> None:
+        """Atomically write the index back to disk, if anything changed."""
+        if not self.dirty:
+            return
+        entries = {name: list(entry) for name, entry in self.entries.items()}
+        payload = json.dumps({"header": self.header, "entries": entries})
+        if write_cache_file(self.cache_dir, self.path, payload):
+            self.dirty = False
@@ -0,0 +1,442 @@
+# pyre-strict
+import os
+from collections import deque
+from itertools import chain, islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from forecast.factory import create_forecast
+from forecast.header import Metadata, read_header, read_header_digest
+from forecast.models.forecast import Forecast
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from forecast.cache import ForecastCache
+    from forecast.index import IndexEntry
+    from forecast.query import Where
+
+# Number of files handed to a worker at a time. Small directories are loaded
+# serially, since starting a pool costs more than parsing a few dozen files.
+CHUNK_SIZE = 64
+
+
+class Fingerprint(NamedTuple):
+    """The size, mtime and header digest of a file, as it was parsed.
+
+    Attributes:
+        size (int): The file size in bytes
+        mtime (int): The modification time in nanoseconds
+        sha256 (str): The `header_digest` of the bytes that were parsed
+    """
+
+    size: int
+    mtime: int
+    sha256: str
+
+
+class LoadResult(NamedTuple):
+    """The compact outcome of loading one `.forecast` file.
+
+    Attributes:
+        filename (str): The file name, relative to the forecast directory
+        metadata (dict, optional): The decoded frontmatter, if the file was valid
+            and loaded with `record`
+        score (float, optional): The Brier score, if the forecast is closed and scorable
+        error (str, optional): The validation error, if the file was invalid
+        forecast (Forecast, optional): The forecast built while validating the
+            file, carrying its score, so the parent process never builds it again
+        fingerprint (Fingerprint, optional): What the result was loaded from, if
+            loaded with `record` and the file didn't change while it was read
+    """
+
+    filename: str
+    metadata: Optional[Dict[str, Any]]
+    score: Optional[float]
+    error: Optional[str]
+    forecast: Optional[Forecast] = None
+    fingerprint: Optional[Fingerprint] = None
+
+
+def read_fingerprinted(path: str) -> Tuple[Metadata, Optional[Fingerprint]]:
+    """Read a file's header and fingerprint the bytes it was parsed from.
+
+    Only the header is read, as by `read_header`, and only those bytes are
+    hashed. The fingerprint is None if the file changed while it was being read,
+    so nothing is ever stored under a fingerprint it wasn't loaded from.
+    """
+    with open(path, "rb") as f:
+        before = os.fstat(f.fileno())
+        post, digest = read_header_digest(f)
+        after = os.fstat(f.fileno())
+    stat = (after.st_size, after.st_mtime_ns)
+    if (before.st_size, before.st_mtime_ns) != stat:
+        return post, None
+    return post, Fingerprint(after.st_size, after.st_mtime_ns, digest)
+
+
+def load_file(forecast_dir: str, filename: str, record: bool = True) -> LoadResult:
+    """Parse, validate and score a single `.forecast` file.
+
+    Args:
+        forecast_dir: Directory holding the file
+        filename: The file name, relative to `forecast_dir`
+        record: Also return the decoded metadata and the file's fingerprint,
+            which the cache, bundles and the SQLite mirror store. Either way only
+            the header is read; without it, only the built forecast is returned.
+    """
+    result = _load(forecast_dir, filename, None, record)
+    assert result is not None
+    return result
+
+
+def load_matching(
+    forecast_dir: str, filename: str, where: Optional["Where"], record: bool = True
+) -> Optional[LoadResult]:
+    """Like `load_file`, but returns None without building or scoring the
+    forecast if `where` rules its header out."""
+    if where is None:
+        return load_file(forecast_dir, filename, record)
+    return _load(forecast_dir, filename, where, record)
+
+
+def _load(
+    forecast_dir: str, filename: str, where: Optional["Where"], record: bool
+) -> Optional[LoadResult]:
+    path = os.path.join(forecast_dir, filename)
+    fingerprint: Optional[Fingerprint] = None
+    try:
+        if record:
+            post, fingerprint = read_fingerprinted(path)
+        else:
+            post = read_header(path)
+    except Exception as e:
+        # Unreadable files and malformed YAML are reported like any invalid forecast
+        return LoadResult(filename, None, None, str(e), None, fingerprint)
+    if where is not None and not where.admits(post.metadata):
+        return None
+    return load_post(filename, post, record, fingerprint)
+
+
+def load_post(
+    filename: str,
+    post: Metadata,
+    record: bool = True,
+    fingerprint: Optional[Fingerprint] = None,
+) -> LoadResult:
+    """Validate and score an already parsed `.forecast` header."""
+    try:
+        forecast: Forecast = create_forecast(post)
+    except Exception as e:
+        return LoadResult(filename, None, None, str(e), None, fingerprint)
+
+    score: Optional[float] = None
+    if hasattr(forecast, "outcome"):
+        try:
+            score = forecast.calc()
+        except Exception:
+            # Leave it unscored so the failure surfaces when the table is built,
+            # exactly as it does on the serial path.
+            score = None
+    forecast.brier = score
+    metadata = dict(post.metadata) if record else None
+    return LoadResult(filename, metadata, score, None, forecast, fingerprint)
+
+
+def _load_chunk(
+    forecast_dir: str,
+    filenames: List[str],
+    where: Optional["Where"],
+    record: bool,
+) -> List[Optional[LoadResult]]:
+    return [
+        load_matching(forecast_dir, filename, where, record) for filename in filenames
+    ]
+
+
+def load_files(
+    forecast_dir: str,
+    filenames: Iterable[str],
+    jobs: Optional[int] = None,
+    cache: Optional["ForecastCache"] = None,
+    where: Optional["Where"] = None,
+    record: bool = True,
+    loaded: Optional[Dict[str, LoadResult]] = None,
+) -> Iterator[LoadResult]:
+    """Load `filenames` from `forecast_dir`, yielding results in input order.
+
+    `filenames` is consumed lazily and only a few chunks are in flight at a time,
+    so memory stays flat however many files there are.
+
+    Args:
+        forecast_dir: Directory holding the files
+        filenames: The file names to load
+        jobs: Number of worker processes. Defaults to the CPU count; 1 loads serially.
+        cache: Optional cache consulted before, and updated after, loading a file
+        where: Skip files whose header it rules out, see `Where.admits`
+        record: Also return each file's metadata, see `load_file`. The cache
+            only stores results loaded with it.
+        loaded: Results already loaded, e.g. while refreshing the metadata
+            index, used in place of reading those files again. They are put in
+            the cache as they are used.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
+    names = iter(filenames)
+    # Peek one past a chunk: a small directory isn't worth starting a pool for
+    first = list(islice(names, CHUNK_SIZE + 1))
+    if jobs <= 1 or len(first) <= CHUNK_SIZE:
+        for filename in chain(first, names):
+            hit = _hit(filename, cache, loaded)
+            if hit is not None:
+                if _admits(where, hit):
+                    yield hit
+                continue
+            result = load_matching(forecast_dir, filename, where, record)
+            if result is None:
+                continue
+            if cache is not None:
+                cache.put(result)
+            yield result
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    pending: Deque[Tuple[List[str], Dict[str, LoadResult], Optional["Future"]]] = (
+        deque()
+    )
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        for chunk in _chunks(chain(first, names)):
+            hits: Dict[str, LoadResult] = {}
+            if cache is not None or loaded:
+                for filename in chunk:
+                    hit = _hit(filename, cache, loaded)
+                    if hit is not None:
+                        hits[filename] = hit
+            misses = [f for f in chunk if f not in hits]
+            future = (
+                executor.submit(_load_chunk, forecast_dir, misses, where, record)
+                if misses
+                else None
+            )
+            pending.append((chunk, hits, future))
+            # Keep every worker busy, but never read far ahead of the consumer
+            if len(pending) > 2 * jobs:
+                yield from _collect(*pending.popleft(), cache, where)
+        while pending:
+            yield from _collect(*pending.popleft(), cache, where)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _chunks(filenames: Iterator[str]) -> Iterator[List[str]]:
+    while True:
+        chunk = list(islice(filenames, CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _hit(
+    filename: str,
+    cache: Optional["ForecastCache"],
+    loaded: Optional[Dict[str, LoadResult]],
+) -> Optional[LoadResult]:
+    result = loaded.pop(filename, None) if loaded else None
+    if result is not None:
+        if cache is not None:
+            cache.put(result)
+        return result
+    return cache.get(filename) if cache is not None else None
+
+
+def _admits(where: Optional["Where"], result: LoadResult) -> bool:
+    return where is None or result.metadata is None or where.admits(result.metadata)
+
+
+def _collect(
+    chunk: List[str],
+    hits: Dict[str, LoadResult],
+    future: Optional["Future"],
+    cache: Optional["ForecastCache"],
+    where: Optional["Where"] = None,
+) -> Iterator[LoadResult]:
+    loaded = iter(future.result() if future is not None else [])
+    for filename in chunk:
+        if filename in hits:
+            if _admits(where, hits[filename]):
+                yield hits[filename]
+        else:
+            result = next(loaded)
+            if result is None:
+                continue
+            if cache is not None:
+                cache.put(result)
+            yield result
+
+
+class ForecastError(NamedTuple):
+    """A `.forecast` file that could not be loaded.
+
+    Attributes:
+        root (str): The directory the file was found in
+        filename (str): The file name, relative to `root`
+        error (str): Why the file could not be loaded
+    """
+
+    root: str
+    filename: str
+    error: str
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.root, self.filename)
+
+
+def iter_forecasts(
+    root: Union[str, Sequence[str]],
+    *,
+    type: Optional[str] = None,
+    tag: Optional[str] = None,
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+    jobs: Optional[int] = 1,
+    use_cache: bool = False,
+    shard: Optional[Tuple[int, int]] = None,
+    where: Optional["Where"] = None,
+) -> Iterator[Union[Forecast, ForecastError]]:
+    """Lazily load, validate and score the `.forecast` files under one or more roots.
+
+    Each root is searched recursively (see `forecast.discovery.discover`), and
+    forecasts are yielded as their files are read, so a caller can stream any
+    number of them with flat memory and stop early. Files that fail to load are
+    yielded as ForecastError records rather than raised.
+
+    Args:
+        root: The directory, or directories, holding the `.forecast` files
+        type: Only yield forecasts of this type
+        tag: Only yield forecasts with this tag
+        include: Globs a file must match, relative to its root
+        exclude: Globs of files and directories to leave out, relative to their root
+        jobs: Number of worker processes. None uses the CPU count; 1 loads serially.
+        use_cache: Read and update the score cache in each root's `.cache`
+            directory. The cache is saved when a root is finished, or when the
+            generator is closed. With `type` or `tag`, the metadata index in
+            `.cache` is also used, so only the matching files are opened.
+        shard: Only read the files in shard (i, n) of n, see
+            `forecast.discovery.in_shard`
+        where: Only yield forecasts matching this `--where` expression. Files
+            whose header rules them out are never built or scored.
+
+    Yields:
+        Forecast or ForecastError: One item per matching or broken file
+    """
+    roots = [root] if isinstance(root, str) else list(root)
+    for directory in roots:
+        yield from _iter_root(
+            directory, type, tag, include, exclude, jobs, use_cache, shard, where
+        )
+
+
+def _iter_root(
+    root: str,
+    type: Optional[str],
+    tag: Optional[str],
+    include: Sequence[str],
+    exclude: Sequence[str],
+    jobs: Optional[int],
+    use_cache: bool,
+    shard: Optional[Tuple[int, int]] = None,
+    where: Optional["Where"] = None,
+) -> Iterator[Union[Forecast, ForecastError]]:
+    from forecast.discovery import discover, in_shard
+
+    cache = None
+    if use_cache:
+        from forecast.cache import ForecastCache
+
+        cache = ForecastCache(root)
+    seen: List[str] = []
+
+    def filenames() -> Iterator[str]:
+        for filename in discover(root, include, exclude):
+            # Only the cache needs the full listing, to prune deleted files
+            if cache is not None:
+                seen.append(filename)
+            yield filename
+
+    names: Iterable[str] = filenames()
+    loaded: Optional[Dict[str, LoadResult]] = None
+    if use_cache and (type is not None or tag is not None):
+        from forecast.index import ForecastIndex
+
+        # Only open the files the metadata index says can match
+        seen = list(names)
+
+        def can_match(entry: "IndexEntry") -> bool:
+            if entry.type is None:
+                return True
+            return (type is None or entry.type == type) and (
+                tag is None or tag in entry.tags
+            )
+
+        index = ForecastIndex(root)
+        # Matching files the index re-reads are kept, so they're parsed only once
+        index.refresh(seen, keep=can_match)
+        index.save()
+        selected = index.select(type=type, tag=tag)
+        names = [f for f in seen if f in selected]
+        loaded = index.loaded
+    if shard is not None:
+        # `seen` still lists every file, so the cache keeps other shards' entries
+        names = (f for f in names if in_shard(f, shard))
+
+    try:
+        # Without a cache only the built forecasts need to come back from workers
+        results = load_files(root, names, jobs, cache, where, cache is not None, loaded)
+        for result in results:
+            if result.error is not None:
+                yield ForecastError(root, result.filename, result.error)
+                continue
+            forecast = to_forecast(result)
+            forecast.path = os.path.join(root, result.filename)
+            if type is not None and forecast.type != type:
+                continue
+            if tag is not None and tag not in forecast.tags:
+                continue
+            if where is not None and not where.matches(forecast):
+                continue
+            yield forecast
+        if cache is not None:
+            # Only a complete listing says which entries belong to deleted files
+            cache.prune(seen)
+    finally:
+        if cache is not None:
+            cache.save()
+
+
+def to_forecast(result: LoadResult) -> Forecast:
+    """The Forecast for a successful LoadResult, keeping its score.
+
+    It is only rebuilt from the metadata for results that don't carry one, such
+    as cache hits.
+    """
+    if result.forecast is not None:
+        return result.forecast
+    forecast = create_forecast(Metadata(dict(result.metadata)))
+    forecast.brier = result.score
+    return forecast
@@ -1,6 +1,27 @@
-from .forecast import Forecast  # type:ignore
-from .choice import Choice  # type:ignore
-from .interval import Interval  # type:ignore
-from .pert import Pert  # type:ignore
-from .lognormal import LogNormal  # type:ignore
-from .pareto import Pareto  # type:ignore
+from typing import TYPE_CHECKING, Any
+
+from .forecast import Forecast  # type: ignore
+
+if TYPE_CHECKING:
+    from .choice import Choice  # type: ignore
+    from .interval import Interval  # type: ignore
+    from .pert import Pert  # type: ignore
+    from .lognormal import LogNormal  # type: ignore
+    from .pareto import Pareto  # type: ignore
+
+# The model classes are imported on first access, to keep startup fast
+_LAZY = {
+    "Choice": ".choice",
+    "Interval": ".interval",
+    "Pert": ".pert",
+    "LogNormal": ".lognormal",
+    "Pareto": ".pareto",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        from importlib import import_module
+
+        return getattr(import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
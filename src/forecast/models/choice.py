@@ -1,7 +1,11 @@
 # pyre-strict
-from frontmatter import Post  # type:ignore
-from typing import Dict, List
-from .forecast import Forecast
+import math
+from array import array
+from typing import TYPE_CHECKING, Dict, List, Tuple
+from .forecast import Forecast, share
+
+if TYPE_CHECKING:
+    from frontmatter import Post  # type:ignore
 
 
 class Choice(Forecast):
@@ -15,8 +19,10 @@ class Choice(Forecast):
         scenario (str): Inherited from Forecast, the scenario being forecasted
         end_date (datetime.date): Inherited from Forecast, the end date of the forecast
         type (str): Inherited from Forecast, the type of forecast
-        tags (list[str]): Inherited from Forecast, list of tags for the forecast
+        tags (tuple[str, ...]): Inherited from Forecast, tags for the forecast
         options (Dict[str, float]): Dictionary mapping option names to their probabilities
+        option_names (tuple[str, ...]): The option names, in file order
+        option_probs (array[float]): The probability of each option, in the same order
         outcome (str, optional): The actual outcome, if known
 
     Args:
@@ -29,39 +35,58 @@ class Choice(Forecast):
         ValueError: If calculating Brier score with invalid outcome
     """
 
-    def __init__(self, post: Post) -> None:
+    __slots__ = ("option_names", "option_probs", "outcome")
+
+    rules = ("brier", "log")
+
+    def __init__(self, post: "Post") -> None:
         Forecast.__init__(self, post)
 
         try:
-            self.options: Dict[str, float] = post.metadata["options"]  # type: ignore
+            options = post.metadata["options"]  # type: ignore
         except KeyError:
             raise KeyError("Error: Options not provided in post metadata.")
 
+        # Names are shared between forecasts offering the same options, and the
+        # probabilities are packed doubles in the same order
+        self.option_names: Tuple[str, ...] = share(tuple(options))
+        self.option_probs: "array[float]" = array("d", options.values())
+
         # Check that the sum of all option probabilities equals 1.0 (100%)
-        total_prob = sum(self.options.values())
+        total_prob = sum(self.option_probs)
         if not abs(total_prob - 1.0) < 1e-8:
             raise ValueError(
                 f"Sum of option probabilities must equal 1.0 (100%), but got {total_prob}."
             )
 
         if "outcome" in post.metadata:
-            self.outcome: str = post.metadata["outcome"]  # type: ignore
+            self.outcome: str = share(post.metadata["outcome"])  # type: ignore
+
+    @property
+    def options(self) -> Dict[str, float]:
+        """A dict mapping each option to its probability, built on each access."""
+        return dict(zip(self.option_names, self.option_probs))
 
     def calc(self) -> float:
         if hasattr(self, "outcome"):
-            scoring: List[float] = []
-
-            # First build the scoring list
-            for s, _ in self.options.items():
-                if s == self.outcome:
-                    scoring.append(1)
-                else:
-                    scoring.append(0)
-
-            # Then check if outcome exists - this should happen before building the scoring list
-            if self.outcome in self.options:
-                return self.brier_score(scoring, list(self.options.values()))
+            # Check that the outcome is one of the options before scoring
+            if self.outcome in self.option_names:
+                scoring: List[float] = [
+                    1 if s == self.outcome else 0 for s in self.option_names
+                ]
+                return self.brier_score(scoring, list(self.option_probs))
             else:
                 raise ValueError("The provided outcome was not in options.")
         else:
             raise ValueError("Outcome not provided in post metadata.")
+
+    def calc_rule(self, rule: str) -> float:
+        """The log score: the negative log of the probability given to the outcome."""
+        if rule != "log":
+            return super().calc_rule(rule)
+        if not hasattr(self, "outcome"):
+            raise ValueError("Outcome not provided in post metadata.")
+        if self.outcome not in self.option_names:
+            raise ValueError("The provided outcome was not in options.")
+        probability = self.option_probs[self.option_names.index(self.outcome)]
+        return -math.log(probability) if probability > 0 else math.inf
@@ -1,7 +1,50 @@
 # pyre-strict
-from frontmatter import Post  # type:ignore
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Tuple
 import datetime
+import sys
+
+if TYPE_CHECKING:
+    from frontmatter import Post  # type: ignore
+
+# Scoring rules a run can select: the Brier score, the continuous ranked
+# probability score and the log score (negative log likelihood of the outcome).
+SCORING_RULES = ("brier", "crps", "log")
+
+# Tag tuples, option names and end dates repeat across a corpus, so equal values
+# share one object. This grows with the number of distinct values, not forecasts.
+_shared: Dict[Any, Any] = {}
+
+
+def share(value: Any) -> Any:
+    """Return the shared object equal to `value`, interning strings.
+
+    Only strings, dates and tuples of strings are shared, so values that compare
+    equal across types (1, 1.0 and True) are never swapped for each other; anything
+    else is returned as is.
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, tuple):
+        if not all(isinstance(item, str) for item in value):
+            return value
+        value = tuple(sys.intern(item) for item in value)
+    elif type(value) is not datetime.date:
+        return value
+    return _shared.setdefault(value, value)
+
+
+def read_tags(metadata: Mapping[str, Any]) -> Tuple[Any, ...]:
+    """The tags in a forecast's metadata, as a tuple; ("",) if there are none.
+
+    A single tag may be written as a plain value, and `tags: null` means no tags.
+    Everything that reads tags from metadata goes through this, so they all agree
+    with the Forecast.
+    """
+    tags = metadata.get("tags", [""])
+    if not isinstance(tags, (list, tuple)):
+        tags = [""] if tags is None else [tags]
+    return tuple(tags)
 
 
 class Forecast(ABC):
@@ -11,16 +54,30 @@ class Forecast(ABC):
     providing common functionality for handling forecast metadata and calculating
     Brier scores.
 
+    Forecasts are `__slots__` records that copy what they need out of the Post
+    and keep no reference to it, so a large corpus stays compact in memory. An
+    open forecast has no `outcome` attribute at all.
+
     Attributes:
         scenario (str): The scenario being forecasted
         end_date (datetime.date): The end date of the forecast
-        type (str): The type of forecast
-        tags (list[str]): List of tags associated with the forecast
+        type (str): The type of forecast, interned
+        tags (tuple[str, ...]): Tags associated with the forecast, ("",) if none;
+            forecasts with the same tags share one tuple
+        brier (float, optional): A Brier score computed ahead of time, e.g. by a worker process
+        path (str, optional): The file the forecast was loaded from, if any
 
     Args:
         post (Post): A frontmatter Post object containing forecast metadata
     """
 
+    __slots__ = ("scenario", "end_date", "type", "tags", "brier", "path")
+
+    brier: Optional[float]
+    path: Optional[str]
+    # The scoring rules defined for this type, out of SCORING_RULES
+    rules: Tuple[str, ...] = ("brier",)
+
     @abstractmethod
     def calc(self) -> float:
         """Calculate the forecast score based on the outcome.
@@ -33,7 +90,7 @@ class Forecast(ABC):
         """
         pass
 
-    def __init__(self, post: Post) -> None:  # type: ignore
+    def __init__(self, post: "Post") -> None:  # type: ignore
         try:
             self.scenario: str = post.metadata["scenario"]  # type: ignore
             end_date_raw = post.metadata["end_date"]  # type: ignore
@@ -49,16 +106,41 @@ class Forecast(ABC):
                         f"end_date '{end_date_raw}' is not a valid YYYY-MM-DD date string."
                     )
 
-            self.end_date: datetime.date = end_date
-            self.type: str = post.metadata["type"]  # type: ignore
-            self.tags: list[str] = post.metadata.get("tags", [""])  # type: ignore
+            self.end_date: datetime.date = share(end_date)
+            self.type: str = share(post.metadata["type"])  # type: ignore
+            self.tags: Tuple[str, ...] = share(read_tags(post.metadata))  # type: ignore
         except KeyError:
             raise KeyError(
                 "Error: The scenario metadata is incorrect. Please refer to an example file to troubleshoot. "
             )
+        self.brier = None
+        self.path = None
+
+    def __setstate__(self, state: Tuple[Any, Dict[str, Any]]) -> None:
+        # Forecasts built in a worker process arrive pickled; share their values
+        # again, as __init__ does, so a parallel load stays as compact
+        for name, value in state[1].items():
+            setattr(self, name, share(value))
 
-    #  if "outcome" in post.metadata:
-    #     self.brier: float = self.calc()
+    def score(self, rule: str = "brier") -> float:
+        """Return the score under `rule`, one of SCORING_RULES; lower is better.
+
+        The Brier score reuses one computed while loading if present.
+
+        Raises:
+            ValueError: If there is no outcome, or `rule` isn't defined for this type
+        """
+        if rule == "brier":
+            return self.calc() if self.brier is None else self.brier
+        if rule not in self.rules:
+            raise ValueError(
+                f"The {rule} score is not defined for {self.type} forecasts."
+            )
+        return self.calc_rule(rule)
+
+    def calc_rule(self, rule: str) -> float:
+        """Calculate a score other than Brier; see `rules` for what a type supports."""
+        raise ValueError(f"The {rule} score is not defined for {self.type} forecasts.")
 
     def brier_score(self, outcomes: list[float], forecasts: list[float]) -> float:
         """Calculate the Brier score between actual outcomes and forecasted probabilities.
@@ -89,3 +171,28 @@ class Forecast(ABC):
             total_score += (outcome - forecast) ** 2
 
         return total_score
+
+
+class ContinuousForecast(Forecast):
+    """Base class for forecasts stated as a distribution over a number.
+
+    Besides the Brier score, these are scored with the closed-form CRPS and the
+    log score of their fitted distribution.
+    """
+
+    __slots__ = ()
+
+    rules = SCORING_RULES
+
+    @abstractmethod
+    def distribution(self) -> Any:
+        """The fitted distribution, shared between forecasts with equal parameters."""
+        pass
+
+    def calc_rule(self, rule: str) -> float:
+        if not hasattr(self, "outcome"):
+            raise ValueError("Outcome not provided in post metadata.")
+        outcome = float(self.outcome)  # type: ignore
+        if rule == "crps":
+            return self.distribution().crps(outcome)
+        return self.distribution().log_score(outcome)
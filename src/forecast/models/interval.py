@@ -1,7 +1,10 @@
 # pyre-strict
-from frontmatter import Post  # type:ignore
+from typing import TYPE_CHECKING
 from forecast.models.forecast import Forecast
 
+if TYPE_CHECKING:
+    from frontmatter import Post  # type:ignore
+
 
 class Interval(Forecast):
     """A forecast model for interval predictions.
@@ -15,7 +18,7 @@ class Interval(Forecast):
         scenario (str): Inherited from Forecast, the scenario being forecasted
         end_date (datetime.date): Inherited from Forecast, the end date of the forecast
         type (str): Inherited from Forecast, the type of forecast
-        tags (list[str]): Inherited from Forecast, list of tags for the forecast
+        tags (tuple[str, ...]): Inherited from Forecast, tags for the forecast
         min (float): The minimum value of the predicted interval
         max (float): The maximum value of the predicted interval
         confidence (float): The probability (between 0 and 1) that the outcome falls in the interval
@@ -33,7 +36,9 @@ class Interval(Forecast):
         ValueError: If calculating Brier score without an outcome
     """
 
-    def __init__(self, post: Post) -> None:
+    __slots__ = ("min", "max", "confidence", "outcome")
+
+    def __init__(self, post: "Post") -> None:
         Forecast.__init__(self, post)
         try:
             try:
@@ -1,13 +1,16 @@
 # pyre-strict
-from frontmatter import Post  # type:ignore
+from typing import TYPE_CHECKING, Any
 
 # import elicited as e # type:ignore
 # import numpy as np
 # from typing import Type
-from .forecast import Forecast
+from .forecast import ContinuousForecast
 
+if TYPE_CHECKING:
+    from frontmatter import Post  # type:ignore
 
-class LogNormal(Forecast):
+
+class LogNormal(ContinuousForecast):
     """A forecast model for lognormally distributed predictions.
 
     This class implements the Forecast base class for scenarios where the outcome
@@ -18,7 +21,7 @@ class LogNormal(Forecast):
         scenario (str): Inherited from Forecast, the scenario being forecasted
         end_date (datetime.date): Inherited from Forecast, the end date of the forecast
         type (str): Inherited from Forecast, the type of forecast
-        tags (list[str]): Inherited from Forecast, list of tags for the forecast
+        tags (tuple[str, ...]): Inherited from Forecast, tags for the forecast
         p5 (float): The 5th percentile value of the distribution
         p50 (float): The 50th percentile (median) value of the distribution
         p95 (float): The 95th percentile value of the distribution
@@ -37,8 +40,10 @@ class LogNormal(Forecast):
         ValueError: If calculating Brier score without an outcome
     """
 
-    def __init__(self, post: Post) -> None:  # type: ignore
-        Forecast.__init__(self, post)  # type: ignore
+    __slots__ = ("p5", "p50", "p95", "outcome")
+
+    def __init__(self, post: "Post") -> None:  # type: ignore
+        ContinuousForecast.__init__(self, post)  # type: ignore
         try:
             try:
                 self.p5: float = float(post.metadata["p5"])  # type: ignore
@@ -55,11 +60,14 @@ class LogNormal(Forecast):
         if "outcome" in post.metadata:  # type: ignore
             self.outcome: float = post.metadata["outcome"]  # type: ignore
 
+    def distribution(self) -> Any:
+        from forecast.models.math import fitted
+
+        return fitted.lognormal(self.p5, self.p50, self.p95)
+
     def calc(self) -> float:
         if hasattr(self, "outcome"):
-            import forecast.models.math.lognormal as ln
-
-            lognormal = ln.LogNormal(self.p5, self.p50, self.p95)
+            lognormal = self.distribution()
             outcome_probability: float = lognormal.pdf_to_probability(self.outcome)
             return self.brier_score(
                 [1, 0], [outcome_probability, 1 - outcome_probability]
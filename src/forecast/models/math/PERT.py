@@ -1,51 +1,150 @@
 import math
-from typing import Optional
+from typing import List, Optional, Sequence
 
+from forecast.models.math.fitted import Frozen
+
+# Continued fraction settings for the regularized incomplete beta function
+_CF_MAX_ITER = 200
+_CF_EPS = 3e-16
+_CF_TINY = 1e-300
+# Newton/bisection steps allowed when inverting the cdf
+_PPF_MAX_ITER = 100
+
+
+def _betacf(a: float, b: float, x: float) -> float:
+    """Evaluate the continued fraction for I_x(a, b) with the modified Lentz method."""
+    qab = a + b
+    qap = a + 1
+    qam = a - 1
+    c = 1.0
+    d = 1 - qab * x / qap
+    if abs(d) < _CF_TINY:
+        d = _CF_TINY
+    d = 1 / d
+    h = d
+    for m in range(1, _CF_MAX_ITER + 1):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1 + aa * d
+        if abs(d) < _CF_TINY:
+            d = _CF_TINY
+        c = 1 + aa / c
+        if abs(c) < _CF_TINY:
+            c = _CF_TINY
+        d = 1 / d
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1 + aa * d
+        if abs(d) < _CF_TINY:
+            d = _CF_TINY
+        c = 1 + aa / c
+        if abs(c) < _CF_TINY:
+            c = _CF_TINY
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < _CF_EPS:
+            break
+    return h
+
+
+def betainc(a: float, b: float, x: float, log_beta: Optional[float] = None) -> float:
+    """Regularized incomplete beta function I_x(a, b).
+
+    Uses the continued fraction on whichever side of the mean converges fastest,
+    via the symmetry I_x(a, b) = 1 - I_{1-x}(b, a). Pass `log_beta`, the log of
+    the beta function B(a, b), to avoid recomputing it on every call.
+    """
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    if log_beta is None:
+        log_beta = math.lgamma(a) + math.lgamma(b) - math.lgamma(a + b)
+    front = math.exp(a * math.log(x) + b * math.log1p(-x) - log_beta)
+    if x < (a + 1) / (a + b + 2):
+        return front * _betacf(a, b, x) / a
+    return 1 - front * _betacf(b, a, 1 - x) / b
+
+
+class PERT(Frozen):
+    """A PERT distribution, with its beta parameters fitted once.
+
+    Instances are immutable; `fitted.pert` shares one per parameter tuple.
+    """
+
+    __slots__ = (
+        "xmin",
+        "xmax",
+        "mode",
+        "range",
+        "alpha",
+        "beta",
+        "log_beta",
+        "half_spread",
+    )
+    _args = ("xmin", "mode", "xmax")
 
-class PERT:
     def __init__(self, xmin: float, mode: float, xmax: float):
         if not (xmin <= mode <= xmax):
             raise ValueError("mode must be between xmin and xmax")
         if xmin == xmax:
             raise ValueError("xmin and xmax must be different")
 
-        self.xmin = xmin
-        self.xmax = xmax
-        self.mode = mode
-        self.range = xmax - xmin
-
+        span = xmax - xmin
         # Calculate alpha and beta parameters
-        self.alpha = 1 + 4 * (mode - xmin) / self.range
-        self.beta = 1 + 4 * (xmax - mode) / self.range
+        alpha = 1 + 4 * (mode - xmin) / span
+        beta = 1 + 4 * (xmax - mode) / span
+        log_beta = math.lgamma(alpha) + math.lgamma(beta) - math.lgamma(alpha + beta)
+        self._set(
+            xmin=xmin,
+            xmax=xmax,
+            mode=mode,
+            range=span,
+            alpha=alpha,
+            beta=beta,
+            # log B(alpha, beta), shared by every pdf and cdf evaluation
+            log_beta=log_beta,
+            # E|X - X'| / 2 of the unit beta: 2 B(2a, 2b) / ((a + b) B(a, b)^2)
+            half_spread=2
+            / (alpha + beta)
+            * math.exp(
+                math.lgamma(2 * alpha)
+                + math.lgamma(2 * beta)
+                - math.lgamma(2 * alpha + 2 * beta)
+                - 2 * log_beta
+            ),
+        )
 
     def _beta_pdf(self, x: float) -> float:
         # Beta PDF on [0, 1]
         if x <= 0 or x >= 1:
             return 0.0
-        B = (
-            math.gamma(self.alpha)
-            * math.gamma(self.beta)
-            / math.gamma(self.alpha + self.beta)
+        return math.exp(
+            (self.alpha - 1) * math.log(x)
+            + (self.beta - 1) * math.log1p(-x)
+            - self.log_beta
         )
-        return (x ** (self.alpha - 1)) * ((1 - x) ** (self.beta - 1)) / B
 
     def _beta_cdf(self, x: float) -> float:
-        # Approximate Beta CDF using continued fraction for regularized incomplete beta function
-        # We'll use a simple numerical integration fallback here
-        steps = 100
-        total = 0
-        dx = x / steps
-        for i in range(1, steps + 1):
-            total += self._beta_pdf(i * dx)
-        return total * dx
+        # Beta CDF on [0, 1], the regularized incomplete beta function
+        return betainc(self.alpha, self.beta, x, self.log_beta)
 
     def pdf(self, x: float) -> float:
+        if not isinstance(x, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.pert_pdf(x, self.xmin, self.mode, self.xmax)
         if x < self.xmin or x > self.xmax:
             return 0.0
         scaled_x = (x - self.xmin) / self.range
         return self._beta_pdf(scaled_x) / self.range
 
     def cdf(self, x: float) -> float:
+        if not isinstance(x, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.pert_cdf(x, self.xmin, self.mode, self.xmax)
         if x <= self.xmin:
             return 0.0
         if x >= self.xmax:
@@ -59,28 +158,104 @@ class PERT:
     def variance(self) -> float:
         return ((self.xmax - self.xmin) ** 2 * (1 + 4)) / (36 * (1 + 4 + 1))
 
-    def ppf(self, p: float) -> float:
-        # Approximate inverse CDF via bisection search
+    def ppf(self, p: float, tol: Optional[float] = None) -> float:
+        """Inverse CDF, solved to within `tol` in x (default: 1e-12 of the range)."""
+        if not isinstance(p, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.pert_ppf(p, self.xmin, self.mode, self.xmax, tol)
         if not (0 < p < 1):
             raise ValueError("p must be between 0 and 1")
+        return self._invert(p, self.xmin, self.xmax, self.mode, tol)
+
+    def ppf_many(self, ps: Sequence[float], tol: Optional[float] = None) -> List[float]:
+        """Inverse CDF for many probabilities at once.
+
+        The probabilities are solved in ascending order, so each quantile becomes
+        the lower bracket (and starting point) for the next one. Results are
+        returned in the order of `ps`.
+        """
+        if not all(0 < p < 1 for p in ps):
+            raise ValueError("p must be between 0 and 1")
+        xs = [0.0] * len(ps)
         low = self.xmin
-        high = self.xmax
-        for _ in range(100):
-            mid = (low + high) / 2
-            cdf_val = self.cdf(mid)
-            if abs(cdf_val - p) < 1e-5:
-                return mid
-            if cdf_val < p:
-                low = mid
+        for i in sorted(range(len(ps)), key=lambda i: ps[i]):
+            start = low if low > self.xmin else self.mode
+            low = xs[i] = self._invert(ps[i], low, self.xmax, start, tol)
+        return xs
+
+    def _invert(
+        self, p: float, low: float, high: float, x: float, tol: Optional[float]
+    ) -> float:
+        # Safeguarded Newton: the pdf is the derivative of the cdf, and any step
+        # that leaves the current bracket [low, high] is replaced by bisection.
+        if tol is None:
+            tol = 1e-12 * self.range
+        for _ in range(_PPF_MAX_ITER):
+            f = self.cdf(x) - p
+            if f == 0:
+                return x
+            if f < 0:
+                low = x
             else:
-                high = mid
-        return (low + high) / 2
+                high = x
+            slope = self.pdf(x)
+            step = x - f / slope if slope > 0 else high
+            if slope > 0 and low <= step <= high and abs(step - x) <= tol:
+                return step
+            if not (low < step < high):
+                step = (low + high) / 2
+                if high - low <= tol:
+                    return step
+            x = step
+        return x
+
+    def crps(self, x: float) -> float:
+        """Continuous ranked probability score of outcome x, in closed form.
+
+        For the unit beta, CRPS(u) = u (2 I_u(a, b) - 1)
+        + a / (a + b) (1 - 2 I_u(a + 1, b)) - E|X - X'| / 2, and PERT is that
+        beta scaled by the range.
+        """
+        if not isinstance(x, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.pert_crps(x, self.xmin, self.mode, self.xmax)
+        a, b = self.alpha, self.beta
+        u = (x - self.xmin) / self.range
+        mean = a / (a + b)
+        # log B(a + 1, b) = log B(a, b) + log(a / (a + b))
+        partial = betainc(a + 1, b, u, self.log_beta + math.log(mean))
+        unit = u * (2 * self._beta_cdf(u) - 1) + mean * (1 - 2 * partial)
+        return self.range * (unit - self.half_spread)
+
+    def log_score(self, x: float) -> float:
+        """Negative log density at outcome x; infinite outside (xmin, xmax)."""
+        if not isinstance(x, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.pert_log_score(x, self.xmin, self.mode, self.xmax)
+        u = (x - self.xmin) / self.range
+        if u <= 0 or u >= 1:
+            return math.inf
+        return (
+            self.log_beta
+            + math.log(self.range)
+            - (self.alpha - 1) * math.log(u)
+            - (self.beta - 1) * math.log1p(-u)
+        )
 
     def pdf_to_probability(self, x: float, epsilon: Optional[float] = None) -> float:
         """
         Converts the PDF at x to a probability by integrating over [x-epsilon, x+epsilon].
         If epsilon is not provided, use 1% of the range.
         """
+        if not isinstance(x, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.pert_pdf_to_probability(
+                x, self.xmin, self.mode, self.xmax, epsilon
+            )
         if epsilon is None:
             epsilon = 0.01 * self.range
         a = max(self.xmin, x - epsilon)
@@ -0,0 +1,89 @@
+"""Shared, immutable fitted distributions.
+
+Forecasts made from templates repeat the same min/mode/max or percentile
+parameters, so scoring them refits the same distribution over and over. The
+factories here hand out one fitted PERT, LogNormal or Pareto per parameter
+tuple from a bounded LRU cache (`functools.lru_cache`). The distributions are
+immutable, so sharing them is safe, and `cache_info()` exposes the hit and miss
+counters for instrumentation.
+"""
+
+import functools
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+
+if TYPE_CHECKING:
+    from forecast.models.math.lognormal import LogNormal
+    from forecast.models.math.pareto import Pareto
+    from forecast.models.math.PERT import PERT
+
+# Fitted distributions kept per type
+CACHE_SIZE = 1024
+
+
+class Frozen:
+    """Base for `__slots__` distributions that can't be changed once fitted.
+
+    Subclasses set their slots once in `__init__` with `_set`, and list the
+    constructor arguments in `_args` so copies and pickles are refitted from
+    them.
+    """
+
+    __slots__ = ()
+    _args: Tuple[str, ...] = ()
+
+    def _set(self, **values: Any) -> None:
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, ...]]:
+        return type(self), tuple(getattr(self, name) for name in self._args)
+
+    def __repr__(self) -> str:
+        args = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._args)
+        return f"{type(self).__name__}({args})"
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def pert(xmin: float, mode: float, xmax: float) -> "PERT":
+    """The fitted PERT(xmin, mode, xmax), shared between equal parameters."""
+    from forecast.models.math.PERT import PERT
+
+    return PERT(xmin, mode, xmax)
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def lognormal(p5: float, p50: float, p95: float) -> "LogNormal":
+    """The fitted LogNormal(p5, p50, p95), shared between equal parameters."""
+    from forecast.models.math.lognormal import LogNormal
+
+    return LogNormal(p5, p50, p95)
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def pareto(p90: float, p99: float) -> "Pareto":
+    """The fitted Pareto(p90, p99), shared between equal parameters."""
+    from forecast.models.math.pareto import Pareto
+
+    return Pareto(p90, p99)
+
+
+def cache_info() -> Dict[str, Any]:
+    """Hits, misses, maxsize and current size of each factory's cache."""
+    return {
+        "pert": pert.cache_info(),
+        "lognormal": lognormal.cache_info(),
+        "pareto": pareto.cache_info(),
+    }
+
+
+def cache_clear() -> None:
+    """Drop every cached distribution and reset the counters."""
+    pert.cache_clear()
+    lognormal.cache_clear()
+    pareto.cache_clear()
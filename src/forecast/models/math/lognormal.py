@@ -1,34 +1,49 @@
 import math
 from typing import Optional
 
+from forecast.models.math.fitted import Frozen
+from forecast.models.math.normal import (
+    LOG_SQRT_2PI,
+    SQRT2,
+    Z95,
+    norm_cdf,
+    norm_ppf,
+    norm_sf,
+)
+
+
+class LogNormal(Frozen):
+    """A lognormal distribution fitted to its 5th, 50th and 95th percentiles.
+
+    Instances are immutable; `fitted.lognormal` shares one per parameter tuple.
+    """
+
+    __slots__ = ("p5", "p50", "p95", "sigma", "mu")
+    _args = ("p5", "p50", "p95")
 
-class LogNormal:
     def __init__(self, p5: float, p50: float, p95: float):
         if p50 <= 0 or p95 <= 0:
             raise ValueError("p50 and p95 must be positive")
         if p95 <= p50:
             raise ValueError("p95 must be greater than p50")
 
-        self.p50 = p50
-        self.p95 = p95
-        self.p5 = p5
-
         log_p50 = math.log(p50)
         log_p95 = math.log(p95)
 
-        z95 = 1.64485  # Z-score for 95th percentile
-
         if p5 <= 0 or p5 >= p50:
             raise ValueError("p5 must be positive and less than p50")
 
         log_p5 = math.log(p5)
-        z5 = -1.64485
-        # Fit using both tails
-        self.sigma = (log_p95 - log_p5) / (z95 - z5)
+        # Fit using both tails, which are Z95 standard deviations either side
+        sigma = (log_p95 - log_p5) / (2 * Z95)
 
-        self.mu = log_p50
+        self._set(p5=p5, p50=p50, p95=p95, sigma=sigma, mu=log_p50)
 
     def pdf(self, x: float) -> float:
+        if not isinstance(x, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.lognormal_pdf(x, self.p5, self.p50, self.p95)
         if x <= 0:
             return 0.0
         coeff = 1 / (x * self.sigma * math.sqrt(2 * math.pi))
@@ -36,49 +51,76 @@ class LogNormal:
         return coeff * math.exp(exponent)
 
     def cdf(self, x: float) -> float:
+        if not isinstance(x, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.lognormal_cdf(x, self.p5, self.p50, self.p95)
         if x <= 0:
             return 0.0
-        z = (math.log(x) - self.mu) / (self.sigma * math.sqrt(2))
-        return 0.5 * (1 + self._erf(z))
+        return norm_cdf((math.log(x) - self.mu) / self.sigma)
+
+    def sf(self, x: float) -> float:
+        """1 - cdf(x), without losing the upper tail to rounding."""
+        if not isinstance(x, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.lognormal_sf(x, self.p5, self.p50, self.p95)
+        if x <= 0:
+            return 1.0
+        return norm_sf((math.log(x) - self.mu) / self.sigma)
 
     def ppf(self, p: float) -> float:
+        if not isinstance(p, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.lognormal_ppf(p, self.p5, self.p50, self.p95)
         if not (0 < p < 1):
             raise ValueError("p must be in (0, 1)")
-        z = self._sqrt2_inv() * self._erfinv(2 * p - 1)
-        return math.exp(self.mu + self.sigma * z)
-
-    @staticmethod
-    def _erf(x: float) -> float:
-        sign = 1 if x >= 0 else -1
-        x = abs(x)
-        a1, a2, a3, a4, a5 = (
-            0.254829592,
-            -0.284496736,
-            1.421413741,
-            -1.453152027,
-            1.061405429,
+        return math.exp(self.mu + self.sigma * norm_ppf(p))
+
+    def crps(self, x: float) -> float:
+        """Continuous ranked probability score of outcome x, in closed form.
+
+        CRPS = x (2 Phi(z) - 1) - 2 e^(mu + sigma^2 / 2) (Phi(z - sigma)
+        + Phi(sigma / sqrt(2)) - 1), with z = (log x - mu) / sigma.
+        """
+        if not isinstance(x, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.lognormal_crps(x, self.p5, self.p50, self.p95)
+        mean = math.exp(self.mu + self.sigma**2 / 2)
+        spread = norm_cdf(self.sigma / SQRT2)
+        if x <= 0:
+            # Every draw is above x: E|X - x| - E|X - X'| / 2
+            return 2 * mean * (1 - spread) - x
+        z = (math.log(x) - self.mu) / self.sigma
+        return x * (2 * norm_cdf(z) - 1) - 2 * mean * (
+            norm_cdf(z - self.sigma) + spread - 1
         )
-        p = 0.3275911
-        t = 1 / (1 + p * x)
-        y = 1 - (((((a5 * t + a4) * t + a3) * t + a2) * t + a1) * t * math.exp(-x * x))
-        return sign * y
-
-    @staticmethod
-    def _erfinv(y: float) -> float:
-        a = 0.147
-        if y <= -1 or y >= 1:
-            raise ValueError("erfinv only defined for -1 < y < 1")
-        ln = math.log(1 - y**2)
-        s = (2 / (math.pi * a)) + (ln / 2)
-        return math.copysign(math.sqrt(math.sqrt(s**2 - ln / a) - s), y)
-
-    @staticmethod
-    def _sqrt2_inv() -> float:
-        return 1 / math.sqrt(2)
+
+    def log_score(self, x: float) -> float:
+        """Negative log density at outcome x; infinite for x <= 0."""
+        if not isinstance(x, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.lognormal_log_score(x, self.p5, self.p50, self.p95)
+        if x <= 0:
+            return math.inf
+        z = (math.log(x) - self.mu) / self.sigma
+        return math.log(x * self.sigma) + LOG_SQRT_2PI + z * z / 2
 
     def pdf_to_probability(self, x: float, epsilon: Optional[float] = None) -> float:
+        if not isinstance(x, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.lognormal_pdf_to_probability(
+                x, self.p5, self.p50, self.p95, epsilon
+            )
         if epsilon is None:
             epsilon = 0.01 * self.p50
         a = max(0, x - epsilon)
         b = x + epsilon
+        if a > self.p50:
+            # Above the median, the survival function keeps the tail's digits
+            return self.sf(a) - self.sf(b)
         return self.cdf(b) - self.cdf(a)
@@ -1,15 +1,23 @@
 import math
 from typing import Optional
 
+from forecast.models.math.fitted import Frozen
+
+
+class Pareto(Frozen):
+    """A Pareto distribution fitted to its 90th and 99th percentiles.
+
+    Instances are immutable; `fitted.pareto` shares one per parameter tuple.
+    """
+
+    __slots__ = ("p90", "p99", "alpha", "xmin")
+    _args = ("p90", "p99")
 
-class Pareto:
     def __init__(self, p90: float, p99: float):
 
         if p90 <= 0 or p99 <= p90:
             raise ValueError("Percentiles must be positive and p99 must be > p90")
 
-        self.p90 = p90
-        self.p99 = p99
         q90 = 0.90
         q99 = 0.99
 
@@ -20,22 +28,35 @@ class Pareto:
         log_ratio_x = math.log(p99 / p90)
         log_ratio_q = math.log((1 - q90) / (1 - q99))
 
-        self.alpha = log_ratio_q / log_ratio_x
+        alpha = log_ratio_q / log_ratio_x
 
         # Backsolve for xmin using one of the quantiles
-        self.xmin = p90 * (1 - q90) ** (1 / self.alpha)
+        xmin = p90 * (1 - q90) ** (1 / alpha)
+        self._set(p90=p90, p99=p99, alpha=alpha, xmin=xmin)
 
     def pdf(self, x: float) -> float:
+        if not isinstance(x, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.pareto_pdf(x, self.p90, self.p99)
         if x < self.xmin:
             return 0.0
         return self.alpha * self.xmin**self.alpha / x ** (self.alpha + 1)
 
     def cdf(self, x: float) -> float:
+        if not isinstance(x, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.pareto_cdf(x, self.p90, self.p99)
         if x < self.xmin:
             return 0.0
         return 1 - (self.xmin / x) ** self.alpha
 
     def ppf(self, p: float) -> float:
+        if not isinstance(p, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.pareto_ppf(p, self.p90, self.p99)
         if not (0 < p < 1):
             raise ValueError("p must be between 0 and 1")
         return self.xmin / (1 - p) ** (1 / self.alpha)
@@ -50,11 +71,52 @@ class Pareto:
             return float("inf")
         return (self.xmin**2 * self.alpha) / ((self.alpha - 1) ** 2 * (self.alpha - 2))
 
+    def crps(self, x: float) -> float:
+        """Continuous ranked probability score of outcome x, in closed form.
+
+        CRPS = E|X - x| - E|X - X'| / 2, where E|X - x| = 2 E(X - x)+ - E X + x,
+        E(X - x)+ = x (xmin / x)^alpha / (alpha - 1) above xmin, and
+        E|X - X'| = 2 xmin alpha / ((alpha - 1)(2 alpha - 1)). It is infinite
+        when alpha <= 1, where the mean is.
+        """
+        if not isinstance(x, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.pareto_crps(x, self.p90, self.p99)
+        alpha, xmin = self.alpha, self.xmin
+        if alpha <= 1:
+            return math.inf
+        mean = self.mean()
+        if x >= xmin:
+            excess = x * (xmin / x) ** alpha / (alpha - 1)
+        else:
+            excess = mean - x
+        half_spread = xmin * alpha / ((alpha - 1) * (2 * alpha - 1))
+        return 2 * excess - mean + x - half_spread
+
+    def log_score(self, x: float) -> float:
+        """Negative log density at outcome x; infinite below xmin."""
+        if not isinstance(x, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.pareto_log_score(x, self.p90, self.p99)
+        if x < self.xmin:
+            return math.inf
+        return (
+            (self.alpha + 1) * math.log(x)
+            - math.log(self.alpha)
+            - self.alpha * math.log(self.xmin)
+        )
+
     def pdf_to_probability(self, x: float, epsilon: Optional[float] = None) -> float:
         """
         Converts the PDF at x to a probability by integrating over [x-epsilon, x+epsilon].
         If epsilon is not provided, use 1% of xmin as a default scale.
         """
+        if not isinstance(x, (int, float)):
+            from forecast.models.math import vectorized
+
+            return vectorized.pareto_pdf_to_probability(x, self.p90, self.p99, epsilon)
         eps = epsilon if epsilon is not None else 0.01 * self.xmin
         a = max(self.xmin, x - eps)
         b = x + eps
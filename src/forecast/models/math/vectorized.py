@@ -0,0 +1,684 @@
+"""Array versions of the PERT, LogNormal and Pareto distribution functions.
+
+Every function takes the evaluation points first and the distribution
+parameters after, exactly as the scalar classes are constructed, and
+broadcasts across all of them. Evaluating N distributions at M points is a
+matter of shaping the parameters as (N, 1) and the points as (1, M) or (M,).
+
+NumPy is optional (`pip install forecast[numpy]`). Without it, the same
+functions accept scalars and (nested) lists, broadcast them element by element
+and return lists, calling the scalar classes under the hood.
+"""
+
+import math
+from typing import Any, Callable, Optional
+
+from forecast.models.math import normal
+
+try:
+    import numpy as np  # type: ignore
+
+    HAS_NUMPY = True
+except ImportError:  # numpy is an optional extra
+    np = None
+    HAS_NUMPY = False
+
+# Continued fraction and Newton settings, matching the scalar PERT
+_CF_MAX_ITER = 200
+_CF_EPS = 3e-16
+_CF_TINY = 1e-300
+_PPF_MAX_ITER = 100
+
+# Lanczos approximation of lgamma, g = 7 with 9 terms; relative error ~1e-15
+_LANCZOS_G = 7
+_LANCZOS = (
+    0.99999999999980993,
+    676.5203681218851,
+    -1259.1392167224028,
+    771.32342877765313,
+    -176.61502916214059,
+    12.507343278686905,
+    -0.13857109526572012,
+    9.9843695780195716e-6,
+    1.5056327351493116e-7,
+)
+_LOG_SQRT_2PI = 0.5 * math.log(2 * math.pi)
+
+
+def _broadcast(fn: Callable[..., float], *args: Any) -> Any:
+    # Pure-Python broadcasting over nested lists of equal depth
+    seqs = [a for a in args if isinstance(a, (list, tuple))]
+    if not seqs:
+        return fn(*args)
+    n = max(len(a) for a in seqs)
+    if any(len(a) not in (1, n) for a in seqs):
+        raise ValueError("operands could not be broadcast together")
+    return [
+        _broadcast(
+            fn,
+            *[
+                (a[i] if len(a) > 1 else a[0]) if isinstance(a, (list, tuple)) else a
+                for a in args
+            ],
+        )
+        for i in range(n)
+    ]
+
+
+def _lgamma(x: Any) -> Any:
+    """lgamma for arrays with x > 0, in NumPy alone (Lanczos, with reflection
+    below 1/2)."""
+    x = np.asarray(x, dtype=float)
+    small = x < 0.5
+    z = np.where(small, 1 - x, x) - 1
+    series = np.full_like(z, _LANCZOS[0])
+    for k, c in enumerate(_LANCZOS[1:], 1):
+        series += c / (z + k)
+    t = z + _LANCZOS_G + 0.5
+    result = _LOG_SQRT_2PI + (z + 0.5) * np.log(t) - t + np.log(series)
+    if np.any(small):
+        with np.errstate(divide="ignore"):
+            reflected = np.log(math.pi / np.abs(np.sin(math.pi * x))) - result
+        result = np.where(small, reflected, result)
+    return result
+
+
+def _betainc(a: Any, b: Any, x: Any) -> Any:
+    """Regularized incomplete beta I_x(a, b) for arrays with 0 < x < 1."""
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    # Symmetric in a and b, so taken once per distribution, before broadcasting
+    # over the points and flipping
+    log_beta = _lgamma(a) + _lgamma(b) - _lgamma(a + b)
+    a, b, x, log_beta = np.broadcast_arrays(a, b, np.asarray(x, dtype=float), log_beta)
+    # Evaluate the continued fraction on the side of the mean where it converges fast
+    flip = x >= (a + 1) / (a + b + 2)
+    a, b, x = np.where(flip, b, a), np.where(flip, a, b), np.where(flip, 1 - x, x)
+    front = np.exp(a * np.log(x) + b * np.log1p(-x) - log_beta)
+
+    def clamp(v: Any) -> Any:
+        return np.where(np.abs(v) < _CF_TINY, _CF_TINY, v)
+
+    # Modified Lentz, run until every element has converged
+    qab, qap, qam = a + b, a + 1, a - 1
+    c = np.ones_like(x)
+    d = 1 / clamp(1 - qab * x / qap)
+    h = d.copy()
+    for m in range(1, _CF_MAX_ITER + 1):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1 / clamp(1 + aa * d)
+        c = clamp(1 + aa / c)
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1 / clamp(1 + aa * d)
+        c = clamp(1 + aa / c)
+        delta = d * c
+        h *= delta
+        if np.all(np.abs(delta - 1) < _CF_EPS):
+            break
+    result = front * h / a
+    return np.where(flip, 1 - result, result)
+
+
+# PERT
+
+
+def _pert_params(xmin: Any, mode: Any, xmax: Any) -> Any:
+    xmin, mode, xmax = (np.asarray(v, dtype=float) for v in (xmin, mode, xmax))
+    if np.any(~((xmin <= mode) & (mode <= xmax))):
+        raise ValueError("mode must be between xmin and xmax")
+    if np.any(xmin == xmax):
+        raise ValueError("xmin and xmax must be different")
+    span = xmax - xmin
+    alpha = 1 + 4 * (mode - xmin) / span
+    beta = 1 + 4 * (xmax - mode) / span
+    return xmin, xmax, span, alpha, beta
+
+
+def _pert_cdf(x: Any, xmin: Any, xmax: Any, span: Any, alpha: Any, beta: Any) -> Any:
+    x = np.asarray(x, dtype=float)
+    inside = (x > xmin) & (x < xmax)
+    u = np.where(inside, (x - xmin) / span, 0.5)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = _betainc(alpha, beta, u)
+    return np.where(inside, values, np.where(x >= xmax, 1.0, 0.0))
+
+
+def _pert_pdf(x: Any, xmin: Any, xmax: Any, span: Any, alpha: Any, beta: Any) -> Any:
+    x = np.asarray(x, dtype=float)
+    u = (x - xmin) / span
+    inside = (u > 0) & (u < 1)
+    u = np.where(inside, u, 0.5)
+    log_beta = _lgamma(alpha) + _lgamma(beta) - _lgamma(alpha + beta)
+    density = np.exp((alpha - 1) * np.log(u) + (beta - 1) * np.log1p(-u) - log_beta)
+    return np.where(inside, density / span, 0.0)
+
+
+def pert_pdf(x: Any, xmin: Any, mode: Any, xmax: Any) -> Any:
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(lambda *v: fitted.pert(*v[1:]).pdf(v[0]), x, xmin, mode, xmax)
+    return _pert_pdf(x, *_pert_params(xmin, mode, xmax))
+
+
+def pert_cdf(x: Any, xmin: Any, mode: Any, xmax: Any) -> Any:
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(lambda *v: fitted.pert(*v[1:]).cdf(v[0]), x, xmin, mode, xmax)
+    return _pert_cdf(x, *_pert_params(xmin, mode, xmax))
+
+
+def pert_ppf(
+    p: Any, xmin: Any, mode: Any, xmax: Any, tol: Optional[float] = None
+) -> Any:
+    """Inverse CDF by safeguarded Newton steps, run on every element at once."""
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(
+            lambda *v: fitted.pert(*v[1:]).ppf(v[0], tol), p, xmin, mode, xmax
+        )
+    params = _pert_params(xmin, mode, xmax)
+    p = np.asarray(p, dtype=float)
+    if np.any(~((p > 0) & (p < 1))):
+        raise ValueError("p must be between 0 and 1")
+    xmin, xmax, span = params[0], params[1], params[2]
+    mode = np.asarray(mode, dtype=float)
+    shape = np.broadcast_shapes(p.shape, xmin.shape, mode.shape, xmax.shape)
+    low = np.broadcast_to(xmin, shape).copy()
+    high = np.broadcast_to(xmax, shape).copy()
+    x = np.broadcast_to(mode, shape).copy()
+    xtol = np.broadcast_to(1e-12 * span if tol is None else tol, shape)
+    done = np.zeros(shape, dtype=bool)
+    for _ in range(_PPF_MAX_ITER):
+        f = _pert_cdf(x, *params) - p
+        low = np.where(f < 0, x, low)
+        high = np.where(f > 0, x, high)
+        slope = _pert_pdf(x, *params)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.where(slope > 0, x - f / slope, high)
+        newton_done = (
+            (slope > 0) & (low <= step) & (step <= high) & (np.abs(step - x) <= xtol)
+        )
+        bisect = ~newton_done & ~((low < step) & (step < high))
+        step = np.where(bisect, (low + high) / 2, step)
+        converged = (f == 0) | newton_done | (bisect & (high - low <= xtol))
+        x = np.where(done | (f == 0), x, step)
+        done |= converged
+        if np.all(done):
+            break
+    return x
+
+
+def pert_pdf_to_probability(
+    x: Any, xmin: Any, mode: Any, xmax: Any, epsilon: Optional[Any] = None
+) -> Any:
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(
+            lambda *v: fitted.pert(*v[1:4]).pdf_to_probability(v[0], v[4]),
+            x,
+            xmin,
+            mode,
+            xmax,
+            epsilon,
+        )
+    params = _pert_params(xmin, mode, xmax)
+    x = np.asarray(x, dtype=float)
+    eps = 0.01 * params[2] if epsilon is None else np.asarray(epsilon, dtype=float)
+    a = np.maximum(params[0], x - eps)
+    b = np.minimum(params[1], x + eps)
+    return _pert_cdf(b, *params) - _pert_cdf(a, *params)
+
+
+def pert_crps(x: Any, xmin: Any, mode: Any, xmax: Any) -> Any:
+    """Closed-form CRPS, as PERT.crps."""
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(
+            lambda *v: fitted.pert(*v[1:]).crps(v[0]), x, xmin, mode, xmax
+        )
+    lo, hi, span, alpha, beta = _pert_params(xmin, mode, xmax)
+    x = np.asarray(x, dtype=float)
+    u = (x - lo) / span
+    mean = alpha / (alpha + beta)
+    log_beta = _lgamma(alpha) + _lgamma(beta) - _lgamma(alpha + beta)
+    half_spread = (
+        2
+        / (alpha + beta)
+        * np.exp(
+            _lgamma(2 * alpha)
+            + _lgamma(2 * beta)
+            - _lgamma(2 * alpha + 2 * beta)
+            - 2 * log_beta
+        )
+    )
+    cdf = _pert_cdf(x, lo, hi, span, alpha, beta)
+    partial = _pert_cdf(x, lo, hi, span, alpha + 1, beta)
+    return span * (u * (2 * cdf - 1) + mean * (1 - 2 * partial) - half_spread)
+
+
+def pert_log_score(x: Any, xmin: Any, mode: Any, xmax: Any) -> Any:
+    """Negative log density, as PERT.log_score."""
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(
+            lambda *v: fitted.pert(*v[1:]).log_score(v[0]), x, xmin, mode, xmax
+        )
+    lo, _, span, alpha, beta = _pert_params(xmin, mode, xmax)
+    u = (np.asarray(x, dtype=float) - lo) / span
+    inside = (u > 0) & (u < 1)
+    u = np.where(inside, u, 0.5)
+    log_beta = _lgamma(alpha) + _lgamma(beta) - _lgamma(alpha + beta)
+    score = (
+        log_beta + np.log(span) - (alpha - 1) * np.log(u) - (beta - 1) * np.log1p(-u)
+    )
+    return np.where(inside, score, np.inf)
+
+
+# LogNormal
+
+
+# W. J. Cody's rational approximations for erf and erfc (CALERF), accurate to
+# double precision over the whole real line
+_ERF_A = (
+    3.16112374387056560e00,
+    1.13864154151050156e02,
+    3.77485237685302021e02,
+    3.20937758913846947e03,
+    1.85777706184603153e-1,
+)
+_ERF_B = (
+    2.36012909523441209e01,
+    2.44024637934444173e02,
+    1.28261652607737228e03,
+    2.84423683343917062e03,
+)
+_ERFC_C = (
+    5.64188496988670089e-1,
+    8.88314979438837594e00,
+    6.61191906371416295e01,
+    2.98635138197400131e02,
+    8.81952221241769090e02,
+    1.71204761263407058e03,
+    2.05107837782607147e03,
+    1.23033935479799725e03,
+    2.15311535474403846e-8,
+)
+_ERFC_D = (
+    1.57449261107098347e01,
+    1.17693950891312499e02,
+    5.37181101862009858e02,
+    1.62138957456669019e03,
+    3.29079923573345963e03,
+    4.36261909014324716e03,
+    3.43936767414372164e03,
+    1.23033935480374942e03,
+)
+_ERFC_P = (
+    3.05326634961232344e-1,
+    3.60344899949804439e-1,
+    1.25781726111229246e-1,
+    1.60837851487422766e-2,
+    6.58749161529837803e-4,
+    1.63153871373020978e-2,
+)
+_ERFC_Q = (
+    2.56852019228982242e00,
+    1.87295284992346725e00,
+    5.27905102951428412e-1,
+    6.05183413124413191e-2,
+    2.33520497626869185e-3,
+)
+_ERFC_THRESHOLD = 0.46875
+# erfc underflows to 0 above this
+_ERFC_BIG = 26.543
+
+
+def _cody_ratio(
+    numerator: tuple, denominator: tuple, first: int, last: int, t: Any
+) -> Any:
+    # CALERF's form: numerator[first] and denominator 1 lead, numerator[last]
+    # and denominator[-1] close the rational function in t
+    num = numerator[first] * t
+    den = t
+    for i in range(len(denominator) - 1):
+        num = (num + numerator[i]) * t
+        den = (den + denominator[i]) * t
+    return (num + numerator[last]) / (den + denominator[-1])
+
+
+def _erfc(x: Any) -> Any:
+    """erfc for arrays, in NumPy alone (Cody's CALERF).
+
+    As in `_norm_ppf`, each range is evaluated only on the elements in it.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.abs(x)
+    result = np.zeros_like(y)
+    # |x| <= 0.46875: erfc = 1 - erf, with erf = x * R(x^2)
+    near = y <= _ERFC_THRESHOLD
+    xn = x[near]
+    result[near] = 1 - xn * _cody_ratio(_ERF_A, _ERF_B, 4, 3, xn * xn)
+    # Up to 4: erfc(|x|) = exp(-x^2) R(|x|); beyond: exp(-x^2) R(1/x^2) / |x|.
+    # Past _ERFC_BIG it underflows and stays 0
+    middle = ~near & (y <= 4)
+    ym = y[middle]
+    result[middle] = _cody_ratio(_ERFC_C, _ERFC_D, 8, 7, ym) * _exp_neg_square(ym)
+    far = (y > 4) & (y < _ERFC_BIG)
+    yf = y[far]
+    inv = 1 / (yf * yf)
+    ratio = _cody_ratio(_ERFC_P, _ERFC_Q, 5, 4, inv)
+    result[far] = (1 / math.sqrt(math.pi) - inv * ratio) / yf * _exp_neg_square(yf)
+    negative = ~near & (x < 0)
+    result[negative] = 2 - result[negative]
+    result[np.isnan(x)] = np.nan
+    return result
+
+
+def _exp_neg_square(y: Any) -> Any:
+    # exp(-y^2), with y^2 split so the product keeps its digits, as CALERF does
+    head = np.trunc(y * 16) / 16
+    return np.exp(-head * head) * np.exp(-(y - head) * (y + head))
+
+
+def _poly(coefficients: tuple, x: Any) -> Any:
+    result = np.zeros_like(x)
+    for c in coefficients:
+        result = result * x + c
+    return result
+
+
+def _norm_cdf(z: Any) -> Any:
+    return 0.5 * _erfc(-np.asarray(z, dtype=float) / normal.SQRT2)
+
+
+def _norm_sf(z: Any) -> Any:
+    return 0.5 * _erfc(np.asarray(z, dtype=float) / normal.SQRT2)
+
+
+def _norm_ppf(p: Any) -> Any:
+    # AS241, as normal.norm_ppf, each branch evaluated only where it applies
+    p = np.asarray(p, dtype=float)
+    q = p - 0.5
+    z = np.empty_like(p)
+    central = np.abs(q) <= normal.SPLIT1
+    qc = q[central]
+    r = normal.CONST1 - qc * qc
+    z[central] = qc * _poly(normal.A, r) / _poly(normal.B, r)
+    tail = ~central
+    r = np.sqrt(-np.log(np.minimum(p[tail], 1 - p[tail])))
+    near = r <= normal.SPLIT2
+    r[near] -= normal.CONST2
+    r[~near] -= normal.SPLIT2
+    zt = np.empty_like(r)
+    zt[near] = _poly(normal.C, r[near]) / _poly(normal.D, r[near])
+    zt[~near] = _poly(normal.E, r[~near]) / _poly(normal.F, r[~near])
+    z[tail] = np.where(q[tail] < 0, -zt, zt)
+    return z
+
+
+def norm_cdf(z: Any) -> Any:
+    """Standard normal CDF, elementwise."""
+    if not HAS_NUMPY:
+        return _broadcast(normal.norm_cdf, z)
+    return _norm_cdf(z)
+
+
+def norm_ppf(p: Any) -> Any:
+    """Standard normal quantile (AS241), elementwise."""
+    if not HAS_NUMPY:
+        return _broadcast(normal.norm_ppf, p)
+    p = np.asarray(p, dtype=float)
+    if np.any(~((p > 0) & (p < 1))):
+        raise ValueError("p must be in (0, 1)")
+    return _norm_ppf(p)
+
+
+def _lognormal_params(p5: Any, p50: Any, p95: Any) -> Any:
+    p5, p50, p95 = (np.asarray(v, dtype=float) for v in (p5, p50, p95))
+    if np.any((p50 <= 0) | (p95 <= 0)):
+        raise ValueError("p50 and p95 must be positive")
+    if np.any(p95 <= p50):
+        raise ValueError("p95 must be greater than p50")
+    if np.any((p5 <= 0) | (p5 >= p50)):
+        raise ValueError("p5 must be positive and less than p50")
+    sigma = (np.log(p95) - np.log(p5)) / (2 * normal.Z95)
+    return np.log(p50), sigma
+
+
+def _lognormal_cdf(x: Any, mu: Any, sigma: Any) -> Any:
+    x = np.asarray(x, dtype=float)
+    positive = x > 0
+    safe = np.where(positive, x, 1.0)
+    return np.where(positive, _norm_cdf((np.log(safe) - mu) / sigma), 0.0)
+
+
+def _lognormal_sf(x: Any, mu: Any, sigma: Any) -> Any:
+    x = np.asarray(x, dtype=float)
+    positive = x > 0
+    safe = np.where(positive, x, 1.0)
+    return np.where(positive, _norm_sf((np.log(safe) - mu) / sigma), 1.0)
+
+
+def lognormal_pdf(x: Any, p5: Any, p50: Any, p95: Any) -> Any:
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(
+            lambda *v: fitted.lognormal(*v[1:]).pdf(v[0]), x, p5, p50, p95
+        )
+    mu, sigma = _lognormal_params(p5, p50, p95)
+    x = np.asarray(x, dtype=float)
+    positive = x > 0
+    safe = np.where(positive, x, 1.0)
+    coeff = 1 / (safe * sigma * math.sqrt(2 * math.pi))
+    density = coeff * np.exp(-((np.log(safe) - mu) ** 2) / (2 * sigma**2))
+    return np.where(positive, density, 0.0)
+
+
+def lognormal_cdf(x: Any, p5: Any, p50: Any, p95: Any) -> Any:
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(
+            lambda *v: fitted.lognormal(*v[1:]).cdf(v[0]), x, p5, p50, p95
+        )
+    return _lognormal_cdf(x, *_lognormal_params(p5, p50, p95))
+
+
+def lognormal_sf(x: Any, p5: Any, p50: Any, p95: Any) -> Any:
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(lambda *v: fitted.lognormal(*v[1:]).sf(v[0]), x, p5, p50, p95)
+    return _lognormal_sf(x, *_lognormal_params(p5, p50, p95))
+
+
+def lognormal_ppf(p: Any, p5: Any, p50: Any, p95: Any) -> Any:
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(
+            lambda *v: fitted.lognormal(*v[1:]).ppf(v[0]), p, p5, p50, p95
+        )
+    mu, sigma = _lognormal_params(p5, p50, p95)
+    p = np.asarray(p, dtype=float)
+    if np.any(~((p > 0) & (p < 1))):
+        raise ValueError("p must be in (0, 1)")
+    return np.exp(mu + sigma * _norm_ppf(p))
+
+
+def lognormal_pdf_to_probability(
+    x: Any, p5: Any, p50: Any, p95: Any, epsilon: Optional[Any] = None
+) -> Any:
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(
+            lambda *v: fitted.lognormal(*v[1:4]).pdf_to_probability(v[0], v[4]),
+            x,
+            p5,
+            p50,
+            p95,
+            epsilon,
+        )
+    mu, sigma = _lognormal_params(p5, p50, p95)
+    x = np.asarray(x, dtype=float)
+    eps = (
+        0.01 * np.asarray(p50, dtype=float)
+        if epsilon is None
+        else np.asarray(epsilon, dtype=float)
+    )
+    a = np.maximum(0, x - eps)
+    b = x + eps
+    # Above the median, the survival function keeps the tail's digits
+    return np.where(
+        a > np.exp(mu),
+        _lognormal_sf(a, mu, sigma) - _lognormal_sf(b, mu, sigma),
+        _lognormal_cdf(b, mu, sigma) - _lognormal_cdf(a, mu, sigma),
+    )
+
+
+def lognormal_crps(x: Any, p5: Any, p50: Any, p95: Any) -> Any:
+    """Closed-form CRPS, as LogNormal.crps."""
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(
+            lambda *v: fitted.lognormal(*v[1:]).crps(v[0]), x, p5, p50, p95
+        )
+    mu, sigma = _lognormal_params(p5, p50, p95)
+    x = np.asarray(x, dtype=float)
+    mean = np.exp(mu + sigma**2 / 2)
+    spread = _norm_cdf(sigma / normal.SQRT2)
+    positive = x > 0
+    z = (np.log(np.where(positive, x, 1.0)) - mu) / sigma
+    above = x * (2 * _norm_cdf(z) - 1) - 2 * mean * (_norm_cdf(z - sigma) + spread - 1)
+    return np.where(positive, above, 2 * mean * (1 - spread) - x)
+
+
+def lognormal_log_score(x: Any, p5: Any, p50: Any, p95: Any) -> Any:
+    """Negative log density, as LogNormal.log_score."""
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(
+            lambda *v: fitted.lognormal(*v[1:]).log_score(v[0]), x, p5, p50, p95
+        )
+    mu, sigma = _lognormal_params(p5, p50, p95)
+    x = np.asarray(x, dtype=float)
+    positive = x > 0
+    safe = np.where(positive, x, 1.0)
+    z = (np.log(safe) - mu) / sigma
+    score = np.log(safe * sigma) + normal.LOG_SQRT_2PI + z * z / 2
+    return np.where(positive, score, np.inf)
+
+
+# Pareto
+
+
+def _pareto_params(p90: Any, p99: Any) -> Any:
+    p90, p99 = np.asarray(p90, dtype=float), np.asarray(p99, dtype=float)
+    if np.any((p90 <= 0) | (p99 <= p90)):
+        raise ValueError("Percentiles must be positive and p99 must be > p90")
+    alpha = math.log((1 - 0.90) / (1 - 0.99)) / np.log(p99 / p90)
+    xmin = p90 * (1 - 0.90) ** (1 / alpha)
+    return alpha, xmin
+
+
+def _pareto_cdf(x: Any, alpha: Any, xmin: Any) -> Any:
+    x = np.asarray(x, dtype=float)
+    above = x >= xmin
+    safe = np.where(above, x, xmin)
+    return np.where(above, 1 - (xmin / safe) ** alpha, 0.0)
+
+
+def pareto_pdf(x: Any, p90: Any, p99: Any) -> Any:
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(lambda *v: fitted.pareto(*v[1:]).pdf(v[0]), x, p90, p99)
+    alpha, xmin = _pareto_params(p90, p99)
+    x = np.asarray(x, dtype=float)
+    above = x >= xmin
+    safe = np.where(above, x, xmin)
+    return np.where(above, alpha * xmin**alpha / safe ** (alpha + 1), 0.0)
+
+
+def pareto_cdf(x: Any, p90: Any, p99: Any) -> Any:
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(lambda *v: fitted.pareto(*v[1:]).cdf(v[0]), x, p90, p99)
+    return _pareto_cdf(x, *_pareto_params(p90, p99))
+
+
+def pareto_ppf(p: Any, p90: Any, p99: Any) -> Any:
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(lambda *v: fitted.pareto(*v[1:]).ppf(v[0]), p, p90, p99)
+    alpha, xmin = _pareto_params(p90, p99)
+    p = np.asarray(p, dtype=float)
+    if np.any(~((p > 0) & (p < 1))):
+        raise ValueError("p must be between 0 and 1")
+    return xmin / (1 - p) ** (1 / alpha)
+
+
+def pareto_pdf_to_probability(
+    x: Any, p90: Any, p99: Any, epsilon: Optional[Any] = None
+) -> Any:
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(
+            lambda *v: fitted.pareto(*v[1:3]).pdf_to_probability(v[0], v[3]),
+            x,
+            p90,
+            p99,
+            epsilon,
+        )
+    alpha, xmin = _pareto_params(p90, p99)
+    x = np.asarray(x, dtype=float)
+    eps = 0.01 * xmin if epsilon is None else np.asarray(epsilon, dtype=float)
+    a = np.maximum(xmin, x - eps)
+    b = x + eps
+    return _pareto_cdf(b, alpha, xmin) - _pareto_cdf(a, alpha, xmin)
+
+
+def pareto_crps(x: Any, p90: Any, p99: Any) -> Any:
+    """Closed-form CRPS, as Pareto.crps."""
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(lambda *v: fitted.pareto(*v[1:]).crps(v[0]), x, p90, p99)
+    alpha, xmin = _pareto_params(p90, p99)
+    x = np.asarray(x, dtype=float)
+    finite = alpha > 1
+    a = np.where(finite, alpha, 2.0)
+    mean = a * xmin / (a - 1)
+    above = x >= xmin
+    safe = np.where(above, x, xmin)
+    excess = np.where(above, safe * (xmin / safe) ** a / (a - 1), mean - x)
+    half_spread = xmin * a / ((a - 1) * (2 * a - 1))
+    return np.where(finite, 2 * excess - mean + x - half_spread, np.inf)
+
+
+def pareto_log_score(x: Any, p90: Any, p99: Any) -> Any:
+    """Negative log density, as Pareto.log_score."""
+    if not HAS_NUMPY:
+        from forecast.models.math import fitted
+
+        return _broadcast(lambda *v: fitted.pareto(*v[1:]).log_score(v[0]), x, p90, p99)
+    alpha, xmin = _pareto_params(p90, p99)
+    x = np.asarray(x, dtype=float)
+    above = x >= xmin
+    safe = np.where(above, x, xmin)
+    score = (alpha + 1) * np.log(safe) - np.log(alpha) - alpha * np.log(xmin)
+    return np.where(above, score, np.inf)
@@ -1,11 +1,14 @@
 # pyre-strict
-from frontmatter import Post  # type:ignore
-from .forecast import Forecast
+from typing import TYPE_CHECKING, Any
+from .forecast import ContinuousForecast
+
+if TYPE_CHECKING:
+    from frontmatter import Post  # type:ignore
 
 # import elicited as e # type:ignore
 
 
-class Pareto(Forecast):
+class Pareto(ContinuousForecast):
     """A forecast model for Pareto distributed predictions.
 
     This class implements the Forecast base class for scenarios where the outcome
@@ -16,7 +19,7 @@ class Pareto(Forecast):
         scenario (str): Inherited from Forecast, the scenario being forecasted
         end_date (datetime.date): Inherited from Forecast, the end date of the forecast
         type (str): Inherited from Forecast, the type of forecast
-        tags (list[str]): Inherited from Forecast, list of tags for the forecast
+        tags (tuple[str, ...]): Inherited from Forecast, tags for the forecast
         p90 (float): The 90th percentile value of the distribution
         p99 (float): The 99th percentile value of the distribution
         outcome (float, optional): The actual outcome value, if known
@@ -33,8 +36,10 @@ class Pareto(Forecast):
         ValueError: If calculating Brier score without an outcome
     """
 
-    def __init__(self, post: Post) -> None:  # type: ignore
-        Forecast.__init__(self, post)  # type: ignore
+    __slots__ = ("p90", "p99", "outcome")
+
+    def __init__(self, post: "Post") -> None:  # type: ignore
+        ContinuousForecast.__init__(self, post)  # type: ignore
         try:
             try:
                 self.p90: float = float(post.metadata["p90"])  # type: ignore
@@ -50,11 +55,14 @@ class Pareto(Forecast):
         if "outcome" in post.metadata:  # type: ignore
             self.outcome: float = post.metadata["outcome"]  # type: ignore
 
+    def distribution(self) -> Any:
+        from forecast.models.math import fitted
+
+        return fitted.pareto(self.p90, self.p99)
+
     def calc(self) -> float:
         if hasattr(self, "outcome"):
-            import forecast.models.math.pareto as p
-
-            pareto = p.Pareto(self.p90, self.p99)
+            pareto = self.distribution()
             outcome_probability: float = pareto.pdf_to_probability(self.outcome)
             return self.brier_score(
                 [1, 0], [outcome_probability, 1 - outcome_probability]
@@ -1,6 +1,9 @@
 # pyre-strict
-from frontmatter import Post  # type:ignore
-from .forecast import Forecast
+from typing import TYPE_CHECKING, Any
+from .forecast import ContinuousForecast
+
+if TYPE_CHECKING:
+    from frontmatter import Post  # type:ignore
 
 # from typing import Type
 # import elicited as e # type:ignore
@@ -8,7 +11,7 @@ from .forecast import Forecast
 # Note: The Post type from frontmatter is untyped; type checking is suppressed with # type: ignore
 
 
-class Pert(Forecast):
+class Pert(ContinuousForecast):
     """A forecast model for PERT distributed predictions.
 
     This class implements the Forecast base class for scenarios where the outcome
@@ -20,7 +23,7 @@ class Pert(Forecast):
         scenario (str): Inherited from Forecast, the scenario being forecasted
         end_date (datetime.date): Inherited from Forecast, the end date of the forecast
         type (str): Inherited from Forecast, the type of forecast
-        tags (list[str]): Inherited from Forecast, list of tags for the forecast
+        tags (tuple[str, ...]): Inherited from Forecast, tags for the forecast
         min (float): The minimum value of the distribution
         mode (float): The most likely value (mode) of the distribution
         max (float): The maximum value of the distribution
@@ -39,9 +42,11 @@ class Pert(Forecast):
         ValueError: If calculating Brier score without an outcome
     """
 
-    def __init__(self, post: Post) -> None:  # type: ignore
+    __slots__ = ("min", "mode", "max", "outcome")
+
+    def __init__(self, post: "Post") -> None:  # type: ignore
         # Accepts a frontmatter.Post object; type checking is suppressed due to lack of type hints in frontmatter
-        Forecast.__init__(self, post)
+        ContinuousForecast.__init__(self, post)
 
         try:
             try:
@@ -60,11 +65,14 @@ class Pert(Forecast):
         if "outcome" in post.metadata:  # type: ignore
             self.outcome: float = post.metadata["outcome"]  # type: ignore
 
+    def distribution(self) -> Any:
+        from forecast.models.math import fitted
+
+        return fitted.pert(self.min, self.mode, self.max)
+
     def calc(self) -> float:
         if hasattr(self, "outcome"):
-            import forecast.models.math.PERT as p
-
-            pert = p.PERT(self.min, self.mode, self.max)
+            pert = self.distribution()
             outcome_probability: float = pert.pdf_to_probability(self.outcome)
             return self.brier_score(
                 [1, 0], [outcome_probability, 1 - outcome_probability]
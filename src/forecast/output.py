@@ -0,0 +1,190 @@
+# pyre-strict
+import datetime
+import json
+import math
+from typing import IO, Any, Dict, List, Optional, Sequence, Tuple
+
+from forecast.models.forecast import Forecast
+
+# Columns of every machine-readable record, in output order
+FIELDS = (
+    "path",
+    "scenario",
+    "type",
+    "tags",
+    "end_date",
+    "status",
+    "days_until_close",
+    "brier_score",
+)
+# The extra column added when a run selects a scoring rule other than Brier
+RULE_FIELDS = {"crps": "crps", "log": "log_score"}
+# Records per Arrow record batch
+ARROW_BATCH_SIZE = 1024
+
+
+def record_fields(rule: str = "brier") -> Tuple[str, ...]:
+    """The columns of records scored under `rule`: FIELDS plus the rule's column."""
+    if rule in RULE_FIELDS:
+        return FIELDS + (RULE_FIELDS[rule],)
+    return FIELDS
+
+
+def forecast_record(
+    forecast: Forecast, today: Optional[datetime.date] = None, rule: str = "brier"
+) -> Dict[str, Any]:
+    """The machine-readable record of one forecast, matching the table's columns.
+
+    Brier is always included; any other `rule` adds its own column, left empty
+    when the forecast is open or its type doesn't support the rule. A score that
+    isn't finite, like the log score of an outcome the forecast ruled out, is
+    left empty too, since JSON has no infinity.
+    """
+    if today is None:
+        today = datetime.date.today()
+    days_until_close: Optional[int] = None
+    brier_score: Optional[float] = None
+    rule_score: Optional[float] = None
+    if hasattr(forecast, "outcome"):
+        status = "closed"
+        brier_score = forecast.score()
+        if rule in RULE_FIELDS and rule in forecast.rules:
+            rule_score = forecast.score(rule)
+    else:
+        days_until_close = (forecast.end_date - today).days
+        status = "overdue" if days_until_close < 0 else "open"
+    record = {
+        "path": forecast.path,
+        "scenario": forecast.scenario,
+        "type": forecast.type,
+        # The models use [""] for "no tags"
+        "tags": [str(tag) for tag in forecast.tags if tag != ""],
+        "end_date": forecast.end_date,
+        "status": status,
+        "days_until_close": days_until_close,
+        "brier_score": brier_score,
+    }
+    if rule in RULE_FIELDS:
+        record[RULE_FIELDS[rule]] = rule_score
+    for field in ("brier_score", *RULE_FIELDS.values()):
+        score = record.get(field)
+        if score is not None and not math.isfinite(score):
+            record[field] = None
+    return record
+
+
+class JsonlWriter:
+    """Writes one JSON object per line, flushing after every record.
+
+    Args:
+        stream: A text stream, e.g. sys.stdout
+    """
+
+    def __init__(self, stream: IO[str]) -> None:
+        self.stream = stream
+
+    def write(self, record: Dict[str, Any]) -> None:
+        record = dict(record, end_date=record["end_date"].isoformat())
+        self.stream.write(json.dumps(record, allow_nan=False) + "\n")
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.stream.flush()
+
+
+class CsvWriter:
+    """Writes a header row, then one row per record, flushing after every record.
+
+    Tags are joined with `;`, and missing values are left empty.
+
+    Args:
+        stream: A text stream, e.g. sys.stdout
+        fields: The columns to write, see `record_fields`
+    """
+
+    def __init__(self, stream: IO[str], fields: Sequence[str] = FIELDS) -> None:
+        import csv
+
+        self.stream = stream
+        self.fields = fields
+        self.writer: Any = csv.writer(stream, lineterminator="\n")
+        self.writer.writerow(fields)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        row = dict(record, tags=";".join(record["tags"]))
+        self.writer.writerow(["" if row[f] is None else row[f] for f in self.fields])
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.stream.flush()
+
+
+class ArrowWriter:
+    """Writes an Arrow IPC stream, one record batch per `batch_size` records.
+
+    Requires the optional `pyarrow` dependency (`pip install forecast[arrow]`).
+
+    Args:
+        stream: A binary stream, e.g. sys.stdout.buffer
+        batch_size: Number of records per record batch
+        fields: The columns to write, see `record_fields`
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+
+    def __init__(
+        self,
+        stream: IO[bytes],
+        batch_size: int = ARROW_BATCH_SIZE,
+        fields: Sequence[str] = FIELDS,
+    ) -> None:
+        import pyarrow as pa  # type: ignore
+
+        self.pa: Any = pa
+        self.stream = stream
+        self.batch_size = batch_size
+        types = {
+            "path": pa.string(),
+            "scenario": pa.string(),
+            "type": pa.string(),
+            "tags": pa.list_(pa.string()),
+            "end_date": pa.date32(),
+            "status": pa.string(),
+            "days_until_close": pa.int64(),
+        }
+        # Every score column is a nullable float
+        self.schema: Any = pa.schema([(f, types.get(f, pa.float64())) for f in fields])
+        self.writer: Any = pa.ipc.new_stream(stream, self.schema)
+        self.pending: List[Dict[str, Any]] = []
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self.pending.append(record)
+        if len(self.pending) >= self.batch_size:
+            self._write_batch()
+
+    def _write_batch(self) -> None:
+        if self.pending:
+            batch = self.pa.RecordBatch.from_pylist(self.pending, schema=self.schema)
+            self.writer.write_batch(batch)
+            self.pending = []
+        self.stream.flush()
+
+    def close(self) -> None:
+        self._write_batch()
+        self.writer.close()
+        self.stream.flush()
+
+
+def make_writer(format: str, stream: IO[str], fields: Sequence[str] = FIELDS) -> Any:
+    """Create the writer for `format` ("jsonl", "csv" or "arrow") on a text stream.
+
+    Arrow writes binary, so it uses the stream's underlying buffer.
+    """
+    if format == "jsonl":
+        return JsonlWriter(stream)
+    if format == "csv":
+        return CsvWriter(stream, fields)
+    if format == "arrow":
+        return ArrowWriter(stream.buffer, fields=fields)  # type: ignore
+    raise ValueError(f"Unknown output format '{format}'.")
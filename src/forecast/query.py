@@ -0,0 +1,469 @@
+# pyre-strict
+"""`--where` expressions, `--sort` keys and top-k selection.
+
+A where expression combines comparisons with `and`, `or`, `not` and
+parentheses:
+
+    end_date >= 2025-01-01 and end_date < today+30d
+    (tag = infra or tag = security) and open
+    type = pert and score > 0.2
+
+Fields are `end_date` (YYYY-MM-DD, `today`, or `today` plus or minus a period
+like 14d or 2w), `type`, `scenario`, `tag` (`=` and `!=` only; `tag = x` matches
+a forecast that has x among its tags) and `score`, the score under the rule the
+run selected (Brier by default), which only closed forecasts that rule is defined
+for have. `open` and `closed` match forecasts without and with an outcome.
+
+Everything but `score` can be read from a file's raw header, so `Where.admits`
+filters files before their forecast is built and scored; `Where.matches`
+decides on the built forecast, and `Where.sql` compiles the expression for the
+SQLite storage.
+"""
+
+import datetime
+import heapq
+import operator
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from forecast.models.forecast import SCORING_RULES, Forecast, read_tags
+
+FIELDS = ("end_date", "type", "scenario", "tag", "score")
+SORT_KEYS = ("end_date", "scenario", "type", "score")
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+TOKEN = re.compile(
+    r"""\s*(?:(?P<op><=|>=|!=|==|=|<|>)|(?P<paren>[()])"""
+    r"""|'(?P<single>[^']*)'|"(?P<double>[^"]*)"|(?P<word>[^\s()<>=!'"]+))"""
+)
+RELATIVE_DATE = re.compile(r"today(?:([+-])(\d+)([dw]))?$")
+# The SQLite storage's column holding the score under each of SCORING_RULES
+SCORE_COLUMNS = {"brier": "score", "crps": "crps", "log": "log_score"}
+
+
+class Compare(NamedTuple):
+    field: str
+    op: str
+    value: Any
+
+
+class Flag(NamedTuple):
+    closed: bool
+
+
+class Not(NamedTuple):
+    node: Any
+
+
+class And(NamedTuple):
+    nodes: Tuple[Any, ...]
+
+
+class Or(NamedTuple):
+    nodes: Tuple[Any, ...]
+
+
+Node = Union[Compare, Flag, Not, And, Or]
+
+
+class _Unknown:
+    """A field that can't be read yet, like the score of an unbuilt forecast."""
+
+
+UNKNOWN = _Unknown()
+
+
+def score_or_none(forecast: Forecast, rule: str = "brier") -> Optional[float]:
+    """The score of a closed forecast under `rule`, or None if it can't be scored,
+    e.g. because the rule isn't defined for its type."""
+    try:
+        return forecast.score(rule)
+    except Exception:
+        return None
+
+
+def parse_date(text: str, today: Optional[datetime.date] = None) -> datetime.date:
+    """Parse YYYY-MM-DD, `today`, or `today` plus or minus a period like 14d or 2w.
+
+    Raises:
+        ValueError: If `text` is neither
+    """
+    match = RELATIVE_DATE.match(text.lower())
+    if match is None:
+        try:
+            return datetime.datetime.strptime(text, "%Y-%m-%d").date()
+        except ValueError:
+            raise ValueError(
+                f"'{text}' is not a date like 2025-01-31, today or today+14d."
+            )
+    today = today or datetime.date.today()
+    sign, number, unit = match.groups()
+    if sign is None:
+        return today
+    days = int(number) * (7 if unit == "w" else 1)
+    return today + datetime.timedelta(days=days if sign == "+" else -days)
+
+
+class _Parser:
+    def __init__(self, text: str, today: Optional[datetime.date]) -> None:
+        self.today = today
+        self.tokens: List[Tuple[str, str]] = []
+        position = 0
+        text = text.rstrip()
+        while position < len(text):
+            match = TOKEN.match(text, position)
+            if match is None:
+                raise ValueError(f"Unexpected '{text[position:].strip()}'.")
+            kind = match.lastgroup
+            assert kind is not None
+            if kind in ("single", "double"):
+                kind = "string"
+            self.tokens.append((kind, match.group(match.lastgroup)))
+            position = match.end()
+        self.position = 0
+
+    def peek(self) -> Tuple[str, str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return ("end", "")
+
+    def keyword(self, word: str) -> bool:
+        kind, value = self.peek()
+        if kind == "word" and value.lower() == word:
+            self.position += 1
+            return True
+        return False
+
+    def take(self, kind: str, what: str) -> str:
+        found, value = self.peek()
+        if found != kind:
+            raise ValueError(f"Expected {what}, found '{value or 'the end'}'.")
+        self.position += 1
+        return value
+
+    def parse(self) -> Node:
+        node = self.disjunction()
+        kind, value = self.peek()
+        if kind != "end":
+            raise ValueError(f"Unexpected '{value}'.")
+        return node
+
+    def disjunction(self) -> Node:
+        nodes = [self.conjunction()]
+        while self.keyword("or"):
+            nodes.append(self.conjunction())
+        return nodes[0] if len(nodes) == 1 else Or(tuple(nodes))
+
+    def conjunction(self) -> Node:
+        nodes = [self.negation()]
+        while self.keyword("and"):
+            nodes.append(self.negation())
+        return nodes[0] if len(nodes) == 1 else And(tuple(nodes))
+
+    def negation(self) -> Node:
+        if self.keyword("not"):
+            return Not(self.negation())
+        if self.peek() == ("paren", "("):
+            self.position += 1
+            node = self.disjunction()
+            self.take("paren", "')'")
+            return node
+        field = self.take("word", "a field").lower()
+        if field in ("open", "closed"):
+            return Flag(field == "closed")
+        if field not in FIELDS:
+            raise ValueError(
+                f"Unknown field '{field}', expected one of "
+                f"{', '.join(FIELDS)}, open or closed."
+            )
+        op = self.take("op", f"a comparison after '{field}'")
+        op = "=" if op == "==" else op
+        kind, text = self.peek()
+        if kind not in ("word", "string"):
+            raise ValueError(f"Expected a value after '{field} {op}'.")
+        self.position += 1
+        if field == "tag" and op not in ("=", "!="):
+            raise ValueError("Tags can only be compared with = and !=.")
+        if field == "end_date":
+            value: Any = parse_date(text, self.today).toordinal()
+        elif field == "score":
+            try:
+                value = float(text)
+            except ValueError:
+                raise ValueError(f"'{text}' is not a number.")
+        else:
+            value = text
+        return Compare(field, op, value)
+
+
+def _metadata_field(metadata: Dict[str, Any], field: str) -> Any:
+    # Mirrors how Forecast reads its header; anything it would reject is UNKNOWN,
+    # so the file is built anyway and its error surfaces
+    if field == "closed":
+        return "outcome" in metadata
+    if field == "score":
+        return UNKNOWN if "outcome" in metadata else None
+    if field == "tag":
+        return read_tags(metadata)
+    if field not in metadata:
+        return UNKNOWN
+    raw = metadata[field]
+    if field != "end_date":
+        return str(raw)
+    if isinstance(raw, datetime.date):
+        return raw.toordinal()
+    try:
+        return datetime.datetime.strptime(str(raw), "%Y-%m-%d").date().toordinal()
+    except ValueError:
+        return UNKNOWN
+
+
+def _forecast_field(forecast: Forecast, field: str, rule: str = "brier") -> Any:
+    closed = hasattr(forecast, "outcome")
+    if field == "closed":
+        return closed
+    if field == "score":
+        return score_or_none(forecast, rule) if closed else None
+    if field == "tag":
+        return forecast.tags
+    if field == "end_date":
+        return forecast.end_date.toordinal()
+    return str(getattr(forecast, field))
+
+
+def _evaluate(node: Node, read: Callable[[str], Any]) -> Optional[bool]:
+    """Evaluate `node` in three-valued logic: None when it depends on an UNKNOWN."""
+    if isinstance(node, (And, Or)):
+        decisive = isinstance(node, Or)
+        result: Optional[bool] = not decisive
+        for child in node.nodes:
+            value = _evaluate(child, read)
+            if value is decisive:
+                return decisive
+            if value is None:
+                result = None
+        return result
+    if isinstance(node, Not):
+        value = _evaluate(node.node, read)
+        return None if value is None else not value
+    if isinstance(node, Flag):
+        closed = read("closed")
+        return closed == node.closed
+    value = read(node.field)
+    if value is UNKNOWN:
+        return None
+    if node.field == "tag":
+        found = node.value in value
+        return found if node.op == "=" else not found
+    if value is None:
+        # Only scores can be missing, and a missing score satisfies no comparison
+        return False
+    return OPERATORS[node.op](value, node.value)
+
+
+def _sql(node: Node, params: List[Any], rule: str) -> str:
+    if isinstance(node, (And, Or)):
+        joiner = " AND " if isinstance(node, And) else " OR "
+        return (
+            "(" + joiner.join(_sql(child, params, rule) for child in node.nodes) + ")"
+        )
+    if isinstance(node, Not):
+        return f"(NOT {_sql(node.node, params, rule)})"
+    if isinstance(node, Flag):
+        return f"closed = {int(node.closed)}"
+    params.append(node.value)
+    op = "<>" if node.op == "!=" else node.op
+    if node.field == "tag":
+        negate = "NOT " if node.op == "!=" else ""
+        return f"filename {negate}IN (SELECT filename FROM tags WHERE tag = ?)"
+    if node.field == "score":
+        # Never NULL, so `not score > x` keeps unscored forecasts, as in Python
+        column = SCORE_COLUMNS[rule]
+        return f"({column} IS NOT NULL AND {column} {op} ?)"
+    return f"{node.field} {op} ?"
+
+
+class Where:
+    """A parsed `--where` expression.
+
+    Args:
+        text (str): The expression, see the module docstring
+        today (datetime.date, optional): The date `today` stands for; defaults to
+            the current date
+        rule (str): The scoring rule `score` compares, one of SCORING_RULES
+
+    Raises:
+        ValueError: If `text` isn't a valid expression
+    """
+
+    def __init__(
+        self, text: str, today: Optional[datetime.date] = None, rule: str = "brier"
+    ) -> None:
+        if rule not in SCORING_RULES:
+            raise ValueError(f"Unknown scoring rule '{rule}'.")
+        self.text = text
+        self.rule = rule
+        self.node: Node = _Parser(text, today).parse()
+
+    def __repr__(self) -> str:
+        return f"Where({self.text!r})"
+
+    def admits(self, metadata: Dict[str, Any]) -> bool:
+        """Whether a file with this raw header can match, before it is built.
+
+        Only False when the header alone rules the forecast out; a comparison on
+        a score leaves it in. As with the metadata index, a header missing the
+        scenario, type or end date always passes, so its error is reported.
+        """
+        for field in ("scenario", "type", "end_date"):
+            if _metadata_field(metadata, field) is UNKNOWN:
+                return True
+        value = _evaluate(self.node, lambda field: _metadata_field(metadata, field))
+        return value is not False
+
+    def matches(self, forecast: Forecast) -> bool:
+        """Whether a built forecast matches."""
+        return bool(
+            _evaluate(
+                self.node, lambda field: _forecast_field(forecast, field, self.rule)
+            )
+        )
+
+    def sql(self) -> Tuple[str, List[Any]]:
+        """A WHERE clause over the SQLite storage's columns, and its parameters."""
+        params: List[Any] = []
+        return _sql(self.node, params, self.rule), params
+
+
+class SortKey(NamedTuple):
+    """One `--sort` key.
+
+    Attributes:
+        field (str): One of SORT_KEYS
+        descending (bool): Largest first
+        rule (str): For `score`, the scoring rule it orders by
+    """
+
+    field: str
+    descending: bool = False
+    rule: str = "brier"
+
+
+DEFAULT_SORT = (SortKey("end_date"),)
+
+
+def parse_sort(text: str, rule: str = "brier") -> Tuple[SortKey, ...]:
+    """Parse comma-separated sort keys, each optionally prefixed with `-` for
+    descending order, e.g. `type,-score`. `score` orders by the score under `rule`.
+
+    Raises:
+        ValueError: If a key isn't one of SORT_KEYS
+    """
+    keys = []
+    for part in text.split(","):
+        part = part.strip()
+        descending = part.startswith("-")
+        field = part.lstrip("-").lower()
+        if field not in SORT_KEYS:
+            raise ValueError(
+                f"Can't sort by '{field}', expected one of {', '.join(SORT_KEYS)}."
+            )
+        keys.append(
+            SortKey(field, descending, rule)
+            if field == "score"
+            else SortKey(field, descending)
+        )
+    return tuple(keys)
+
+
+class _Descending:
+    """Reverses the order of a value that can't be negated, like a string."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+def sort_key(
+    keys: Sequence[SortKey], by_path: bool = False
+) -> Callable[[Forecast], Tuple[Any, ...]]:
+    """A key function ordering forecasts by `keys`. Unscored forecasts sort after
+    scored ones, whichever the direction.
+
+    With `by_path`, ties are broken by the forecast's path, as the SQLite
+    storage breaks them by file name.
+    """
+
+    def key(forecast: Forecast) -> Tuple[Any, ...]:
+        values: List[Any] = []
+        for field, descending, rule in keys:
+            if field == "score":
+                score = _forecast_field(forecast, "score", rule)
+                values.append(score is None)
+                score = 0.0 if score is None else score
+                values.append(-score if descending else score)
+            elif field == "end_date":
+                end = forecast.end_date.toordinal()
+                values.append(-end if descending else end)
+            else:
+                value = str(getattr(forecast, field))
+                values.append(_Descending(value) if descending else value)
+        if by_path:
+            values.append(forecast.path or "")
+        return tuple(values)
+
+    return key
+
+
+def sort_sql(keys: Sequence[SortKey]) -> str:
+    """An ORDER BY clause for `keys` over the SQLite storage's columns."""
+    terms = []
+    for field, descending, rule in keys:
+        direction = " DESC" if descending else ""
+        if field == "score":
+            field = SCORE_COLUMNS[rule]
+            terms.append(f"{field} IS NULL")
+        terms.append(f"{field}{direction}")
+    return ", ".join(terms)
+
+
+def top_k(
+    forecasts: Iterable[Forecast],
+    keys: Sequence[SortKey],
+    limit: Optional[int],
+    by_path: bool = False,
+) -> List[Forecast]:
+    """The first `limit` forecasts in `keys` order, or all of them if it is None.
+
+    With a limit, a bounded heap keeps only `limit` forecasts in memory however
+    many stream past. Ties keep their input order, as in a stable sort, unless
+    `by_path` breaks them by path, see `sort_key`.
+    """
+    key = sort_key(keys, by_path)
+    if limit is None:
+        return sorted(forecasts, key=key)
+    return heapq.nsmallest(limit, forecasts, key=key)
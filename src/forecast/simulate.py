@@ -0,0 +1,302 @@
+# pyre-strict
+"""Monte Carlo rollup of the sum of open PERT, LogNormal and Pareto forecasts.
+
+Samples are drawn in fixed-size chunks. Chunk `i` always draws from its own
+stream, `SeedSequence(seed, spawn_key=(i,))`, so a run is reproducible from
+its seed and chunk size alone, whichever process drew each chunk and in
+whatever order the chunks finished.
+
+Only a summary of each chunk is kept: moments, exceedance counts and a
+histogram over bin edges taken from chunk 0's samples, which have equal
+probability mass. Memory depends on the chunk size and the number of bins,
+never on the number of samples.
+"""
+
+import os
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np  # type: ignore
+
+# Samples per chunk
+CHUNK_SIZE = 100_000
+# Histogram bins used to estimate quantiles
+QUANTILE_BINS = 4096
+# Largest (components x samples) block drawn at once
+BLOCK_VALUES = 1_000_000
+DEFAULT_QUANTILES = (0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99)
+# The forecast types that can be simulated, in the order they are drawn
+TYPES = ("pert", "lognormal", "pareto")
+
+
+class Portfolio:
+    """The distributions of the forecasts whose sum is simulated.
+
+    Attributes:
+        pert (list): (key, xmin, span, alpha, beta) of each PERT forecast
+        lognormal (list): (key, mu, sigma) of each LogNormal forecast
+        pareto (list): (key, alpha, xmin) of each Pareto forecast
+    """
+
+    def __init__(self) -> None:
+        self.pert: List[tuple] = []
+        self.lognormal: List[tuple] = []
+        self.pareto: List[tuple] = []
+
+    def add(self, forecast: Any) -> bool:
+        """Add an open forecast of a simulated type; return whether it was added.
+
+        Parameters are read off the forecast's fitted distribution, so draws
+        always come from the same fit the forecast is scored with.
+
+        Raises:
+            ValueError: If the forecast's parameters don't define a distribution
+        """
+        if hasattr(forecast, "outcome") or forecast.type not in TYPES:
+            return False
+        # Sorting by key makes the draw order independent of the listing order
+        key = forecast.path or forecast.scenario
+        fit = forecast.distribution()
+        if forecast.type == "pert":
+            self.pert.append(
+                (key, float(fit.xmin), float(fit.range), fit.alpha, fit.beta)
+            )
+        elif forecast.type == "lognormal":
+            self.lognormal.append((key, fit.mu, fit.sigma))
+        else:
+            self.pareto.append((key, fit.alpha, fit.xmin))
+        return True
+
+    def __len__(self) -> int:
+        return len(self.pert) + len(self.lognormal) + len(self.pareto)
+
+    def params(self) -> Dict[str, Any]:
+        """Parameter arrays per type, one row per component, sorted by key."""
+        return {
+            name: np.array([row[1:] for row in sorted(rows)], dtype=float)
+            for name, rows in (
+                ("pert", self.pert),
+                ("lognormal", self.lognormal),
+                ("pareto", self.pareto),
+            )
+            if rows
+        }
+
+
+def _blocks(params: Any, size: int) -> Iterable[Any]:
+    # Groups of rows, so a block of draws never exceeds BLOCK_VALUES values
+    step = max(1, BLOCK_VALUES // size)
+    for start in range(0, len(params), step):
+        yield params[start : start + step]
+
+
+def draw_chunk(params: Dict[str, Any], seed: int, index: int, size: int) -> Any:
+    """The `size` sums of chunk `index`, drawn from that chunk's own stream."""
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+    total = np.zeros(size)
+    if "pert" in params:
+        # A PERT is a beta distribution scaled to [xmin, xmax]
+        for p in _blocks(params["pert"], size):
+            u = rng.beta(p[:, 2:3], p[:, 3:4], size=(len(p), size))
+            total += (p[:, 0:1] + p[:, 1:2] * u).sum(axis=0)
+    if "lognormal" in params:
+        for p in _blocks(params["lognormal"], size):
+            total += rng.lognormal(p[:, 0:1], p[:, 1:2], size=(len(p), size)).sum(
+                axis=0
+            )
+    if "pareto" in params:
+        # Inverse CDF: xmin / (1 - U)^(1/alpha), with 1 - U in (0, 1]
+        for p in _blocks(params["pareto"], size):
+            u = 1 - rng.random(size=(len(p), size))
+            total += (p[:, 1:2] * u ** (-1 / p[:, 0:1])).sum(axis=0)
+    return total
+
+
+class ChunkSummary(NamedTuple):
+    """What is kept of one chunk of samples.
+
+    Attributes:
+        count (int): Number of samples
+        mean (float): Their mean
+        m2 (float): Sum of squared deviations from the mean
+        low (float): Smallest sample
+        high (float): Largest sample
+        histogram (ndarray): Counts below, between and above the bin edges
+        exceed (list[int]): Number of samples above each threshold
+    """
+
+    count: int
+    mean: float
+    m2: float
+    low: float
+    high: float
+    histogram: Any
+    exceed: List[int]
+
+
+def summarize(samples: Any, edges: Any, thresholds: Sequence[float]) -> ChunkSummary:
+    mean = float(samples.mean())
+    return ChunkSummary(
+        len(samples),
+        mean,
+        float(((samples - mean) ** 2).sum()),
+        float(samples.min()),
+        float(samples.max()),
+        np.bincount(
+            np.searchsorted(edges, samples, side="right"), minlength=len(edges) + 1
+        ),
+        [int((samples > t).sum()) for t in thresholds],
+    )
+
+
+def _simulate_chunk(
+    params: Dict[str, Any],
+    seed: int,
+    index: int,
+    size: int,
+    edges: Any,
+    thresholds: Sequence[float],
+) -> ChunkSummary:
+    return summarize(draw_chunk(params, seed, index, size), edges, thresholds)
+
+
+class SimulationResult:
+    """The distribution of the simulated sum, merged from chunk summaries.
+
+    Attributes:
+        count (int): Number of samples
+        mean (float): Mean of the sum
+        low (float): Smallest sample
+        high (float): Largest sample
+        thresholds (list[float]): The thresholds exceedance was counted for
+    """
+
+    def __init__(self, edges: Any, thresholds: Sequence[float]) -> None:
+        self.edges = edges
+        self.thresholds = list(thresholds)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.low = float("inf")
+        self.high = float("-inf")
+        self.histogram: Any = np.zeros(len(edges) + 1, dtype=np.int64)
+        self.exceed = [0] * len(self.thresholds)
+
+    def merge(self, chunk: ChunkSummary) -> None:
+        """Fold in one chunk (Chan et al. for the moments)."""
+        n = self.count + chunk.count
+        delta = chunk.mean - self.mean
+        self.m2 += chunk.m2 + delta * delta * self.count * chunk.count / n
+        self.mean += delta * chunk.count / n
+        self.count = n
+        self.low = min(self.low, chunk.low)
+        self.high = max(self.high, chunk.high)
+        self.histogram += chunk.histogram
+        self.exceed = [a + b for a, b in zip(self.exceed, chunk.exceed)]
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation of the sum."""
+        return (self.m2 / (self.count - 1)) ** 0.5 if self.count > 1 else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile by interpolating within its histogram bin.
+
+        Bins hold about 1/QUANTILE_BINS of the probability mass each, which
+        bounds the error in probability; the outer bins stretch to the smallest
+        and largest samples.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        bounds = np.concatenate(([self.low], self.edges, [self.high]))
+        cumulative = np.cumsum(self.histogram)
+        target = q * self.count
+        k = min(
+            int(np.searchsorted(cumulative, target, side="left")), len(cumulative) - 1
+        )
+        below = cumulative[k - 1] if k else 0
+        inside = self.histogram[k]
+        fraction = (target - below) / inside if inside else 0.0
+        lo, hi = bounds[k], bounds[k + 1]
+        return float(lo + (hi - lo) * fraction)
+
+    def exceedance(self) -> List[tuple]:
+        """(threshold, probability the sum exceeds it) per threshold, exactly."""
+        return [(t, hits / self.count) for t, hits in zip(self.thresholds, self.exceed)]
+
+
+def simulate(
+    portfolio: Portfolio,
+    samples: int,
+    seed: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+    jobs: Optional[int] = 1,
+    thresholds: Sequence[float] = (),
+) -> SimulationResult:
+    """Simulate the sum of the portfolio's distributions.
+
+    The result only depends on `seed`, `samples` and `chunk_size`: `jobs`
+    changes how fast chunks are drawn, not what they contain, and summaries are
+    merged in chunk order.
+
+    Args:
+        portfolio: The distributions to sum
+        samples: Number of samples of the sum
+        seed: Seed of the root SeedSequence
+        chunk_size: Samples drawn per chunk; bounds memory
+        jobs: Number of worker processes. None uses the CPU count; 1 runs serially.
+        thresholds: Values to report the probability of exceeding
+
+    Raises:
+        ValueError: If the portfolio is empty or `samples` is not positive
+    """
+    if not len(portfolio):
+        raise ValueError("Nothing to simulate")
+    if samples < 1 or chunk_size < 1:
+        raise ValueError("samples and chunk_size must be positive")
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    params = portfolio.params()
+    sizes = [
+        min(chunk_size, samples - start) for start in range(0, samples, chunk_size)
+    ]
+
+    # Chunk 0 fixes the bin edges: its order statistics at equal probability steps
+    first = draw_chunk(params, seed, 0, sizes[0])
+    edges = np.unique(np.quantile(first, np.linspace(0, 1, QUANTILE_BINS + 1)))
+    result = SimulationResult(edges, thresholds)
+    result.merge(summarize(first, edges, thresholds))
+    del first
+
+    if jobs <= 1 or len(sizes) <= 2:
+        for index in range(1, len(sizes)):
+            result.merge(
+                _simulate_chunk(params, seed, index, sizes[index], edges, thresholds)
+            )
+        return result
+
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+    pending: Deque["Future[ChunkSummary]"] = deque()
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        for index in range(1, len(sizes)):
+            pending.append(
+                executor.submit(
+                    _simulate_chunk,
+                    params,
+                    seed,
+                    index,
+                    sizes[index],
+                    edges,
+                    thresholds,
+                )
+            )
+            # Keep every worker busy without queueing every summary at once
+            if len(pending) > 2 * jobs:
+                result.merge(pending.popleft().result())
+        while pending:
+            result.merge(pending.popleft().result())
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return result
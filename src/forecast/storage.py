@@ -0,0 +1,425 @@
+# pyre-strict
+"""Storage backends the CLI reads forecasts from.
+
+`FileStorage` reads the `.forecast` files on every run, through
+`iter_forecasts`. `SQLiteStorage` mirrors them into an SQLite database in
+`.cache`, re-reading only the files that changed since the last run, and
+answers queries with indexed SQL, so filtering and sorting a large corpus
+doesn't scan it.
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from forecast.loader import ForecastError, LoadResult, iter_forecasts, to_forecast
+from forecast.models.forecast import Forecast
+from forecast.query import DEFAULT_SORT, SortKey, Where, score_or_none, sort_sql, top_k
+
+if TYPE_CHECKING:
+    import sqlite3
+
+STORAGES = ("files", "sqlite")
+DATABASE_FILE = "forecasts.sqlite"
+# Bump when the database schema changes; older databases are rebuilt.
+DATABASE_FORMAT = 4
+
+SCHEMA = """
+CREATE TABLE header (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE forecasts (
+    filename TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    type TEXT,
+    scenario TEXT,
+    end_date INTEGER,
+    closed INTEGER NOT NULL DEFAULT 0,
+    score REAL,
+    crps REAL,
+    log_score REAL,
+    metadata TEXT,
+    error TEXT
+);
+CREATE TABLE tags (
+    tag TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    PRIMARY KEY (tag, filename)
+) WITHOUT ROWID;
+CREATE INDEX forecasts_end_date ON forecasts (end_date);
+CREATE INDEX forecasts_type ON forecasts (type, end_date);
+CREATE INDEX forecasts_closed ON forecasts (closed, end_date);
+CREATE INDEX forecasts_score ON forecasts (score);
+CREATE INDEX forecasts_crps ON forecasts (crps);
+CREATE INDEX forecasts_log_score ON forecasts (log_score);
+CREATE INDEX tags_filename ON tags (filename);
+"""
+
+
+class StorageError(Exception):
+    """The storage backend couldn't be opened, read or updated."""
+
+
+class Query(NamedTuple):
+    """Which forecasts to return; a forecast must match every filter given.
+
+    End dates, open/closed state and scores are filtered with `where`, as
+    `--where` does.
+
+    Attributes:
+        type (str, optional): Forecast type
+        tag (str, optional): A tag the forecast must have
+        where (Where, optional): A `--where` expression forecasts must match
+        sort (tuple[SortKey, ...]): The order forecasts are returned in; ties
+            are returned by file name
+        limit (int, optional): Return at most this many forecasts
+    """
+
+    type: Optional[str] = None
+    tag: Optional[str] = None
+    where: Optional[Where] = None
+    sort: Tuple[SortKey, ...] = DEFAULT_SORT
+    limit: Optional[int] = None
+
+    def matches(self, forecast: Forecast) -> bool:
+        if self.type is not None and forecast.type != self.type:
+            return False
+        if self.tag is not None and self.tag not in forecast.tags:
+            return False
+        return self.where is None or self.where.matches(forecast)
+
+
+class ForecastStorage(ABC):
+    """Where the forecasts under one root come from.
+
+    Args:
+        root (str): The directory holding the `.forecast` files
+        include (Sequence[str]): Globs a file must match, relative to `root`
+        exclude (Sequence[str]): Globs of files and directories to leave out
+        jobs (int, optional): Number of processes used to load files
+    """
+
+    def __init__(
+        self,
+        root: str,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+        jobs: Optional[int] = 1,
+    ) -> None:
+        self.root = root
+        self.include = include
+        self.exclude = exclude
+        self.jobs = jobs
+
+    @abstractmethod
+    def select(self, query: Query) -> Iterator[Union[Forecast, ForecastError]]:
+        """Yield a ForecastError for each broken file, by file name, then the
+        matching forecasts in `query.sort` order, at most `query.limit` of them.
+        Forecasts that tie on the sort keys come by file name, so every backend
+        returns the same order.
+
+        Raises:
+            StorageError: If the backend can't be read
+        """
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class FileStorage(ForecastStorage):
+    """Reads and scores the `.forecast` files on every query.
+
+    `type` and `tag` are served by the metadata index when `use_cache` is set,
+    and `where` skips files by their header before they are built and scored;
+    the other filters are applied to the loaded forecasts. With a limit, only
+    the best `limit` forecasts so far are kept in memory.
+
+    Args:
+        use_cache (bool): Read and update the score cache and metadata index
+    """
+
+    def __init__(
+        self,
+        root: str,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+        jobs: Optional[int] = 1,
+        use_cache: bool = False,
+    ) -> None:
+        super().__init__(root, include, exclude, jobs)
+        self.use_cache = use_cache
+
+    def select(self, query: Query) -> Iterator[Union[Forecast, ForecastError]]:
+        errors: List[ForecastError] = []
+
+        def forecasts() -> Iterator[Forecast]:
+            for item in iter_forecasts(
+                self.root,
+                type=query.type,
+                tag=query.tag,
+                include=self.include,
+                exclude=self.exclude,
+                jobs=self.jobs,
+                use_cache=self.use_cache,
+                where=query.where,
+            ):
+                if isinstance(item, ForecastError):
+                    errors.append(item)
+                elif query.matches(item):
+                    yield item
+
+        selected = top_k(forecasts(), query.sort, query.limit, by_path=True)
+        yield from sorted(errors, key=lambda e: e.filename)
+        yield from selected
+
+
+class SQLiteStorage(ForecastStorage):
+    """Mirrors the `.forecast` files into an SQLite database and queries it.
+
+    The database lives in `.cache/forecasts.sqlite` under the root. Each query
+    first syncs it with the directory: files whose size and mtime are unchanged
+    are skipped, files whose content is unchanged only get their mtime updated,
+    and the rest are loaded and scored again. Type, tag, end date, open/closed
+    state and the score under each rule are indexed columns, and filters, `where`, the sort
+    and the limit all run in SQL. Files that fail to load are kept with their error and reported
+    by every query, as on the file path.
+
+    The database is rebuilt when the package version or the scoring code changes.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+        jobs: Optional[int] = 1,
+    ) -> None:
+        import sqlite3
+
+        from forecast.cache import CACHE_DIR, make_cache_dir
+
+        super().__init__(root, include, exclude, jobs)
+        cache_dir = os.path.join(root, CACHE_DIR)
+        self.path: str = os.path.join(cache_dir, DATABASE_FILE)
+        try:
+            make_cache_dir(cache_dir)
+            self.connection: "sqlite3.Connection" = self._open()
+        except (OSError, sqlite3.Error) as e:
+            raise StorageError(f"Can't open '{self.path}': {e}") from e
+
+    def _open(self) -> "sqlite3.Connection":
+        import sqlite3
+
+        from forecast.cache import package_version, scoring_fingerprint
+
+        header = {
+            "format": str(DATABASE_FORMAT),
+            "package": package_version(),
+            "scoring": scoring_fingerprint(),
+        }
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            found = dict(connection.execute("SELECT key, value FROM header"))
+        except sqlite3.DatabaseError:
+            # A new, outdated or damaged database
+            found = {}
+        if found != header:
+            connection.close()
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            connection = sqlite3.connect(self.path, timeout=30)
+            with connection:
+                connection.executescript(SCHEMA)
+                connection.executemany(
+                    "INSERT INTO header VALUES (?, ?)", sorted(header.items())
+                )
+        return connection
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def sync(self) -> None:
+        """Bring the database up to date with the `.forecast` files under the root."""
+        from forecast.discovery import discover
+        from forecast.header import header_digest
+        from forecast.loader import load_files
+
+        known = {
+            filename: (size, mtime, sha256)
+            for filename, size, mtime, sha256 in self.connection.execute(
+                "SELECT filename, size, mtime, sha256 FROM forecasts"
+            )
+        }
+        touched: List[Tuple[int, str]] = []
+        stale: List[str] = []
+        for filename in discover(self.root):
+            path = os.path.join(self.root, filename)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entry = known.pop(filename, None)
+            if entry is not None and entry[0] == st.st_size:
+                if entry[1] == st.st_mtime_ns:
+                    continue
+                if entry[2] == header_digest(path):
+                    touched.append((st.st_mtime_ns, filename))
+                    continue
+            stale.append(filename)
+        if not (known or touched or stale):
+            return
+        with self.connection:
+            removed = [(filename,) for filename in known]
+            self.connection.executemany(
+                "DELETE FROM forecasts WHERE filename = ?", removed
+            )
+            self.connection.executemany("DELETE FROM tags WHERE filename = ?", removed)
+            self.connection.executemany(
+                "UPDATE forecasts SET mtime = ? WHERE filename = ?", touched
+            )
+            for result in load_files(self.root, stale, self.jobs):
+                # Stored under the fingerprint of the bytes that were loaded; a
+                # file that changed while it was read gets none, and is loaded
+                # again on the next sync
+                fingerprint = result.fingerprint or (-1, -1, "")
+                row, tags = self._row(result)
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO forecasts "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (result.filename, *fingerprint) + row,
+                )
+                self.connection.execute(
+                    "DELETE FROM tags WHERE filename = ?", (result.filename,)
+                )
+                self.connection.executemany(
+                    "INSERT INTO tags VALUES (?, ?)",
+                    [(tag, result.filename) for tag in tags],
+                )
+
+    @staticmethod
+    def _row(result: LoadResult) -> Tuple[Tuple[Any, ...], Set[str]]:
+        from forecast.cache import _encode
+
+        if result.error is not None:
+            return (None, None, None, 0, None, None, None, None, result.error), set()
+        forecast = to_forecast(result)
+        closed = hasattr(forecast, "outcome")
+        try:
+            metadata: Optional[str] = json.dumps(_encode(result.metadata))
+        except TypeError:
+            # Not storable; the file is read again whenever it is selected
+            metadata = None
+        row = (
+            forecast.type,
+            str(forecast.scenario),
+            forecast.end_date.toordinal(),
+            int(closed),
+            result.score,
+            score_or_none(forecast, "crps") if closed else None,
+            score_or_none(forecast, "log") if closed else None,
+            metadata,
+            None,
+        )
+        # A tag given on the command line is a string, so only those can match
+        return row, {tag for tag in forecast.tags if isinstance(tag, str)}
+
+    def select(self, query: Query) -> Iterator[Union[Forecast, ForecastError]]:
+        import sqlite3
+
+        from forecast.cache import _decode
+        from forecast.discovery import discover
+        from forecast.loader import load_file
+
+        clauses = ["error IS NULL"]
+        params: List[Any] = []
+        for clause, value in (
+            ("type = ?", query.type),
+            ("filename IN (SELECT filename FROM tags WHERE tag = ?)", query.tag),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        if query.where is not None:
+            clause, where_params = query.where.sql()
+            clauses.append(clause)
+            params += where_params
+        order = sort_sql(query.sort)
+        allowed: Optional[Set[str]] = None
+        if self.include or self.exclude:
+            allowed = set(discover(self.root, self.include, self.exclude))
+        limit = ""
+        if query.limit is not None and allowed is None:
+            # With globs, rows are dropped after the query, so the limit is too
+            limit = f" LIMIT {int(query.limit)}"
+        remaining = query.limit
+
+        try:
+            self.sync()
+            errors = self.connection.execute(
+                "SELECT filename, error FROM forecasts WHERE error IS NOT NULL "
+                "ORDER BY filename"
+            )
+            for filename, error in errors:
+                if allowed is None or filename in allowed:
+                    yield ForecastError(self.root, filename, error)
+            rows = self.connection.execute(
+                "SELECT filename, metadata, score FROM forecasts "
+                f"WHERE {' AND '.join(clauses)} ORDER BY {order}, filename{limit}",
+                params,
+            )
+            for filename, metadata, score in rows:
+                if remaining is not None and remaining <= 0:
+                    break
+                if allowed is not None and filename not in allowed:
+                    continue
+                if metadata is None:
+                    result = load_file(self.root, filename, False)
+                    if result.error is not None:
+                        yield ForecastError(self.root, filename, result.error)
+                        continue
+                else:
+                    result = LoadResult(
+                        filename, _decode(json.loads(metadata)), score, None
+                    )
+                forecast = to_forecast(result)
+                forecast.path = os.path.join(self.root, filename)
+                if remaining is not None:
+                    remaining -= 1
+                yield forecast
+        except sqlite3.Error as e:
+            raise StorageError(f"Can't query '{self.path}': {e}") from e
+
+
+def open_storage(
+    storage: str,
+    root: str,
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+    jobs: Optional[int] = 1,
+    use_cache: bool = False,
+) -> ForecastStorage:
+    """Open the backend named `storage`, one of STORAGES, for `root`.
+
+    Raises:
+        StorageError: If the backend can't be opened
+    """
+    if storage == "sqlite":
+        return SQLiteStorage(root, include, exclude, jobs)
+    if storage == "files":
+        return FileStorage(root, include, exclude, jobs, use_cache)
+    raise ValueError(f"Unknown storage '{storage}', expected one of {STORAGES}.")
@@ -0,0 +1,292 @@
+# pyre-strict
+import os
+import select
+import struct
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from forecast.discovery import IGNORE_FILES, SKIP_DIRS, discover
+from forecast.loader import LoadResult, load_file, load_files, to_forecast
+from forecast.models.forecast import Forecast
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+_EVENT = struct.Struct("iIII")
+
+# Quiet period that ends a burst of events, e.g. an editor's save storm
+DEBOUNCE_SECONDS = 0.1
+POLL_SECONDS = 0.5
+
+
+def _relevant(name: str) -> bool:
+    # Forecasts, and the ignore files that decide which forecasts are listed
+    return name.endswith(".forecast") or os.path.basename(name) in IGNORE_FILES
+
+
+class PollingWatcher:
+    """Detect changed `.forecast` files by comparing snapshots of the tree.
+
+    Snapshots list the files `discover` finds, so a change to an ignore file
+    shows up as the files it adds or removes.
+
+    Args:
+        directory (str): The directory to watch, recursively
+        interval (float): Seconds between snapshots
+    """
+
+    def __init__(self, directory: str, interval: float = POLL_SECONDS) -> None:
+        self.directory = directory
+        self.interval = interval
+        self.snapshot: Dict[str, Tuple[int, int]] = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for name in discover(self.directory):
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            snapshot[name] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Block until something changes (or `timeout` passes); return the changed names."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._snapshot()
+            changed = {
+                name
+                for name in current.keys() | self.snapshot.keys()
+                if current.get(name) != self.snapshot.get(name)
+            }
+            self.snapshot = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval)
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Detect changed `.forecast` files with Linux inotify, through ctypes.
+
+    Every directory under `directory` is watched, and directories created later
+    are added as they appear. Names are reported relative to `directory`, like
+    `discover` yields them; changes to directories and ignore files are reported
+    too, since they change which forecasts are listed.
+
+    Args:
+        directory (str): The directory to watch, recursively
+
+    Raises:
+        OSError: If inotify is unavailable
+    """
+
+    def __init__(self, directory: str) -> None:
+        import ctypes
+        import ctypes.util
+
+        self.directory = directory
+        self.libc: ctypes.CDLL = ctypes.CDLL(
+            ctypes.util.find_library("c") or "libc.so.6", use_errno=True
+        )
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        self.fd: int = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Watch descriptor to the watched directory's prefix, relative to `directory`
+        self.prefixes: Dict[int, str] = {}
+        try:
+            self._add_tree("")
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def _add_tree(self, prefix: str) -> Set[str]:
+        """Watch the directory at `prefix` and everything below it; return the
+        forecasts found there."""
+        import ctypes
+
+        mask = (
+            IN_MODIFY
+            | IN_CLOSE_WRITE
+            | IN_MOVED_FROM
+            | IN_MOVED_TO
+            | IN_CREATE
+            | IN_DELETE
+        )
+        found = set()
+        top = os.path.join(self.directory, prefix)
+        for root, dirs, files in os.walk(top):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            relative = os.path.relpath(root, self.directory)
+            relative = "" if relative == "." else relative.replace(os.sep, "/") + "/"
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(root), mask)
+            if wd < 0:
+                if not prefix:
+                    raise OSError(
+                        ctypes.get_errno(), f"inotify_add_watch failed for '{root}'"
+                    )
+                # Removed again before it could be watched
+                continue
+            self.prefixes[wd] = relative
+            found.update(relative + f for f in files if f.endswith(".forecast"))
+        return found
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Block until something changes (or `timeout` passes); return the changed names."""
+        changed: Set[str] = set()
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        while readable:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped; treat every file as changed
+                    changed.update(discover(self.directory))
+                    continue
+                if mask & IN_IGNORED:
+                    # The directory was removed; its files were reported already
+                    self.prefixes.pop(wd, None)
+                    continue
+                prefix = self.prefixes.get(wd)
+                if prefix is None:
+                    continue
+                path = prefix + name
+                if mask & IN_ISDIR:
+                    changed.add(path + "/")
+                    if mask & (IN_CREATE | IN_MOVED_TO) and name not in SKIP_DIRS:
+                        # Files may have landed in it before its watch was added
+                        changed.update(self._add_tree(path))
+                elif _relevant(path):
+                    changed.add(path)
+            if changed:
+                break
+            readable, _, _ = select.select([self.fd], [], [], timeout)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def make_watcher(directory: str) -> Union[InotifyWatcher, PollingWatcher]:
+    """Prefer inotify, falling back to polling where it isn't available."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory)
+        except OSError:
+            pass
+    return PollingWatcher(directory)
+
+
+class ForecastState:
+    """The loaded corpus, kept up to date one file at a time.
+
+    A file that fails to load stays in `errors` until it loads cleanly or is
+    deleted, so every redraw reports every broken file, not just the ones that
+    just changed.
+
+    The files are the ones `discover` lists, as for the table without `--watch`:
+    subdirectories are searched and ignore files are honored.
+
+    Args:
+        forecast_dir (str): The directory holding the `.forecast` files
+    """
+
+    def __init__(self, forecast_dir: str) -> None:
+        self.forecast_dir = forecast_dir
+        self.forecasts: Dict[str, Forecast] = {}
+        self.errors: Dict[str, LoadResult] = {}
+
+    def load_all(self, jobs: Optional[int] = None) -> List[LoadResult]:
+        """Load every file; return the files that are currently broken."""
+        filenames = list(discover(self.forecast_dir))
+        return self._apply(load_files(self.forecast_dir, filenames, jobs, record=False))
+
+    def update(self, filenames: Set[str]) -> List[LoadResult]:
+        """Re-parse and rescore only `filenames`; return the files that are currently
+        broken, changed or not.
+
+        The listing is taken again, so files that were deleted, moved or newly
+        ignored are dropped, and files that appeared with a directory or were
+        un-ignored are loaded, whatever names were reported.
+        """
+        live = set(discover(self.forecast_dir))
+        known = self.forecasts.keys() | self.errors.keys()
+        for filename in known - live:
+            self.forecasts.pop(filename, None)
+            self.errors.pop(filename, None)
+        results = []
+        for filename in sorted((set(filenames) & live) | (live - known)):
+            # A half-written file usually fails to parse, and comes back as an error
+            results.append(load_file(self.forecast_dir, filename, False))
+        return self._apply(results)
+
+    def _apply(self, results: Iterable[LoadResult]) -> List[LoadResult]:
+        for result in results:
+            if result.error is not None:
+                self.forecasts.pop(result.filename, None)
+                self.errors[result.filename] = result
+            else:
+                self.errors.pop(result.filename, None)
+                self.forecasts[result.filename] = to_forecast(result)
+        return [self.errors[filename] for filename in sorted(self.errors)]
+
+    def view(self, type: Optional[str], tag: Optional[str]) -> List[Forecast]:
+        """The loaded forecasts matching the filters, sorted by end date."""
+        forecasts = [
+            f
+            for f in self.forecasts.values()
+            if (type is None or f.type == type) and (tag is None or tag in f.tags)
+        ]
+        return sorted(forecasts, key=lambda x: x.end_date)
+
+
+def watch_forecasts(
+    forecast_dir: str,
+    type: Optional[str],
+    tag: Optional[str],
+    jobs: Optional[int],
+    render: Callable[[List[Forecast], List[LoadResult]], None],
+    debounce: float = DEBOUNCE_SECONDS,
+) -> None:
+    """Load the corpus once, then re-render whenever files change, until interrupted."""
+    state = ForecastState(forecast_dir)
+    errors = state.load_all(jobs)
+    render(state.view(type, tag), errors)
+    watcher = make_watcher(forecast_dir)
+    try:
+        while True:
+            changed = watcher.wait()
+            # Keep collecting until the directory has been quiet for `debounce` seconds
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            errors = state.update(changed)
+            render(state.view(type, tag), errors)
+    finally:
+        watcher.close()
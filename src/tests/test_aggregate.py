@@ -0,0 +1,202 @@
+import math
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from click.testing import CliRunner
+
+from forecast.aggregate import (
+    SKETCH_MIN,
+    ExactSum,
+    QuantileSketch,
+    ScoreReport,
+    ScoreStats,
+)
+from forecast.cache import ForecastCache
+from forecast.discovery import in_shard, parse_shard
+from forecast.forecast import entrypoint
+from forecast.loader import ForecastError, iter_forecasts
+
+FORECASTS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", ".forecasts")
+
+
+def report_over(root: str, shard: tuple = (1, 1)) -> ScoreReport:
+    report = ScoreReport(shard, {"tag": None, "type": None}, "test")
+    for item in iter_forecasts(root, shard=None if shard == (1, 1) else shard):
+        if isinstance(item, ForecastError):
+            report.add_error()
+        else:
+            report.add(item)
+    return report
+
+
+def summary(report: ScoreReport) -> list:
+    # What the report shows; the partials behind equal sums can differ
+    groups = [report.overall] + [
+        stats
+        for by in (report.by_type, report.by_tag)
+        for _, stats in sorted(by.items())
+    ]
+    counts = [report.open, report.unscored, report.errors, sorted(report.by_tag)]
+    return counts + [
+        (s.n, s.mean, s.std, s.sketch.to_dict(), s.quantile(0.5)) for s in groups
+    ]
+
+
+class TestExactSum(unittest.TestCase):
+
+    def test_order_independent(self) -> None:
+        rng = random.Random(3)
+        xs = [rng.uniform(-1, 1) * 10 ** rng.randint(-20, 20) for _ in range(2000)]
+        expected = math.fsum(xs)
+        for _ in range(5):
+            rng.shuffle(xs)
+            parts = [ExactSum() for _ in range(4)]
+            for i, x in enumerate(xs):
+                parts[rng.randrange(4)].add(x)
+            total = ExactSum()
+            for part in parts:
+                total.merge(part)
+            self.assertEqual(total.value, expected)
+
+    def test_keeps_small_terms(self) -> None:
+        total = ExactSum()
+        for x in (1e100, 1.0, -1e100):
+            total.add(x)
+        self.assertEqual(total.value, 1.0)
+
+
+class TestQuantileSketch(unittest.TestCase):
+
+    def test_relative_accuracy(self) -> None:
+        rng = random.Random(5)
+        xs = sorted(rng.random() ** 3 * 2 for _ in range(5000))
+        sketch = QuantileSketch()
+        for x in xs:
+            sketch.add(x)
+        for q in (0, 0.01, 0.25, 0.5, 0.9, 0.99, 1):
+            exact = xs[int(q * (len(xs) - 1))]
+            self.assertLessEqual(
+                abs(sketch.quantile(q) - exact), sketch.accuracy * exact + SKETCH_MIN
+            )
+
+    def test_zeros_and_empty(self) -> None:
+        sketch = QuantileSketch()
+        self.assertTrue(math.isnan(sketch.quantile(0.5)))
+        for x in (0, 0, 0, 1):
+            sketch.add(x)
+        self.assertEqual(sketch.quantile(0.5), 0)
+        self.assertAlmostEqual(sketch.quantile(1), 1, delta=0.01)
+
+    def test_merge_matches_one_pass(self) -> None:
+        rng = random.Random(7)
+        whole, left, right = ScoreStats(), ScoreStats(), ScoreStats()
+        for i in range(1000):
+            x = rng.random()
+            whole.add(x)
+            (left if i % 3 else right).add(x)
+        right.merge(left)
+        self.assertEqual(right.to_dict()["sketch"], whole.to_dict()["sketch"])
+        self.assertEqual(
+            (right.n, right.mean, right.std), (whole.n, whole.mean, whole.std)
+        )
+
+    def test_merge_rejects_other_accuracy(self) -> None:
+        with self.assertRaises(ValueError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+
+class TestShards(unittest.TestCase):
+
+    def test_parse(self) -> None:
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        for spec in ("0/4", "5/4", "2", "a/b", "1/0", "/4"):
+            with self.assertRaises(ValueError):
+                parse_shard(spec)
+
+    def test_partition(self) -> None:
+        names = [f"team-{i}/forecast-{i}.forecast" for i in range(1000)]
+        shards = [[f for f in names if in_shard(f, (i, 4))] for i in range(1, 5)]
+        self.assertEqual(sorted(sum(shards, [])), sorted(names))
+        for shard in shards:
+            self.assertGreater(len(shard), 150)
+
+    def test_merged_shards_match_single_run(self) -> None:
+        single = report_over(FORECASTS_DIR)
+        merged = None
+        for i in (3, 1, 2):
+            partial = ScoreReport.from_json(
+                report_over(FORECASTS_DIR, (i, 3)).to_json()
+            )
+            if merged is None:
+                merged = partial
+            else:
+                merged.merge(partial)
+        self.assertEqual(merged.missing_shards(), [])
+        self.assertEqual(summary(merged), summary(single))
+        self.assertGreater(single.overall.n, 0)
+        self.assertGreater(single.open, 0)
+
+    def test_merge_checks(self) -> None:
+        first = report_over(FORECASTS_DIR, (1, 3))
+        with self.assertRaises(ValueError):
+            first.merge(report_over(FORECASTS_DIR, (1, 3)))
+        with self.assertRaises(ValueError):
+            first.merge(report_over(FORECASTS_DIR, (2, 4)))
+        other = report_over(FORECASTS_DIR, (2, 3))
+        other.filters["tag"] = "foobar"
+        with self.assertRaises(ValueError):
+            first.merge(other)
+        other = report_over(FORECASTS_DIR, (2, 3))
+        other.fingerprint = "other"
+        with self.assertRaises(ValueError):
+            first.merge(other)
+        self.assertEqual(first.missing_shards(), [(2, 3), (3, 3)])
+        with self.assertRaises(ValueError):
+            ScoreReport.from_json('{"format": 1}')
+
+    def test_sharded_runs_keep_the_whole_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            root = os.path.join(directory, ".forecasts")
+            shutil.copytree(FORECASTS_DIR, root)
+            total = len([f for f in os.listdir(root) if f.endswith(".forecast")])
+            for i in (1, 2):
+                list(iter_forecasts(root, use_cache=True, shard=(i, 2)))
+            self.assertEqual(len(ForecastCache(root).entries), total)
+
+
+class TestCli(unittest.TestCase):
+
+    def test_score_and_merge(self) -> None:
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as directory:
+            cwd = os.getcwd()
+            shutil.copytree(FORECASTS_DIR, os.path.join(directory, ".forecasts"))
+            os.chdir(directory)
+            try:
+                single = runner.invoke(entrypoint, ["score", "--no-cache"])
+                for i in (1, 2):
+                    result = runner.invoke(
+                        entrypoint,
+                        ["score", "--shard", f"{i}/2", "--output", f"{i}.json"],
+                    )
+                    self.assertEqual(result.exit_code, 0, result.output)
+                merged = runner.invoke(entrypoint, ["merge", "2.json", "1.json"])
+                partial = runner.invoke(entrypoint, ["merge", "1.json"])
+                repeated = runner.invoke(entrypoint, ["merge", "1.json", "1.json"])
+                no_output = runner.invoke(entrypoint, ["score", "--shard", "1/2"])
+            finally:
+                os.chdir(cwd)
+        self.assertEqual(single.exit_code, 0, single.output)
+        self.assertIn("Brier scores", single.output)
+        self.assertEqual(merged.output, single.output)
+        self.assertIn("Missing shards 2/2", partial.output)
+        self.assertNotEqual(repeated.exit_code, 0)
+        self.assertIn("more than once", repeated.output)
+        self.assertNotEqual(no_output.exit_code, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import io
+import math
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from click.testing import CliRunner
+
+from forecast.bundle import (
+    HEADER,
+    MAGIC,
+    StaleBundleError,
+    load_bundle,
+    pack,
+    read_bundle,
+    stale_sources,
+)
+from forecast.discovery import discover
+from forecast.forecast import display_forecasts, entrypoint
+from forecast.frame import NUMERIC_FIELDS, ForecastFrame
+import forecast.loader as loader
+from forecast.loader import load_files
+
+FORECASTS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", ".forecasts")
+
+
+def same(a: float, b: float) -> bool:
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+
+class TestBundle(unittest.TestCase):
+
+    def setUp(self) -> None:
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.root = os.path.join(directory, ".forecasts")
+        shutil.copytree(FORECASTS_DIR, self.root)
+        self.path = os.path.join(directory, "forecasts.bundle")
+        self.packed, self.errors = pack(self.root, self.path, jobs=1)
+        results = load_files(self.root, list(discover(self.root)), jobs=1)
+        self.frame = ForecastFrame.from_results(results)
+
+    def test_round_trip(self) -> None:
+        loaded = load_bundle(self.path)
+        self.assertEqual(self.errors, [])
+        self.assertEqual(len(loaded), len(self.frame))
+        self.assertEqual(list(loaded.scenario), self.frame.scenario)
+        self.assertEqual(list(loaded.filename), self.frame.filename)
+        for i in range(len(loaded)):
+            self.assertEqual(loaded.tags(i), [str(t) for t in self.frame.tags(i)])
+            self.assertEqual(loaded.type(i), self.frame.type(i))
+            self.assertEqual(loaded.end_date[i], self.frame.end_date[i])
+            for field in NUMERIC_FIELDS:
+                self.assertTrue(
+                    same(getattr(loaded, field)[i], getattr(self.frame, field)[i])
+                )
+        for rule in ("brier", "crps", "log"):
+            for a, b in zip(loaded.score_all(rule), self.frame.score_all(rule)):
+                self.assertTrue(same(a, b))
+
+    def test_columns_view_the_file(self) -> None:
+        loaded = load_bundle(self.path)
+        self.assertIsInstance(loaded.outcome, memoryview)
+        self.assertEqual(loaded.outcome.format, "d")
+
+    def test_display_matches_files(self) -> None:
+        with redirect_stdout(io.StringIO()) as from_bundle:
+            display_forecasts(load_bundle(self.path))
+        with redirect_stdout(io.StringIO()) as from_files:
+            display_forecasts(self.frame)
+        self.assertEqual(from_bundle.getvalue(), from_files.getvalue())
+
+    def test_fresh_after_touch(self) -> None:
+        path = os.path.join(self.root, "6-pert.forecast")
+        os.utime(path, ns=(0, 0))
+        self.assertEqual(stale_sources(read_bundle(self.path)), ([], [], []))
+
+    def test_stale(self) -> None:
+        with open(os.path.join(self.root, "6-pert.forecast"), "a") as f:
+            f.write("\nMore notes.\n")
+        os.remove(os.path.join(self.root, "5-pareto.forecast"))
+        shutil.copy(
+            os.path.join(self.root, "3-interval.forecast"),
+            os.path.join(self.root, "7-interval.forecast"),
+        )
+        self.assertEqual(
+            stale_sources(read_bundle(self.path)),
+            (["6-pert.forecast"], ["7-interval.forecast"], ["5-pareto.forecast"]),
+        )
+        with self.assertRaises(StaleBundleError):
+            load_bundle(self.path)
+        self.assertEqual(len(load_bundle(self.path, check=False)), len(self.frame))
+
+    def test_unchecked_without_sources(self) -> None:
+        shutil.rmtree(self.root)
+        self.assertEqual(len(load_bundle(self.path)), len(self.frame))
+
+    def test_checked_from_any_directory(self) -> None:
+        directory = os.path.dirname(self.root)
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as elsewhere:
+            os.mkdir(os.path.join(elsewhere, ".forecasts"))
+            try:
+                os.chdir(directory)
+                pack(".forecasts", "forecasts.bundle", jobs=1)
+                os.chdir(elsewhere)
+                bundle = read_bundle(self.path)
+                self.assertEqual(bundle.source_root, os.path.realpath(self.root))
+                self.assertEqual(len(load_bundle(self.path)), len(self.frame))
+                os.remove(os.path.join(self.root, "5-pareto.forecast"))
+                with self.assertRaises(StaleBundleError):
+                    load_bundle(self.path)
+            finally:
+                os.chdir(cwd)
+
+    def test_edit_while_packing_is_stale(self) -> None:
+        def edit_after_loading(*args, **kwargs):
+            yield from load_files(*args, **kwargs)
+            with open(os.path.join(self.root, "6-pert.forecast"), "a") as f:
+                f.write("\nEdited.\n")
+
+        with mock.patch.object(loader, "load_files", edit_after_loading):
+            pack(self.root, self.path, jobs=1)
+        with self.assertRaises(StaleBundleError):
+            load_bundle(self.path)
+
+    def test_not_a_bundle(self) -> None:
+        for data in (b"", b"---\nscenario: x\n", HEADER.pack(MAGIC, 99, 0, 0)):
+            with open(self.path, "wb") as f:
+                f.write(data)
+            with self.assertRaises(ValueError):
+                read_bundle(self.path)
+
+
+class TestCli(unittest.TestCase):
+
+    def test_pack_and_bundle(self) -> None:
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as directory:
+            cwd = os.getcwd()
+            shutil.copytree(FORECASTS_DIR, os.path.join(directory, ".forecasts"))
+            os.chdir(directory)
+            try:
+                packed = runner.invoke(entrypoint, ["pack"])
+                from_files = runner.invoke(
+                    entrypoint, ["--no-cache", "--tag", "foobar"]
+                )
+                from_bundle = runner.invoke(
+                    entrypoint, ["--bundle", "forecasts.bundle", "--tag", "foobar"]
+                )
+                combined = runner.invoke(
+                    entrypoint, ["--bundle", "forecasts.bundle", "--format", "csv"]
+                )
+                with open(os.path.join(".forecasts", "6-pert.forecast"), "a") as f:
+                    f.write("\n")
+                stale = runner.invoke(entrypoint, ["--bundle", "forecasts.bundle"])
+            finally:
+                os.chdir(cwd)
+        self.assertEqual(packed.exit_code, 0, packed.output)
+        self.assertIn("Packed 21 forecasts", packed.output)
+        self.assertEqual(from_bundle.exit_code, 0, from_bundle.output)
+        self.assertEqual(from_bundle.output, from_files.output)
+        self.assertNotEqual(combined.exit_code, 0)
+        self.assertNotEqual(stale.exit_code, 0)
+        self.assertIn("is stale", stale.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
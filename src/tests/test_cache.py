@@ -0,0 +1,88 @@
+import datetime
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import forecast.cache as cache
+from forecast.cache import ForecastCache
+from forecast.loader import load_file, load_files
+
+PERT = "---\nscenario: pert\nend_date: 2024-01-01\ntype: pert\nmin: 1\nmode: 5\nmax: 10\noutcome: 4\n---\n"
+CHOICE = "---\nscenario: choice\nend_date: 2024-01-01\ntype: choice\noptions:\n  1: 0.7\n  2: 0.3\noutcome: 1\n---\n"
+
+
+class TestForecastCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.write("pert.forecast", PERT)
+        self.write("choice.forecast", CHOICE)
+        self.filenames = ["pert.forecast", "choice.forecast"]
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def write(self, filename: str, text: str) -> None:
+        with open(os.path.join(self.dir.name, filename), "w") as f:
+            f.write(text)
+
+    def warm(self) -> None:
+        c = ForecastCache(self.dir.name)
+        list(load_files(self.dir.name, self.filenames, 1, c))
+        c.save()
+
+    def test_warm_run_does_not_parse(self) -> None:
+        self.warm()
+        cold = list(load_files(self.dir.name, self.filenames, 1))
+        with mock.patch("forecast.loader.load_file") as load_file:
+            warm = list(
+                load_files(
+                    self.dir.name, self.filenames, 1, ForecastCache(self.dir.name)
+                )
+            )
+            load_file.assert_not_called()
+        self.assertEqual([r[:4] for r in cold], [r[:4] for r in warm])
+        self.assertEqual(warm[0].metadata["end_date"], datetime.date(2024, 1, 1))
+        self.assertEqual(warm[1].metadata["options"], {1: 0.7, 2: 0.3})
+
+    def test_modified_file_is_reloaded(self) -> None:
+        self.warm()
+        self.write("pert.forecast", PERT.replace("outcome: 4", "outcome: 9 "))
+        c = ForecastCache(self.dir.name)
+        self.assertIsNone(c.get("pert.forecast"))
+        self.assertIsNotNone(c.get("choice.forecast"))
+
+    def test_put_keeps_the_fingerprint_it_loaded(self) -> None:
+        result = load_file(self.dir.name, "pert.forecast")
+        # Edited after the worker read it, before the parent stores the result
+        self.write("pert.forecast", PERT.replace("outcome: 4", "outcome: 9 "))
+        c = ForecastCache(self.dir.name)
+        c.put(result)
+        self.assertIsNone(c.get("pert.forecast"))
+        c.put(load_file(self.dir.name, "pert.forecast"))
+        self.assertEqual(c.get("pert.forecast").metadata["outcome"], 9)
+
+    def test_touched_file_hits_by_content_hash(self) -> None:
+        self.warm()
+        path = os.path.join(self.dir.name, "pert.forecast")
+        os.utime(path, ns=(0, 0))
+        self.assertIsNotNone(ForecastCache(self.dir.name).get("pert.forecast"))
+
+    def test_scoring_change_invalidates(self) -> None:
+        self.warm()
+        with mock.patch.object(cache, "scoring_fingerprint", return_value="changed"):
+            self.assertEqual(ForecastCache(self.dir.name).entries, {})
+
+    def test_prune_evicts_deleted_and_excess(self) -> None:
+        self.warm()
+        c = ForecastCache(self.dir.name)
+        c.prune(["choice.forecast"])
+        self.assertEqual(list(c.entries), ["choice.forecast"])
+        c.max_entries = 0
+        c.prune(["choice.forecast"])
+        self.assertEqual(c.entries, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
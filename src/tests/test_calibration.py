@@ -0,0 +1,132 @@
+import random
+import statistics
+import unittest
+
+from forecast.calibration import Calibration, Moments, calibration_report
+from forecast.factory import create_forecast
+from forecast.header import Metadata
+
+
+def make(type: str, tags: list = [""], **fields: object) -> object:
+    metadata = {"scenario": "s", "end_date": "2024-01-01", "type": type, "tags": tags}
+    metadata.update(fields)
+    return create_forecast(Metadata(metadata))
+
+
+class TestMoments(unittest.TestCase):
+
+    def setUp(self) -> None:
+        rng = random.Random(1)
+        self.pairs = [(rng.random(), float(rng.random() < 0.3)) for _ in range(500)]
+
+    def test_matches_statistics(self) -> None:
+        m = Moments()
+        for x, y in self.pairs:
+            m.add(x, y)
+        xs, ys = zip(*self.pairs)
+        self.assertEqual(m.n, 500)
+        self.assertAlmostEqual(m.mean_x, statistics.fmean(xs))
+        self.assertAlmostEqual(m.var_x, statistics.pvariance(xs))
+        mean_y = statistics.fmean(ys)
+        cov = sum((x - m.mean_x) * (y - mean_y) for x, y in self.pairs) / 500
+        self.assertAlmostEqual(m.cov_xy, cov)
+
+    def test_merge_matches_one_pass(self) -> None:
+        whole, left, right = Moments(), Moments(), Moments()
+        for i, (x, y) in enumerate(self.pairs):
+            whole.add(x, y)
+            (left if i % 3 else right).add(x, y)
+        left.merge(right)
+        self.assertEqual(left.n, whole.n)
+        for field in ("mean_x", "mean_y", "m2_x", "m2_y", "c_xy"):
+            self.assertAlmostEqual(getattr(left, field), getattr(whole, field))
+
+
+class TestCalibration(unittest.TestCase):
+
+    def test_decomposition(self) -> None:
+        rng = random.Random(2)
+        events = []
+        for _ in range(2000):
+            p = rng.random()
+            events.append((p, float(rng.random() < p**1.5)))
+        calibration = Calibration(10)
+        for p, o in events:
+            calibration.add(p, o)
+        d = calibration.decomposition()
+
+        n = len(events)
+        base_rate = sum(o for _, o in events) / n
+        bins: dict = {}
+        for p, o in events:
+            bins.setdefault(min(int(p * 10), 9), []).append((p, o))
+        reliability = resolution = 0.0
+        for members in bins.values():
+            mean_p = sum(p for p, _ in members) / len(members)
+            mean_o = sum(o for _, o in members) / len(members)
+            reliability += len(members) * (mean_p - mean_o) ** 2 / n
+            resolution += len(members) * (mean_o - base_rate) ** 2 / n
+
+        self.assertEqual(d.count, n)
+        self.assertAlmostEqual(d.brier, sum((p - o) ** 2 for p, o in events) / n)
+        self.assertAlmostEqual(d.reliability, reliability)
+        self.assertAlmostEqual(d.resolution, resolution)
+        self.assertAlmostEqual(d.uncertainty, base_rate * (1 - base_rate))
+        self.assertAlmostEqual(
+            d.brier, d.reliability - d.resolution + d.uncertainty + d.within_bin
+        )
+
+    def test_reliability_table(self) -> None:
+        calibration = Calibration(4)
+        for p, o in ((0.1, 0), (0.2, 1), (1.0, 1)):
+            calibration.add(p, o)
+        rows = calibration.reliability_table()
+        self.assertEqual([(r.low, r.count) for r in rows], [(0.0, 2), (0.75, 1)])
+        self.assertAlmostEqual(rows[0].mean_forecast, 0.15)
+        self.assertAlmostEqual(rows[0].observed, 0.5)
+        self.assertAlmostEqual(rows[0].forecast_std, 0.05)
+
+
+class TestCalibrationReport(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.forecasts = [
+            make("choice", ["a"], options={"x": 0.8, "y": 0.2}, outcome="x"),
+            make("choice", ["a", "b"], options={"x": 0.3, "y": 0.7}, outcome="x"),
+            make("interval", min=1, max=10, confidence=0.9, outcome=5),
+            make("interval", min=1, max=10, confidence=0.9, outcome=50),
+            make("interval", min=1, max=10, confidence=0.5, outcome=5),
+            make("interval", min=1, max=10, confidence=0.5),
+            make("pert", min=1, mode=2, max=3, outcome=2),
+            make("choice", options={"x": 0.5, "y": 0.5}, outcome="z"),
+        ]
+
+    def test_report(self) -> None:
+        report = calibration_report(self.forecasts)
+        self.assertEqual(report.forecasts, 5)
+        self.assertEqual(report.skipped, 1)
+        self.assertEqual(report.overall.count, 7)
+        self.assertEqual(report.by_tag["a"].count, 4)
+        self.assertEqual(report.by_tag["b"].count, 2)
+        self.assertEqual(report.by_tag[""].count, 3)
+        self.assertEqual(
+            [(c.confidence, c.count, c.hits) for c in report.interval_coverage()],
+            [(0.5, 1, 1), (0.9, 2, 1)],
+        )
+        self.assertAlmostEqual(report.interval_coverage()[1].coverage, 0.5)
+        # Per event Brier: the choices and intervals as binary events
+        expected = (0.2**2 + 0.2**2 + 0.7**2 + 0.7**2 + 0.1**2 + 0.9**2 + 0.5**2) / 7
+        self.assertAlmostEqual(report.overall.decomposition().brier, expected)
+
+    def test_merge_matches_one_pass(self) -> None:
+        whole = calibration_report(self.forecasts)
+        merged = calibration_report(self.forecasts[:3])
+        merged.merge(calibration_report(self.forecasts[3:]))
+        self.assertEqual(merged.forecasts, whole.forecasts)
+        self.assertEqual(merged.coverage, whole.coverage)
+        self.assertEqual(merged.overall.decomposition(), whole.overall.decomposition())
+        self.assertEqual(sorted(merged.by_tag), sorted(whole.by_tag))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from forecast.discovery import compile_rule, discover
+
+
+class TestRules(unittest.TestCase):
+
+    def test_unanchored_matches_any_depth(self) -> None:
+        rule = compile_rule("*.draft.forecast")
+        self.assertTrue(rule.regex.fullmatch("a.draft.forecast"))
+        self.assertTrue(rule.regex.fullmatch("x/y/a.draft.forecast"))
+        self.assertFalse(rule.regex.fullmatch("x/a.forecast"))
+
+    def test_anchored(self) -> None:
+        rule = compile_rule("/team/*.forecast")
+        self.assertTrue(rule.regex.fullmatch("team/a.forecast"))
+        self.assertFalse(rule.regex.fullmatch("other/team/a.forecast"))
+        self.assertFalse(rule.regex.fullmatch("team/x/a.forecast"))
+
+    def test_double_star(self) -> None:
+        rule = compile_rule("team/**/a.forecast")
+        self.assertTrue(rule.regex.fullmatch("team/a.forecast"))
+        self.assertTrue(rule.regex.fullmatch("team/x/y/a.forecast"))
+        self.assertTrue(compile_rule("team/**").regex.fullmatch("team/x/a.forecast"))
+
+    def test_flags(self) -> None:
+        rule = compile_rule("!build/")
+        self.assertTrue(rule.negate)
+        self.assertTrue(rule.dir_only)
+        self.assertTrue(compile_rule("[!a]b").regex.fullmatch("cb"))
+        self.assertFalse(compile_rule("[!a]b").regex.fullmatch("ab"))
+
+
+class TestDiscover(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.root = self.dir.name
+        for path in (
+            "a.forecast",
+            "notes.md",
+            "team-a/.forecasts/b.forecast",
+            "team-a/.forecasts/drafts/c.forecast",
+            "team-b/.forecasts/d.forecast",
+            "team-b/.forecasts/e.draft.forecast",
+            "team-b/build/f.forecast",
+            ".git/g.forecast",
+        ):
+            self.write(path, "")
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def write(self, path: str, text: str) -> None:
+        path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def found(self, **kwargs: object) -> list:
+        return sorted(discover(self.root, **kwargs))
+
+    def test_recursive(self) -> None:
+        self.assertEqual(
+            self.found(),
+            [
+                "a.forecast",
+                "team-a/.forecasts/b.forecast",
+                "team-a/.forecasts/drafts/c.forecast",
+                "team-b/.forecasts/d.forecast",
+                "team-b/.forecasts/e.draft.forecast",
+                "team-b/build/f.forecast",
+            ],
+        )
+
+    def test_include_and_exclude(self) -> None:
+        self.assertEqual(
+            self.found(include=["team-*/.forecasts/*"], exclude=["*.draft.forecast"]),
+            ["team-a/.forecasts/b.forecast", "team-b/.forecasts/d.forecast"],
+        )
+        self.assertEqual(
+            self.found(exclude=["team-b/", "drafts"]),
+            ["a.forecast", "team-a/.forecasts/b.forecast"],
+        )
+
+    def test_gitignore(self) -> None:
+        self.write(".gitignore", "# comment\nbuild/\n*.draft.forecast\n")
+        self.write("team-a/.forecastignore", "drafts/\n")
+        self.write("team-b/.gitignore", "!e.draft.forecast\n")
+        self.assertEqual(
+            self.found(),
+            [
+                "a.forecast",
+                "team-a/.forecasts/b.forecast",
+                "team-b/.forecasts/d.forecast",
+                "team-b/.forecasts/e.draft.forecast",
+            ],
+        )
+
+    def test_ignored_directory_is_not_listed(self) -> None:
+        self.write(".gitignore", "team-b/\n")
+        with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+            self.found()
+        listed = {os.path.relpath(c.args[0], self.root) for c in scandir.call_args_list}
+        self.assertNotIn("team-b", listed)
+        self.assertNotIn(".git", listed)
+
+    def test_is_lazy(self) -> None:
+        paths = discover(self.root)
+        with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+            next(paths)
+        self.assertEqual(scandir.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import datetime
+import gc
+import pickle
+import unittest
+
+from forecast.factory import create_forecast
+from forecast.header import Metadata
+from forecast.models.forecast import share
+
+FIELDS = {
+    "interval": {"min": 1, "max": 10, "confidence": 0.9, "outcome": 5},
+    "choice": {"options": {"yes": 0.7, "no": 0.3}, "outcome": "yes"},
+    "pert": {"min": 1, "mode": 4, "max": 10, "outcome": 5},
+    "lognormal": {"p5": 2, "p50": 4, "p95": 9, "outcome": 5},
+    "pareto": {"p90": 3, "p99": 8, "outcome": 5},
+}
+
+
+def fresh(text: str) -> str:
+    # An equal string that isn't the same object, as the YAML parser returns
+    return "".join(list(text))
+
+
+def make_metadata(type: str, **extra: object) -> dict:
+    metadata = {
+        "scenario": f"A {type} scenario",
+        "type": fresh(type),
+        "end_date": "2025-01-01",
+        "tags": [fresh("team"), fresh("q3")],
+    }
+    metadata.update(FIELDS[type])
+    metadata.update(extra)
+    return metadata
+
+
+class TestCompactForecasts(unittest.TestCase):
+
+    def test_no_instance_dict(self) -> None:
+        for type in FIELDS:
+            forecast = create_forecast(Metadata(make_metadata(type)))
+            self.assertFalse(hasattr(forecast, "__dict__"), type)
+            with self.assertRaises(AttributeError):
+                forecast.extra = 1
+            self.assertIsNone(forecast.brier)
+            self.assertIsNone(forecast.path)
+            forecast.path = ".forecasts/a.forecast"
+            self.assertEqual(forecast.score(), forecast.calc())
+
+    def test_keeps_no_reference_to_the_post(self) -> None:
+        for type in FIELDS:
+            post = Metadata(make_metadata(type))
+            forecast = create_forecast(post)
+            containers = [post, post.metadata] + [
+                v for v in post.metadata.values() if isinstance(v, (dict, list))
+            ]
+            for referent in gc.get_referents(forecast):
+                self.assertFalse(any(referent is c for c in containers), type)
+
+    def test_equal_values_are_shared(self) -> None:
+        first = create_forecast(Metadata(make_metadata("choice")))
+        second = create_forecast(Metadata(make_metadata("choice")))
+        self.assertEqual(first.tags, ("team", "q3"))
+        self.assertIs(first.tags, second.tags)
+        self.assertIs(first.type, second.type)
+        self.assertIs(first.end_date, second.end_date)
+        self.assertIs(first.option_names, second.option_names)
+        self.assertIs(first.outcome, second.outcome)
+
+    def test_share_keeps_types_apart(self) -> None:
+        self.assertIs(share(True), True)
+        self.assertIs(type(share(1.0)), float)
+        self.assertEqual(share((1, "a")), (1, "a"))
+        date = datetime.date(2025, 1, 1)
+        self.assertIs(share(datetime.date(2025, 1, 1)), share(date))
+
+    def test_tags(self) -> None:
+        for tags, expected in [
+            (None, ("",)),
+            ([], ()),
+            ("solo", ("solo",)),
+            ([2024, "q3"], (2024, "q3")),
+        ]:
+            metadata = make_metadata("pert", tags=tags)
+            self.assertEqual(create_forecast(Metadata(metadata)).tags, expected)
+        metadata = make_metadata("pert")
+        del metadata["tags"]
+        self.assertEqual(create_forecast(Metadata(metadata)).tags, ("",))
+
+    def test_open_forecast_has_no_outcome(self) -> None:
+        metadata = make_metadata("pareto")
+        del metadata["outcome"]
+        forecast = create_forecast(Metadata(metadata))
+        self.assertFalse(hasattr(forecast, "outcome"))
+        with self.assertRaises(ValueError):
+            forecast.calc()
+
+    def test_choice_options(self) -> None:
+        choice = create_forecast(Metadata(make_metadata("choice")))
+        self.assertEqual(choice.options, {"yes": 0.7, "no": 0.3})
+        self.assertEqual(list(choice.option_probs), [0.7, 0.3])
+        self.assertAlmostEqual(choice.calc(), 0.18)
+
+    def test_pickle(self) -> None:
+        for type in FIELDS:
+            forecast = create_forecast(Metadata(make_metadata(type)))
+            forecast.brier = 0.5
+            copy = pickle.loads(pickle.dumps(forecast))
+            self.assertEqual(copy.scenario, forecast.scenario)
+            self.assertEqual(copy.tags, forecast.tags)
+            self.assertEqual(copy.outcome, forecast.outcome)
+            self.assertEqual(copy.score(), 0.5)
+            self.assertEqual(copy.calc(), forecast.calc())
+
+
+if __name__ == "__main__":
+    unittest.main()
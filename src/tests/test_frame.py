@@ -0,0 +1,117 @@
+import io
+import math
+import os
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import forecast.models.math.vectorized as vectorized
+from forecast.forecast import display_forecasts
+from forecast.frame import ForecastFrame
+from forecast.header import Metadata
+from forecast.loader import load_files, to_forecast
+from forecast.models.interval import Interval
+
+FORECASTS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", ".forecasts")
+
+
+class TestForecastFrame(unittest.TestCase):
+
+    def setUp(self) -> None:
+        filenames = sorted(
+            f for f in os.listdir(FORECASTS_DIR) if f.endswith(".forecast")
+        )
+        self.results = list(load_files(FORECASTS_DIR, filenames, jobs=1))
+        self.frame = ForecastFrame.from_results(self.results)
+        self.forecasts = [to_forecast(r) for r in self.results if r.error is None]
+
+    def assertScoresMatchCalc(self, scores) -> None:
+        self.assertEqual(len(scores), len(self.forecasts))
+        for score, forecast in zip(scores, self.forecasts):
+            if hasattr(forecast, "outcome"):
+                self.assertAlmostEqual(score, forecast.calc(), places=10)
+            else:
+                self.assertTrue(math.isnan(score))
+
+    def test_columns(self) -> None:
+        self.assertEqual(len(self.frame), len(self.forecasts))
+        for i, forecast in enumerate(self.forecasts):
+            self.assertEqual(self.frame.scenario[i], forecast.scenario)
+            self.assertEqual(self.frame.type(i), forecast.type)
+            self.assertEqual(self.frame.tags(i), list(forecast.tags))
+            self.assertEqual(self.frame.end_date[i], forecast.end_date.toordinal())
+
+    def test_score_all_matches_calc(self) -> None:
+        self.assertScoresMatchCalc(self.frame.score_all())
+
+    def test_score_all_without_numpy(self) -> None:
+        with mock.patch.object(vectorized, "HAS_NUMPY", False):
+            self.assertScoresMatchCalc(self.frame.score_all())
+
+    def test_score_all_rules_match_models(self) -> None:
+        for rule in ("crps", "log"):
+            for use_numpy in (True, False):
+                with mock.patch.object(vectorized, "HAS_NUMPY", use_numpy):
+                    scores = self.frame.score_all(rule)
+                for score, forecast in zip(scores, self.forecasts):
+                    if hasattr(forecast, "outcome") and rule in forecast.rules:
+                        self.assertAlmostEqual(score, forecast.score(rule), places=10)
+                    else:
+                        self.assertTrue(math.isnan(score))
+
+    def test_unknown_rule(self) -> None:
+        with self.assertRaises(ValueError):
+            self.frame.score_all("spherical")
+
+    def test_invalid_choice_outcome(self) -> None:
+        frame = ForecastFrame()
+        frame.append(
+            "bad.forecast",
+            {
+                "scenario": "bad",
+                "type": "choice",
+                "end_date": "2024-01-01",
+                "options": {"a": 0.5, "b": 0.5},
+                "outcome": "c",
+            },
+        )
+        with self.assertRaises(ValueError):
+            frame.score_all()
+
+    def test_tags_are_read_like_the_forecast(self) -> None:
+        frame = ForecastFrame()
+        for i, tags in enumerate(("work", None, ["a", "b"], ())):
+            metadata = {
+                "scenario": f"tags {i}",
+                "type": "interval",
+                "end_date": "2024-01-01",
+                "min": 1,
+                "max": 2,
+                "confidence": 0.9,
+                "tags": tags,
+            }
+            frame.append(f"{i}.forecast", metadata)
+            self.assertEqual(frame.tags(i), list(Interval(Metadata(metadata)).tags))
+        self.assertEqual(frame.tags(0), ["work"])
+        self.assertEqual(frame.tags(1), [""])
+
+    def test_display_matches_list(self) -> None:
+        forecasts = sorted(self.forecasts, key=lambda x: x.end_date)
+        with redirect_stdout(io.StringIO()) as from_list:
+            display_forecasts(forecasts)
+        with redirect_stdout(io.StringIO()) as from_frame:
+            display_forecasts(self.frame)
+        self.assertEqual(from_list.getvalue(), from_frame.getvalue())
+
+    def test_display_rule_matches_list(self) -> None:
+        forecasts = sorted(self.forecasts, key=lambda x: x.end_date)
+        with redirect_stdout(io.StringIO()) as from_list:
+            display_forecasts(forecasts, "crps")
+        with redirect_stdout(io.StringIO()) as from_frame:
+            display_forecasts(self.frame, "crps")
+        self.assertEqual(from_list.getvalue(), from_frame.getvalue())
+        self.assertIn("CRPS", from_list.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import datetime
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import frontmatter  # type: ignore
+
+from forecast.header import (
+    header_digest,
+    parse_header,
+    read_header,
+    read_header_digest,
+)
+
+
+class TestReadHeader(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def write(self, text: str) -> str:
+        path = os.path.join(self.dir.name, "test.forecast")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_matches_frontmatter(self) -> None:
+        path = self.write(
+            "---\nscenario: test\nend_date: 2025-01-01\ntype: choice\n"
+            "options:\n  yes: 0.6\n  no: 0.4\n---\n\nA long body.\n---\nMore body.\n"
+        )
+        self.assertEqual(read_header(path).metadata, frontmatter.load(path).metadata)
+        self.assertEqual(
+            read_header(path).metadata["end_date"], datetime.date(2025, 1, 1)
+        )
+
+    def test_body_is_not_parsed(self) -> None:
+        path = self.write("---\nscenario: test\n---\n: this is not: valid: yaml\n")
+        self.assertEqual(read_header(path).metadata, {"scenario": "test"})
+
+    def test_empty_header(self) -> None:
+        path = self.write("---\n---\nbody\n")
+        self.assertEqual(read_header(path).metadata, {})
+
+    def test_falls_back_without_header(self) -> None:
+        path = self.write("just some markdown\n")
+        self.assertEqual(read_header(path).metadata, {})
+
+    def test_falls_back_on_unterminated_header(self) -> None:
+        path = self.write("---\nscenario: test\n")
+        self.assertEqual(read_header(path).metadata, frontmatter.load(path).metadata)
+
+    def test_parse_header_matches_read_header(self) -> None:
+        text = "---\nscenario: test\nend_date: 2025-01-01\n---\nbody\n"
+        path = self.write(text)
+        self.assertEqual(
+            parse_header(text.encode()).metadata, read_header(path).metadata
+        )
+        self.assertEqual(parse_header(b"just some markdown\n").metadata, {})
+
+    def test_digest_covers_the_header(self) -> None:
+        path = self.write("---\nscenario: test\n---\nbody\n")
+        digest = header_digest(path)
+        with open(path, "rb") as f:
+            self.assertEqual(read_header_digest(f)[1], digest)
+        self.write("---\nscenario: test\n---\nanother body\n")
+        self.assertEqual(header_digest(path), digest)
+        self.write("---\nscenario: edited\n---\nbody\n")
+        self.assertNotEqual(header_digest(path), digest)
+
+    def test_digest_without_header_covers_the_file(self) -> None:
+        path = self.write("just some markdown\n")
+        digest = header_digest(path)
+        with open(path, "rb") as f:
+            self.assertEqual(read_header_digest(f), (mock.ANY, digest))
+        self.write("just other markdown\n")
+        self.assertNotEqual(header_digest(path), digest)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+from forecast import history
+from forecast.history import GitError, forecast_history
+
+OPEN = "---\nscenario: s\nend_date: 2999-01-01\ntype: interval\nmin: 1\nmax: 10\nconfidence: 0.9\n---\n"
+CLOSED = "---\nscenario: s\nend_date: 2020-01-01\ntype: interval\nmin: 1\nmax: 10\nconfidence: 0.9\noutcome: 5\n---\n"
+OVERDUE = "---\nscenario: s\nend_date: 2020-01-01\ntype: interval\nmin: 1\nmax: 10\nconfidence: 0.9\n---\n"
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class TestForecastHistory(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.repo = self.dir.name
+        self.forecast_dir = os.path.join(self.repo, "sub", ".forecasts")
+        self.git("init", "-q")
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def git(self, *args: str) -> None:
+        env = dict(
+            os.environ,
+            GIT_AUTHOR_NAME="test",
+            GIT_AUTHOR_EMAIL="test@example.com",
+            GIT_COMMITTER_NAME="test",
+            GIT_COMMITTER_EMAIL="test@example.com",
+        )
+        subprocess.run(["git", *args], cwd=self.repo, env=env, check=True)
+
+    def commit(self, files: dict, message: str = "update") -> None:
+        for name, text in files.items():
+            path = os.path.join(self.forecast_dir, name)
+            if text is None:
+                os.remove(path)
+                continue
+            os.makedirs(self.forecast_dir, exist_ok=True)
+            with open(path, "w") as f:
+                f.write(text)
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", message)
+
+    def test_timeline(self) -> None:
+        self.commit({"a.forecast": OPEN, "b.forecast": OVERDUE})
+        with open(os.path.join(self.repo, "unrelated.txt"), "w") as f:
+            f.write("not a forecast")
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", "unrelated")
+        self.commit({"b.forecast": CLOSED})
+        self.commit({"a.forecast": None, "notes.md": "ignored"})
+
+        points = list(forecast_history(self.forecast_dir))
+        self.assertEqual(len(points), 3)
+        statuses = [{r.filename: p.status(r) for r in p.results} for p in points]
+        self.assertEqual(
+            statuses,
+            [
+                {"a.forecast": "Open", "b.forecast": "Overdue"},
+                {"a.forecast": "Open", "b.forecast": "Closed"},
+                {"b.forecast": "Closed"},
+            ],
+        )
+        self.assertIsNone(points[0].mean_score())
+        self.assertAlmostEqual(points[2].mean_score(), 0.02)
+
+    def test_blobs_are_parsed_once(self) -> None:
+        self.commit({"a.forecast": OPEN, "b.forecast": OVERDUE})
+        self.commit({"b.forecast": CLOSED})
+        self.commit({"c.forecast": OPEN})
+        with mock.patch.object(
+            history, "parse_header", wraps=history.parse_header
+        ) as parse:
+            points = list(forecast_history(self.forecast_dir))
+        # OPEN, OVERDUE and CLOSED are the only distinct contents
+        self.assertEqual(parse.call_count, 3)
+        self.assertEqual(
+            [r.filename for r in points[-1].results],
+            ["a.forecast", "b.forecast", "c.forecast"],
+        )
+
+    def test_broken_file_is_reported(self) -> None:
+        self.commit({"a.forecast": "---\nscenario: [unterminated\n---\n"})
+        (point,) = forecast_history(self.forecast_dir)
+        self.assertEqual(point.status(point.results[0]), "Error")
+
+    def test_unscorable_outcome_is_closed(self) -> None:
+        self.commit({"a.forecast": CLOSED.replace("outcome: 5", "outcome: abc")})
+        self.commit({"b.forecast": CLOSED})
+        first, second = forecast_history(self.forecast_dir)
+        self.assertEqual(first.status(first.results[0]), "Closed")
+        self.assertIsNone(first.results[0].score)
+        self.assertIsNone(first.mean_score())
+        self.assertAlmostEqual(second.mean_score(), 0.02)
+
+    def test_outside_git(self) -> None:
+        shutil.rmtree(os.path.join(self.repo, ".git"))
+        os.makedirs(self.forecast_dir)
+        with mock.patch.dict(os.environ, {"GIT_CEILING_DIRECTORIES": self.repo}):
+            with self.assertRaises(GitError):
+                list(forecast_history(self.forecast_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,215 @@
+import datetime
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from click.testing import CliRunner
+
+import forecast
+import forecast.index as index
+import forecast.loader as loader
+from forecast.forecast import entrypoint, parse_days
+from forecast.index import ForecastIndex
+
+TODAY = datetime.date.today()
+
+
+def forecast_text(
+    scenario: str, type: str, tags: list, end_date: datetime.date, closed: bool
+) -> str:
+    fields = {
+        "interval": "min: 1\nmax: 10\nconfidence: 0.9\n",
+        "pert": "min: 1\nmode: 5\nmax: 10\n",
+    }[type]
+    outcome = "outcome: 5\n" if closed else ""
+    return (
+        f"---\nscenario: {scenario}\nend_date: {end_date.isoformat()}\ntype: {type}\n"
+        f"tags: {tags}\n{fields}{outcome}---\n"
+    )
+
+
+FORECASTS = {
+    "soon.forecast": (
+        "soon",
+        "interval",
+        ["infra"],
+        TODAY + datetime.timedelta(3),
+        False,
+    ),
+    "later.forecast": (
+        "later",
+        "pert",
+        ["infra"],
+        TODAY + datetime.timedelta(60),
+        False,
+    ),
+    "late.forecast": ("late", "pert", ["ops"], TODAY - datetime.timedelta(5), False),
+    "done.forecast": ("done", "interval", ["ops"], TODAY - datetime.timedelta(5), True),
+}
+
+
+class IndexTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        for name, args in FORECASTS.items():
+            self.write(name, forecast_text(*args))
+        self.write("broken.forecast", "---\nscenario: broken\n---\n")
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def write(self, filename: str, text: str) -> None:
+        with open(os.path.join(self.dir.name, filename), "w") as f:
+            f.write(text)
+
+    def filenames(self) -> list:
+        return sorted(f for f in os.listdir(self.dir.name) if f.endswith(".forecast"))
+
+
+class TestForecastIndex(IndexTestCase):
+
+    def test_select(self) -> None:
+        idx = ForecastIndex(self.dir.name)
+        idx.refresh(self.filenames())
+        self.assertEqual(
+            idx.select(type="pert"),
+            {"later.forecast", "late.forecast", "broken.forecast"},
+        )
+        self.assertEqual(
+            idx.select(type="pert", tag="infra"), {"later.forecast", "broken.forecast"}
+        )
+        self.assertEqual(
+            idx.select(end_before=TODAY + datetime.timedelta(14), closed=False),
+            {"soon.forecast", "late.forecast", "broken.forecast"},
+        )
+        self.assertEqual(
+            idx.select(end_after=TODAY, end_before=TODAY + datetime.timedelta(60)),
+            {"soon.forecast", "later.forecast", "broken.forecast"},
+        )
+
+    def test_refresh_only_reads_changed_files(self) -> None:
+        idx = ForecastIndex(self.dir.name)
+        idx.refresh(self.filenames())
+        idx.save()
+
+        self.write("soon.forecast", forecast_text("soon", "pert", ["x"], TODAY, False))
+        os.remove(os.path.join(self.dir.name, "done.forecast"))
+        with mock.patch.object(
+            index, "read_fingerprinted", wraps=index.read_fingerprinted
+        ) as read:
+            idx = ForecastIndex(self.dir.name)
+            idx.refresh(self.filenames())
+        read.assert_called_once()
+        self.assertEqual(idx.entries["soon.forecast"].type, "pert")
+        self.assertNotIn("done.forecast", idx.entries)
+
+    def test_warm_index_reads_no_headers(self) -> None:
+        idx = ForecastIndex(self.dir.name)
+        idx.refresh(self.filenames())
+        idx.save()
+        with mock.patch.object(index, "read_fingerprinted") as read:
+            idx = ForecastIndex(self.dir.name)
+            idx.refresh(self.filenames())
+            idx.save()
+        read.assert_not_called()
+        self.assertFalse(idx.dirty)
+
+    def test_filtered_run_only_opens_matches(self) -> None:
+        list(forecast.iter_forecasts(self.dir.name, use_cache=True, type="pert"))
+        self.write("new.forecast", forecast_text("new", "interval", [], TODAY, False))
+        with mock.patch.object(loader, "load_file", wraps=loader.load_file) as load:
+            items = list(
+                forecast.iter_forecasts(self.dir.name, use_cache=True, type="pert")
+            )
+        # Cached pert forecasts aren't reloaded; only the invalid file is
+        self.assertEqual([c.args[1] for c in load.call_args_list], ["broken.forecast"])
+        self.assertEqual(
+            sorted(
+                i.scenario for i in items if not isinstance(i, forecast.ForecastError)
+            ),
+            ["late", "later"],
+        )
+
+    def test_cold_filtered_run_parses_each_file_once(self) -> None:
+        read = loader.read_header_digest
+        parsed = []
+
+        def spy(f):
+            parsed.append(os.path.basename(f.name))
+            return read(f)
+
+        with mock.patch.object(loader, "read_header_digest", spy):
+            items = list(
+                forecast.iter_forecasts(self.dir.name, use_cache=True, type="pert")
+            )
+        # Invalid files are read again to report the error, as they never cache
+        self.assertEqual(sorted(set(parsed)), self.filenames())
+        self.assertEqual(len(parsed), len(self.filenames()) + 1)
+        self.assertEqual(
+            sorted(
+                i.scenario for i in items if not isinstance(i, forecast.ForecastError)
+            ),
+            ["late", "later"],
+        )
+        # What the index read is cached, so the next run parses nothing valid
+        with mock.patch.object(loader, "load_file", wraps=loader.load_file) as load:
+            list(forecast.iter_forecasts(self.dir.name, use_cache=True, type="pert"))
+        self.assertEqual([c.args[1] for c in load.call_args_list], ["broken.forecast"])
+
+
+class TestDue(IndexTestCase):
+
+    def test_due_is_served_from_the_index(self) -> None:
+        with mock.patch.object(loader, "load_file") as load:
+            result = CliRunner().invoke(
+                entrypoint, ["due", "--within", "2w", "--root", self.dir.name]
+            )
+        load.assert_not_called()
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("soon", result.output)
+        self.assertIn("late", result.output)
+        self.assertNotIn("later", result.output)
+        self.assertNotIn("done", result.output)
+        self.assertIn(
+            "[ERROR] Failed to load forecast from 'broken.forecast'", result.output
+        )
+
+    def test_invalid_forecasts_are_errors(self) -> None:
+        text = forecast_text("nomin", "pert", [], TODAY, False)
+        self.write("nomin.forecast", text.replace("min: 1\n", ""))
+        result = CliRunner().invoke(entrypoint, ["due", "--root", self.dir.name])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn(
+            "[ERROR] Failed to load forecast from 'nomin.forecast'", result.output
+        )
+        self.assertNotIn("nomin ", result.output)
+
+    def test_discovery_options(self) -> None:
+        os.mkdir(os.path.join(self.dir.name, "archive"))
+        with open(os.path.join(self.dir.name, "archive", "old.forecast"), "w") as f:
+            f.write(forecast_text("archived", "pert", [], TODAY, False))
+        runner = CliRunner()
+        args = ["due", "--root", self.dir.name, "--no-cache"]
+        every = runner.invoke(entrypoint, args)
+        some = runner.invoke(
+            entrypoint, args + ["--exclude", "archive", "--exclude", "b*"]
+        )
+        only = runner.invoke(entrypoint, args + ["--include", "archive/*"])
+        self.assertIn("archived", every.output)
+        self.assertNotIn("archived", some.output)
+        self.assertNotIn("broken", some.output)
+        self.assertIn("soon", some.output)
+        self.assertIn("archived", only.output)
+        self.assertNotIn("soon", only.output)
+        self.assertFalse(os.path.exists(os.path.join(self.dir.name, ".cache")))
+
+    def test_parse_days(self) -> None:
+        self.assertEqual(parse_days("14d"), 14)
+        self.assertEqual(parse_days("2w"), 14)
+        self.assertEqual(parse_days("3"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import forecast
+import forecast.loader as loader
+
+FORECASTS = {
+    "choice.forecast": "---\nscenario: choice\nend_date: 2024-01-01\ntype: choice\noptions:\n  a: 0.7\n  b: 0.3\noutcome: a\n---\n",
+    "pert.forecast": "---\nscenario: pert\nend_date: 2024-01-01\ntype: pert\nmin: 1\nmode: 5\nmax: 10\noutcome: 4\n---\n",
+    "open.forecast": "---\nscenario: open\nend_date: 2024-01-01\ntype: interval\nmin: 1\nmax: 10\nconfidence: 0.9\n---\n",
+    "broken.forecast": "---\nscenario: broken\nend_date: 2024-01-01\ntype: pert\nmin: 1\n---\n",
+}
+
+
+class TestLoader(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.filenames = []
+        for i in range(10):
+            for name, text in FORECASTS.items():
+                filename = f"{i}-{name}"
+                with open(os.path.join(self.dir.name, filename), "w") as f:
+                    f.write(text)
+                self.filenames.append(filename)
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def test_load_file_scores_closed_forecast(self) -> None:
+        result = loader.load_file(self.dir.name, "0-choice.forecast")
+        self.assertIsNone(result.error)
+        self.assertAlmostEqual(result.score, 0.18)
+
+    def test_load_file_reports_error(self) -> None:
+        result = loader.load_file(self.dir.name, "0-broken.forecast")
+        self.assertIsNone(result.metadata)
+        self.assertIsNotNone(result.error)
+
+    def test_open_forecast_is_unscored(self) -> None:
+        result = loader.load_file(self.dir.name, "0-open.forecast")
+        self.assertIsNone(result.score)
+        self.assertIsNone(result.error)
+
+    def test_parallel_matches_serial(self) -> None:
+        serial = list(loader.load_files(self.dir.name, self.filenames, jobs=1))
+        with mock.patch.object(loader, "CHUNK_SIZE", 3):
+            parallel = list(loader.load_files(self.dir.name, self.filenames, jobs=2))
+        self.assertEqual([r[:4] for r in serial], [r[:4] for r in parallel])
+        self.assertEqual(
+            [(r.forecast.scenario, r.forecast.brier) for r in serial if r.forecast],
+            [(r.forecast.scenario, r.forecast.brier) for r in parallel if r.forecast],
+        )
+
+    def test_to_forecast_keeps_score(self) -> None:
+        result = loader.load_file(self.dir.name, "0-pert.forecast")
+        forecast = loader.to_forecast(result)
+        self.assertEqual(forecast.brier, result.score)
+        self.assertEqual(forecast.score(), forecast.calc())
+        rebuilt = loader.to_forecast(result._replace(forecast=None))
+        self.assertEqual(rebuilt.brier, result.score)
+
+    def test_forecast_is_built_once(self) -> None:
+        with mock.patch.object(
+            loader, "create_forecast", wraps=loader.create_forecast
+        ) as create:
+            result = loader.load_file(self.dir.name, "0-pert.forecast", False)
+            self.assertIs(loader.to_forecast(result), result.forecast)
+        self.assertEqual(create.call_count, 1)
+        self.assertIsNone(result.metadata)
+
+
+class TestIterForecasts(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        for name, text in FORECASTS.items():
+            with open(os.path.join(self.dir.name, name), "w") as f:
+                f.write(text)
+        with open(os.path.join(self.dir.name, "yaml.forecast"), "w") as f:
+            f.write("---\nscenario: [unterminated\n---\n")
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def test_yields_forecasts_and_errors(self) -> None:
+        items = list(forecast.iter_forecasts(self.dir.name))
+        errors = sorted(
+            i.filename for i in items if isinstance(i, forecast.ForecastError)
+        )
+        scenarios = sorted(
+            i.scenario for i in items if not isinstance(i, forecast.ForecastError)
+        )
+        self.assertEqual(errors, ["broken.forecast", "yaml.forecast"])
+        self.assertEqual(scenarios, ["choice", "open", "pert"])
+
+    def test_filters(self) -> None:
+        items = forecast.iter_forecasts(self.dir.name, type="pert")
+        self.assertEqual(
+            [i.scenario for i in items if not isinstance(i, forecast.ForecastError)],
+            ["pert"],
+        )
+
+    def test_is_lazy(self) -> None:
+        with mock.patch.object(loader, "load_file", wraps=loader.load_file) as load:
+            items = forecast.iter_forecasts(self.dir.name)
+            self.assertEqual(load.call_count, 0)
+            next(items)
+            self.assertEqual(load.call_count, 1)
+            items.close()
+
+    def test_several_roots(self) -> None:
+        with tempfile.TemporaryDirectory() as other:
+            os.makedirs(os.path.join(other, "nested"))
+            with open(os.path.join(other, "nested", "x.forecast"), "w") as f:
+                f.write(FORECASTS["pert.forecast"])
+            items = list(
+                forecast.iter_forecasts([self.dir.name, other], include=["nested/*"])
+            )
+        self.assertEqual(
+            [i.path for i in items], [os.path.join(other, "nested/x.forecast")]
+        )
+
+    def test_empty_directory(self) -> None:
+        with tempfile.TemporaryDirectory() as empty:
+            self.assertEqual(list(forecast.iter_forecasts(empty)), [])
+
+    def test_cache_is_saved(self) -> None:
+        list(forecast.iter_forecasts(self.dir.name, use_cache=True))
+        with mock.patch.object(loader, "load_file", wraps=loader.load_file) as load:
+            items = list(forecast.iter_forecasts(self.dir.name, use_cache=True))
+        # Only the invalid files are loaded again
+        self.assertEqual(load.call_count, 2)
+        self.assertEqual(len(items), 5)
+
+    def test_cold_cached_run_reads_only_headers(self) -> None:
+        sizes = {}
+        for name, text in FORECASTS.items():
+            with open(os.path.join(self.dir.name, name), "w") as f:
+                f.write(text + "A long write-up.\n" * 10_000)
+            sizes[name] = os.path.getsize(os.path.join(self.dir.name, name))
+        read = loader.read_header_digest
+        consumed = {}
+
+        def spy(f):
+            result = read(f)
+            consumed[os.path.basename(f.name)] = f.tell()
+            return result
+
+        with mock.patch.object(loader, "read_header_digest", spy):
+            list(forecast.iter_forecasts(self.dir.name, use_cache=True))
+        self.assertEqual(set(consumed), set(sizes))
+        for name, size in sizes.items():
+            self.assertLess(consumed[name], size // 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import pickle
+import unittest
+from unittest import mock
+
+from forecast.factory import create_forecast
+from forecast.header import Metadata
+from forecast.models.math import fitted
+from forecast.models.math.lognormal import LogNormal
+from forecast.models.math.pareto import Pareto
+from forecast.models.math.PERT import PERT
+
+
+class TestFitted(unittest.TestCase):
+
+    def setUp(self) -> None:
+        fitted.cache_clear()
+        self.addCleanup(fitted.cache_clear)
+
+    def test_equal_parameters_share_one_distribution(self) -> None:
+        first = fitted.pert(1, 4, 10)
+        self.assertIs(fitted.pert(1.0, 4.0, 10.0), first)
+        self.assertIsNot(fitted.pert(1, 5, 10), first)
+        info = fitted.cache_info()["pert"]
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 2, 2))
+
+    def test_matches_direct_construction(self) -> None:
+        for cached, direct in [
+            (fitted.pert(1, 4, 10), PERT(1, 4, 10)),
+            (fitted.lognormal(2, 4, 9), LogNormal(2, 4, 9)),
+            (fitted.pareto(3, 8), Pareto(3, 8)),
+        ]:
+            for x in (0.5, 3, 4.5, 9):
+                self.assertEqual(cached.cdf(x), direct.cdf(x))
+                self.assertEqual(
+                    cached.pdf_to_probability(x), direct.pdf_to_probability(x)
+                )
+
+    def test_cache_is_bounded(self) -> None:
+        for i in range(fitted.CACHE_SIZE + 10):
+            fitted.pareto(1, 2 + i)
+        info = fitted.cache_info()["pareto"]
+        self.assertEqual(info.currsize, fitted.CACHE_SIZE)
+        self.assertEqual(info.maxsize, fitted.CACHE_SIZE)
+
+    def test_invalid_parameters_raise_every_time(self) -> None:
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                fitted.lognormal(5, 4, 9)
+
+    def test_immutable(self) -> None:
+        dist = fitted.pert(1, 4, 10)
+        with self.assertRaises(AttributeError):
+            dist.alpha = 2
+        with self.assertRaises(AttributeError):
+            del dist.xmin
+        with self.assertRaises(AttributeError):
+            dist.extra = 1
+        self.assertFalse(hasattr(dist, "__dict__"))
+
+    def test_pickle_and_repr(self) -> None:
+        for dist in (PERT(1, 4, 10), LogNormal(2, 4, 9), Pareto(3, 8)):
+            copy = pickle.loads(pickle.dumps(dist))
+            self.assertEqual(repr(copy), repr(dist))
+            self.assertEqual(copy.cdf(5), dist.cdf(5))
+        self.assertEqual(repr(PERT(1, 4, 10)), "PERT(xmin=1, mode=4, xmax=10)")
+
+    def test_templated_forecasts_fit_once(self) -> None:
+        forecasts = [
+            create_forecast(
+                Metadata(
+                    {
+                        "scenario": f"s{i}",
+                        "end_date": "2024-01-01",
+                        "type": "pert",
+                        "min": 1,
+                        "mode": 4,
+                        "max": 10,
+                        "outcome": 3 + i,
+                    }
+                )
+            )
+            for i in range(5)
+        ]
+        with mock.patch("forecast.models.math.PERT.PERT", wraps=PERT) as fit:
+            scores = [f.score() for f in forecasts]
+        self.assertEqual(fit.call_count, 1)
+        self.assertEqual(len(set(scores)), 5)
+        info = fitted.cache_info()["pert"]
+        self.assertEqual((info.hits, info.misses), (4, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import math
+import statistics
+import unittest
+from unittest import mock
+
+import forecast.models.math.vectorized as vectorized
+from forecast.models.math import normal
+from forecast.models.math.lognormal import LogNormal
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:
+    np = None
+
+# Reference quantiles and CDF values, computed to full precision
+PPF = [
+    (1e-300, -37.0470962993612),
+    (1e-100, -21.273453560965322),
+    (1e-20, -9.262340089798409),
+    (1e-10, -6.361340902404056),
+    (1e-05, -4.264890793922825),
+    (0.001, -3.090232306167813),
+    (0.025, -1.9599639845400545),
+    (0.05, -1.6448536269514729),
+    (0.3, -0.5244005127080409),
+    (0.5, 0.0),
+    (0.9, 1.2815515655446004),
+    (0.975, 1.959963984540054),
+    (0.999, 3.090232306167813),
+    (1 - 1e-10, 6.361340889697422),
+]
+CDF = [
+    (-37.5, 4.605353009581954e-308),
+    (-30, 4.906713927147908e-198),
+    (-20, 2.7536241186061556e-89),
+    (-10, 7.61985302416047e-24),
+    (-5, 2.866515718791933e-07),
+    (-1.96, 0.024997895148220435),
+    (-1, 0.15865525393145707),
+    (0, 0.5),
+    (0.5, 0.6914624612740131),
+    (3, 0.9986501019683699),
+    (8, 0.9999999999999993),
+]
+
+
+class TestNormal(unittest.TestCase):
+
+    def assertRelative(self, actual: float, expected: float, tol: float = 1e-12):
+        self.assertLessEqual(abs(actual - expected), tol * max(abs(expected), 1e-300))
+
+    def test_ppf_reference_values(self) -> None:
+        for p, z in PPF:
+            self.assertLessEqual(abs(normal.norm_ppf(p) - z), 1e-12 * max(1, abs(z)))
+
+    def test_ppf_matches_statistics(self) -> None:
+        reference = statistics.NormalDist()
+        for i in range(1, 1000):
+            p = i / 1000
+            self.assertAlmostEqual(
+                normal.norm_ppf(p), reference.inv_cdf(p), delta=1e-12
+            )
+
+    def test_cdf_reference_values_and_tails(self) -> None:
+        for z, p in CDF:
+            self.assertRelative(normal.norm_cdf(z), p)
+            self.assertRelative(normal.norm_sf(-z), p)
+
+    def test_round_trip(self) -> None:
+        for exponent in range(-300, 0, 7):
+            p = 10.0**exponent
+            self.assertRelative(normal.norm_cdf(normal.norm_ppf(p)), p, 1e-11)
+
+    def test_z95(self) -> None:
+        self.assertAlmostEqual(normal.Z95, 1.6448536269514722, delta=1e-15)
+
+    def test_ppf_domain(self) -> None:
+        for p in (0, 1, -0.1, 1.5):
+            with self.assertRaises(ValueError):
+                normal.norm_ppf(p)
+
+
+class TestLogNormalAccuracy(unittest.TestCase):
+
+    def test_fits_its_percentiles(self) -> None:
+        dist = LogNormal(2, 4, 9)
+        self.assertAlmostEqual(dist.ppf(0.5), 4, delta=1e-12)
+        # The fit is symmetric in log space, so p5 and p95 meet at their mean
+        log_spread = (math.log(9) - math.log(2)) / 2
+        self.assertAlmostEqual(
+            math.log(dist.ppf(0.95)), math.log(4) + log_spread, delta=1e-12
+        )
+        self.assertAlmostEqual(dist.cdf(dist.ppf(0.999)), 0.999, delta=1e-12)
+
+    def test_upper_tail_keeps_precision(self) -> None:
+        dist = LogNormal(1, 2, 4)
+        # 1 - 1e-10 isn't representable exactly, so mirror the lower tail instead
+        x = math.exp(dist.mu - dist.sigma * normal.norm_ppf(1e-10))
+        self.assertAlmostEqual(dist.sf(x) / 1e-10, 1, delta=1e-12)
+        self.assertGreater(dist.pdf_to_probability(1e6), 0)
+
+
+class TestNormalBatched(unittest.TestCase):
+
+    def test_python_fallback_matches_scalars(self) -> None:
+        with mock.patch.object(vectorized, "HAS_NUMPY", False):
+            ps = [p for p, _ in PPF]
+            self.assertEqual(vectorized.norm_ppf(ps), [normal.norm_ppf(p) for p in ps])
+            zs = [z for z, _ in CDF]
+            self.assertEqual(vectorized.norm_cdf(zs), [normal.norm_cdf(z) for z in zs])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy_matches_scalars(self) -> None:
+        ps = np.concatenate(
+            [
+                np.logspace(-300, -1, 300),
+                np.linspace(0.01, 0.99, 99),
+                [p for p, _ in PPF],
+            ]
+        )
+        zs = np.linspace(-37, 8, 451)
+        np.testing.assert_allclose(
+            vectorized.norm_ppf(ps), [normal.norm_ppf(p) for p in ps], rtol=1e-14
+        )
+        np.testing.assert_allclose(
+            vectorized.norm_cdf(zs), [normal.norm_cdf(z) for z in zs], rtol=1e-14
+        )
+        with self.assertRaises(ValueError):
+            vectorized.norm_ppf(np.array([0.5, 1.0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+
+from forecast.models.math.PERT import PERT, betainc
+
+# (a, b, x, I_x(a, b)) reference values, from scipy.special.betainc
+TABULATED = [
+    (2.6, 4.4, 0.3, 0.3738621459855044),
+    (1.4, 4.6, 0.05, 0.09798677855344264),
+    (4.6, 1.4, 0.97, 0.9499959507914588),
+    (5, 1, 0.999, 0.995009990004999),
+    (1.0001, 4.9999, 0.5, 0.9687424033850974),
+    (3, 3, 0.2, 0.05792),
+    (2.2, 3.8, 0.75, 0.9758391517794665),
+]
+
+
+class TestBetainc(unittest.TestCase):
+
+    def test_tabulated_values(self) -> None:
+        for a, b, x, expected in TABULATED:
+            self.assertAlmostEqual(betainc(a, b, x), expected, places=13)
+
+    def test_closed_forms(self) -> None:
+        for x in (0.001, 0.1, 0.5, 0.9, 0.999):
+            self.assertAlmostEqual(betainc(1, 1, x), x, places=14)
+            self.assertAlmostEqual(betainc(3, 1, x), x**3, places=14)
+            self.assertAlmostEqual(betainc(1, 3, x), 1 - (1 - x) ** 3, places=14)
+            self.assertAlmostEqual(betainc(2, 2, x), 3 * x**2 - 2 * x**3, places=14)
+
+    def test_symmetry(self) -> None:
+        for a, b, x, _ in TABULATED:
+            self.assertAlmostEqual(
+                betainc(a, b, x), 1 - betainc(b, a, 1 - x), places=13
+            )
+
+    def test_bounds(self) -> None:
+        self.assertEqual(betainc(2, 3, 0), 0.0)
+        self.assertEqual(betainc(2, 3, 1), 1.0)
+
+
+class TestPERT(unittest.TestCase):
+
+    def test_symmetric_median(self) -> None:
+        self.assertAlmostEqual(PERT(0, 5, 10).cdf(5), 0.5, places=14)
+
+    def test_cdf_against_closed_form(self) -> None:
+        # mode at a quarter of the range gives alpha=2, beta=4
+        pert = PERT(0, 2.5, 10)
+        for x in (0.1, 1, 4, 9.9):
+            u = x / 10
+            expected = 1 - (1 - u) ** 5 - 5 * u * (1 - u) ** 4
+            self.assertAlmostEqual(pert.cdf(x), expected, places=14)
+
+    def test_cdf_near_endpoints(self) -> None:
+        pert = PERT(1, 2, 100)
+        self.assertGreater(pert.cdf(1.0001), 0)
+        self.assertAlmostEqual(pert.cdf(99.9999), 1, places=12)
+
+    def test_pdf_integrates_to_cdf(self) -> None:
+        pert = PERT(1, 3, 10)
+        steps = 20000
+        dx = 4 / steps
+        area = sum(pert.pdf(1 + (i + 0.5) * dx) for i in range(steps)) * dx
+        self.assertAlmostEqual(area, pert.cdf(5), places=8)
+
+    def test_pdf_to_probability(self) -> None:
+        pert = PERT(0, 5, 10)
+        self.assertAlmostEqual(
+            pert.pdf_to_probability(5), pert.cdf(5.1) - pert.cdf(4.9), places=15
+        )
+        self.assertAlmostEqual(pert.pdf_to_probability(5), 0.0374900012, places=10)
+
+    def test_ppf_inverts_cdf(self) -> None:
+        for pert in (
+            PERT(0, 5, 10),
+            PERT(1, 1.5, 100),
+            PERT(0, 0, 1),
+            PERT(2, 9.99, 10),
+        ):
+            for p in (1e-9, 0.05, 0.5, 0.95, 1 - 1e-9):
+                self.assertAlmostEqual(pert.cdf(pert.ppf(p)), p, places=9)
+
+    def test_ppf_tolerance_is_in_x(self) -> None:
+        pert = PERT(0, 5, 10)
+        self.assertAlmostEqual(pert.ppf(0.5), 5, places=10)
+        self.assertAlmostEqual(pert.ppf(0.5, tol=1e-3), 5, places=3)
+
+    def test_ppf_rejects_invalid_probability(self) -> None:
+        with self.assertRaises(ValueError):
+            PERT(0, 5, 10).ppf(1)
+        with self.assertRaises(ValueError):
+            PERT(0, 5, 10).ppf_many([0.5, 0])
+
+    def test_ppf_many_matches_ppf(self) -> None:
+        pert = PERT(1, 3, 10)
+        ps = [0.95, 0.05, 0.5, 0.5, 0.25]
+        for x, p in zip(pert.ppf_many(ps), ps):
+            self.assertAlmostEqual(x, pert.ppf(p), places=10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+import math
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from click.testing import CliRunner
+
+import forecast.models.math.vectorized as vectorized
+from forecast.factory import create_forecast
+from forecast.forecast import entrypoint
+from forecast.header import Metadata
+from forecast.models.math.lognormal import LogNormal
+from forecast.models.math.pareto import Pareto
+from forecast.models.math.PERT import PERT
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:
+    np = None
+
+# (distribution, vectorized name, parameters), as in test_math_vectorized
+DISTRIBUTIONS = [
+    (PERT(1, 4, 10), "pert", (1, 4, 10)),
+    (PERT(0, 0, 10), "pert", (0, 0, 10)),
+    (LogNormal(2, 4, 9), "lognormal", (2, 4, 9)),
+    (Pareto(3, 8), "pareto", (3, 8)),
+]
+XS = [-1, 0.5, 1, 2.5, 4, 5, 7.5, 9.99, 10, 12, 50]
+
+
+def simpson(f: object, low: float, high: float, steps: int = 2_000) -> float:
+    h = (high - low) / steps
+    total = f(low) + f(high)
+    for i in range(1, steps):
+        total += f(low + i * h) * (4 if i % 2 else 2)
+    return total * h / 3
+
+
+def numeric_crps(dist: object, x: float, low: float, high: float) -> float:
+    """The CRPS integral over [low, high], split at the outcome where it jumps."""
+    below = simpson(lambda y: dist.cdf(y) ** 2, low, x)
+    return below + simpson(lambda y: (1 - dist.cdf(y)) ** 2, x, high)
+
+
+def make_forecast(**metadata: object) -> object:
+    base = {"scenario": "test", "end_date": "2024-01-01"}
+    return create_forecast(Metadata(dict(base, **metadata)))
+
+
+class TestClosedForms(unittest.TestCase):
+
+    def test_reference_values(self) -> None:
+        # Checked against numerical integration and scipy's log densities
+        for actual, expected in [
+            (PERT(1, 4, 10).crps(4), 0.4502981010054364),
+            (LogNormal(2, 4, 9).crps(4), 0.439408865801687),
+            (Pareto(3, 8).crps(5), 2.733486143158467),
+            (PERT(1, 4, 10).log_score(3), 1.6491716468668018),
+            (LogNormal(2, 4, 9).log_score(5), 1.8648578407529077),
+            (Pareto(3, 8).log_score(10), 6.578215548207604),
+        ]:
+            self.assertAlmostEqual(actual, expected, delta=1e-12)
+
+    def test_pert_crps_matches_integral(self) -> None:
+        dist = PERT(1, 4, 10)
+        for x in (2, 4, 7.5):
+            self.assertAlmostEqual(dist.crps(x), numeric_crps(dist, x, 1, 10), 9)
+
+    def test_outside_the_support(self) -> None:
+        dist = PERT(1, 4, 10)
+        # Beyond the support CRPS grows linearly with the distance to the outcome
+        self.assertAlmostEqual(dist.crps(11) - dist.crps(10), 1, delta=1e-12)
+        self.assertAlmostEqual(dist.crps(0) - dist.crps(1), 1, delta=1e-12)
+        self.assertEqual(dist.log_score(0), math.inf)
+        self.assertEqual(dist.log_score(11), math.inf)
+        self.assertEqual(Pareto(3, 8).log_score(1), math.inf)
+        self.assertEqual(LogNormal(2, 4, 9).log_score(0), math.inf)
+
+    def test_crps_is_smallest_near_the_median(self) -> None:
+        for dist, _, _ in DISTRIBUTIONS:
+            median = dist.ppf(0.5)
+            best = dist.crps(median)
+            for offset in (0.5, 2):
+                self.assertLess(best, dist.crps(median + offset))
+                self.assertLess(best, dist.crps(median - offset))
+
+
+class TestBatchedScores(unittest.TestCase):
+
+    def test_python_fallback_matches_scalars(self) -> None:
+        with mock.patch.object(vectorized, "HAS_NUMPY", False):
+            for dist, name, params in DISTRIBUTIONS:
+                for rule in ("crps", "log_score"):
+                    batched = getattr(vectorized, f"{name}_{rule}")(XS, *params)
+                    self.assertEqual(batched, [getattr(dist, rule)(x) for x in XS])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_numpy_matches_scalars(self) -> None:
+        for dist, name, params in DISTRIBUTIONS:
+            for rule in ("crps", "log_score"):
+                batched = getattr(vectorized, f"{name}_{rule}")(np.array(XS), *params)
+                np.testing.assert_allclose(
+                    batched, [getattr(dist, rule)(x) for x in XS], rtol=1e-12
+                )
+
+
+class TestForecastRules(unittest.TestCase):
+
+    def test_continuous_forecasts(self) -> None:
+        pert = make_forecast(type="pert", min=1, mode=4, max=10, outcome=4)
+        self.assertAlmostEqual(pert.score("crps"), PERT(1, 4, 10).crps(4))
+        self.assertAlmostEqual(pert.score("log"), PERT(1, 4, 10).log_score(4))
+        self.assertEqual(pert.score(), pert.calc())
+
+    def test_choice_log_score(self) -> None:
+        choice = make_forecast(
+            type="choice", options={"a": 0.25, "b": 0.75, "c": 0}, outcome="a"
+        )
+        self.assertAlmostEqual(choice.score("log"), math.log(4))
+        with self.assertRaises(ValueError):
+            choice.score("crps")
+        choice.outcome = "c"
+        self.assertEqual(choice.score("log"), math.inf)
+
+    def test_unsupported_rule(self) -> None:
+        interval = make_forecast(type="interval", min=1, max=10, confidence=0.9)
+        interval.outcome = 5
+        self.assertEqual(interval.rules, ("brier",))
+        for rule in ("crps", "log", "spherical"):
+            with self.assertRaises(ValueError):
+                interval.score(rule)
+
+
+class TestCli(unittest.TestCase):
+
+    def test_score_option(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, ".forecasts"))
+            for name, body in [
+                ("pert", "type: pert\nmin: 1\nmode: 4\nmax: 10\noutcome: 4\n"),
+                (
+                    "interval",
+                    "type: interval\nmin: 1\nmax: 10\nconfidence: 0.9\noutcome: 5\n",
+                ),
+            ]:
+                path = os.path.join(directory, ".forecasts", f"{name}.forecast")
+                with open(path, "w") as f:
+                    f.write(f"---\nscenario: {name}\nend_date: 2024-01-01\n{body}---\n")
+            cwd = os.getcwd()
+            os.chdir(directory)
+            try:
+                table = CliRunner().invoke(
+                    entrypoint, ["--score", "crps", "--no-cache"]
+                )
+                csv = CliRunner().invoke(
+                    entrypoint, ["--score", "crps", "--format", "csv", "--no-cache"]
+                )
+            finally:
+                os.chdir(cwd)
+        self.assertEqual(table.exit_code, 0, table.output)
+        self.assertIn("CRPS", table.output)
+        self.assertIn("0.4503", table.output)
+        self.assertIn("n/a", table.output)
+        lines = csv.output.splitlines()
+        self.assertTrue(lines[0].endswith(",brier_score,crps"))
+        self.assertTrue(any(line.endswith(",0.4502981010054364") for line in lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+from unittest import mock
+
+import forecast.models.math.vectorized as vectorized
+from forecast.models.math.lognormal import LogNormal
+from forecast.models.math.pareto import Pareto
+from forecast.models.math.PERT import PERT
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:
+    np = None
+
+XS = [0.5, 1, 2.5, 4, 5, 7.5, 9.99, 10, 12]
+PS = [0.01, 0.05, 0.5, 0.95, 0.99]
+DISTRIBUTIONS = [
+    (PERT(1, 4, 10), "pert", (1, 4, 10)),
+    (PERT(0, 0, 10), "pert", (0, 0, 10)),
+    (LogNormal(2, 4, 9), "lognormal", (2, 4, 9)),
+    (Pareto(3, 8), "pareto", (3, 8)),
+]
+
+
+class TestVectorizedPython(unittest.TestCase):
+    """The pure-Python fallback, used when numpy isn't installed."""
+
+    def setUp(self) -> None:
+        patcher = mock.patch.object(vectorized, "HAS_NUMPY", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_lists_match_scalars(self) -> None:
+        for dist, _, _ in DISTRIBUTIONS:
+            self.assertEqual(dist.cdf(XS), [dist.cdf(x) for x in XS])
+            self.assertEqual(dist.pdf(XS), [dist.pdf(x) for x in XS])
+            self.assertEqual(dist.ppf(PS), [dist.ppf(p) for p in PS])
+            self.assertEqual(
+                dist.pdf_to_probability(XS), [dist.pdf_to_probability(x) for x in XS]
+            )
+
+    def test_broadcasts_parameters(self) -> None:
+        grid = vectorized.pert_cdf([[2, 5]], [[0], [1]], 3, 10)
+        self.assertEqual(
+            grid,
+            [
+                [PERT(0, 3, 10).cdf(2), PERT(0, 3, 10).cdf(5)],
+                [PERT(1, 3, 10).cdf(2), PERT(1, 3, 10).cdf(5)],
+            ],
+        )
+
+    def test_mismatched_lengths(self) -> None:
+        with self.assertRaises(ValueError):
+            vectorized.pareto_cdf([1, 2, 3], [1, 2], 10)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestVectorizedNumpy(unittest.TestCase):
+
+    def assertClose(self, actual, expected) -> None:
+        np.testing.assert_allclose(actual, expected, rtol=1e-10, atol=1e-13)
+
+    def test_arrays_match_scalars(self) -> None:
+        xs, ps = np.array(XS), np.array(PS)
+        for dist, _, _ in DISTRIBUTIONS:
+            self.assertClose(dist.cdf(xs), [dist.cdf(x) for x in XS])
+            self.assertClose(dist.pdf(xs), [dist.pdf(x) for x in XS])
+            self.assertClose(dist.ppf(ps), [dist.ppf(p) for p in PS])
+            self.assertClose(
+                dist.pdf_to_probability(xs), [dist.pdf_to_probability(x) for x in XS]
+            )
+
+    def test_n_distributions_by_m_points(self) -> None:
+        lows = np.array([0.0, 1.0, 2.0])[:, None]
+        modes = np.array([3.0, 3.0, 8.0])[:, None]
+        highs = np.array([10.0, 5.0, 9.0])[:, None]
+        grid = vectorized.pert_cdf(np.array(XS), lows, modes, highs)
+        self.assertEqual(grid.shape, (3, len(XS)))
+        for i in range(3):
+            pert = PERT(lows[i, 0], modes[i, 0], highs[i, 0])
+            self.assertClose(grid[i], [pert.cdf(x) for x in XS])
+
+        quantiles = vectorized.lognormal_ppf(
+            np.array(PS), [[1], [2]], [[4], [5]], [[9], [20]]
+        )
+        self.assertEqual(quantiles.shape, (2, len(PS)))
+        self.assertClose(quantiles[1], [LogNormal(2, 5, 20).ppf(p) for p in PS])
+
+    def test_pert_ppf_inverts_cdf(self) -> None:
+        ps = np.linspace(0.001, 0.999, 50)
+        xs = vectorized.pert_ppf(ps, 1, [[1], [2], [9.5]], 10)
+        self.assertClose(
+            vectorized.pert_cdf(xs, 1, [[1], [2], [9.5]], 10),
+            np.broadcast_to(ps, xs.shape),
+        )
+
+    def test_invalid_parameters(self) -> None:
+        with self.assertRaises(ValueError):
+            vectorized.pert_cdf(np.array([1.0]), [0, 5], [1, 1], [10, 10])
+        with self.assertRaises(ValueError):
+            vectorized.pareto_ppf(np.array([0.5, 1.0]), 1, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
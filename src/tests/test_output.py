@@ -0,0 +1,188 @@
+import datetime
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from forecast.header import Metadata
+from forecast.factory import create_forecast
+from forecast.output import (
+    ArrowWriter,
+    CsvWriter,
+    JsonlWriter,
+    forecast_record,
+    record_fields,
+)
+from tests.test_startup import loaded_modules
+
+TODAY = datetime.date(2025, 1, 1)
+
+
+def make_forecast(**metadata: object) -> object:
+    base = {
+        "scenario": "test",
+        "end_date": datetime.date(2025, 1, 11),
+        "type": "interval",
+        "min": 1,
+        "max": 10,
+        "confidence": 0.9,
+    }
+    forecast = create_forecast(Metadata(dict(base, **metadata)))
+    forecast.path = ".forecasts/test.forecast"
+    return forecast
+
+
+class FlushCountingStream(io.StringIO):
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+
+class TestForecastRecord(unittest.TestCase):
+
+    def test_open(self) -> None:
+        record = forecast_record(make_forecast(tags=["a", "b"]), TODAY)
+        self.assertEqual(record["status"], "open")
+        self.assertEqual(record["days_until_close"], 10)
+        self.assertIsNone(record["brier_score"])
+        self.assertEqual(record["tags"], ["a", "b"])
+        self.assertEqual(record["path"], ".forecasts/test.forecast")
+
+    def test_overdue(self) -> None:
+        record = forecast_record(make_forecast(end_date="2024-12-31"), TODAY)
+        self.assertEqual(record["status"], "overdue")
+        self.assertEqual(record["days_until_close"], -1)
+        self.assertEqual(record["tags"], [])
+
+    def test_closed(self) -> None:
+        record = forecast_record(make_forecast(outcome=5), TODAY)
+        self.assertEqual(record["status"], "closed")
+        self.assertIsNone(record["days_until_close"])
+        self.assertAlmostEqual(record["brier_score"], 0.02)
+
+    def test_rule_column(self) -> None:
+        pert = make_forecast(type="pert", min=1, mode=4, max=10, outcome=4)
+        record = forecast_record(pert, TODAY, "crps")
+        self.assertEqual(tuple(record), record_fields("crps"))
+        self.assertAlmostEqual(record["crps"], 0.4502981010054364, places=12)
+        self.assertAlmostEqual(record["brier_score"], pert.score())
+        # Intervals have no CRPS, and open forecasts no score at all
+        self.assertIsNone(
+            forecast_record(make_forecast(outcome=5), TODAY, "crps")["crps"]
+        )
+        self.assertIsNone(forecast_record(make_forecast(), TODAY, "log")["log_score"])
+        self.assertEqual(tuple(forecast_record(pert, TODAY)), record_fields())
+
+    def test_infinite_score_is_empty(self) -> None:
+        # The outcome is outside the PERT's support, so its log score is infinite
+        pert = make_forecast(type="pert", min=1, mode=4, max=10, outcome=12)
+        self.assertEqual(pert.score("log"), float("inf"))
+        record = forecast_record(pert, TODAY, "log")
+        self.assertIsNone(record["log_score"])
+        stream = io.StringIO()
+        JsonlWriter(stream).write(record)
+        self.assertIsNone(json.loads(stream.getvalue())["log_score"])
+        self.assertNotIn("Infinity", stream.getvalue())
+
+
+class TestWriters(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.records = [
+            forecast_record(make_forecast(tags=["a", "b"]), TODAY),
+            forecast_record(make_forecast(outcome=5), TODAY),
+        ]
+
+    def test_jsonl_flushes_every_record(self) -> None:
+        stream = FlushCountingStream()
+        writer = JsonlWriter(stream)
+        writer.write(self.records[0])
+        self.assertEqual(stream.flushes, 1)
+        writer.write(self.records[1])
+        self.assertEqual(stream.flushes, 2)
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(lines[0]["end_date"], "2025-01-11")
+        self.assertEqual(lines[0]["tags"], ["a", "b"])
+        self.assertAlmostEqual(lines[1]["brier_score"], 0.02)
+
+    def test_csv(self) -> None:
+        stream = FlushCountingStream()
+        writer = CsvWriter(stream)
+        for record in self.records:
+            writer.write(record)
+        self.assertEqual(stream.flushes, 2)
+        self.assertEqual(
+            stream.getvalue().splitlines(),
+            [
+                "path,scenario,type,tags,end_date,status,days_until_close,brier_score",
+                ".forecasts/test.forecast,test,interval,a;b,2025-01-11,open,10,",
+                ".forecasts/test.forecast,test,interval,,2025-01-11,closed,,0.01999999999999999",
+            ],
+        )
+
+    def test_arrow_round_trip(self) -> None:
+        try:
+            import pyarrow as pa  # type: ignore
+        except ImportError:
+            self.skipTest("pyarrow is not installed")
+        stream = io.BytesIO()
+        writer = ArrowWriter(stream, batch_size=1)
+        for record in self.records:
+            writer.write(record)
+        writer.close()
+        stream.seek(0)
+        reader = pa.ipc.open_stream(stream)
+        batches = list(reader)
+        self.assertEqual(len(batches), 2)
+        self.assertEqual(pa.Table.from_batches(batches).to_pylist(), self.records)
+
+    def test_arrow_rule_column(self) -> None:
+        try:
+            import pyarrow as pa  # type: ignore
+        except ImportError:
+            self.skipTest("pyarrow is not installed")
+        records = [
+            forecast_record(make_forecast(), TODAY, "log"),
+            forecast_record(make_forecast(outcome=5), TODAY, "log"),
+        ]
+        stream = io.BytesIO()
+        writer = ArrowWriter(stream, fields=record_fields("log"))
+        for record in records:
+            writer.write(record)
+        writer.close()
+        stream.seek(0)
+        table = pa.ipc.open_stream(stream).read_all()
+        self.assertEqual(table.schema.field("log_score").type, pa.float64())
+        self.assertEqual(table.to_pylist(), records)
+
+
+class TestCli(unittest.TestCase):
+
+    def test_formats_do_not_import_rich(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, ".forecasts"))
+            path = os.path.join(directory, ".forecasts", "test.forecast")
+            with open(path, "w") as f:
+                f.write(
+                    "---\nscenario: test\nend_date: 2025-01-01\ntype: interval\n"
+                    "min: 1\nmax: 10\nconfidence: 0.9\noutcome: 5\n---\n"
+                )
+            for fmt in ("jsonl", "csv"):
+                modules = loaded_modules(
+                    "import os, contextlib, io\n"
+                    f"os.chdir({directory!r})\n"
+                    "from forecast.forecast import entrypoint\n"
+                    "with contextlib.redirect_stdout(io.StringIO()):\n"
+                    f"    entrypoint(['--format', '{fmt}'], standalone_mode=False)"
+                )
+                self.assertIn("forecast.output", modules)
+                self.assertNotIn("rich", modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,262 @@
+import datetime
+import itertools
+import os
+import random
+import unittest
+from unittest import mock
+
+from click.testing import CliRunner
+
+import forecast.loader as loader
+from forecast.forecast import entrypoint, process_forecast_files
+from forecast.loader import ForecastError, iter_forecasts
+from forecast.models.forecast import SCORING_RULES
+from forecast.query import SortKey, Where, parse_date, parse_sort, sort_key, top_k
+from forecast.storage import FileStorage, Query, SQLiteStorage
+from tests.test_index import TODAY, IndexTestCase, forecast_text
+
+EXPRESSIONS = [
+    "type = pert",
+    "tag = infra or tag = ops",
+    "tag != ops and open",
+    "not (closed or end_date >= today+30d)",
+    "end_date >= today-1w and end_date <= today+2w",
+    "closed and score < 0.5",
+    "not score > 0.5",
+    "score >= 0 or tag = infra",
+    "scenario = 'late' or scenario > sooner",
+    "type = interval and not closed",
+]
+
+
+class TestWhere(unittest.TestCase):
+
+    def test_parse(self) -> None:
+        where = Where('(tag = a or tag = "b c") and not closed', TODAY)
+        self.assertEqual(
+            where.sql(),
+            (
+                "((filename IN (SELECT filename FROM tags WHERE tag = ?) OR "
+                "filename IN (SELECT filename FROM tags WHERE tag = ?)) AND "
+                "(NOT closed = 1))",
+                ["a", "b c"],
+            ),
+        )
+        self.assertEqual(
+            Where("TYPE == pert AND open").node, Where("type=pert and open").node
+        )
+        for text in (
+            "",
+            "type",
+            "type = ",
+            "size > 3",
+            "tag > a",
+            "score > high",
+            "end_date < tomorrow",
+            "(type = a",
+            "type = a b",
+        ):
+            with self.assertRaises(ValueError, msg=text):
+                Where(text)
+
+    def test_dates(self) -> None:
+        day = datetime.date(2025, 1, 31)
+        self.assertEqual(parse_date("today", day), day)
+        self.assertEqual(parse_date("today+2w", day), datetime.date(2025, 2, 14))
+        self.assertEqual(parse_date("today-1d", day), datetime.date(2025, 1, 30))
+        self.assertEqual(parse_date("2025-03-01"), datetime.date(2025, 3, 1))
+
+    def test_admits_is_three_valued(self) -> None:
+        opened = {"scenario": "a", "type": "pert", "end_date": "2025-01-01"}
+        closed = dict(opened, outcome=3)
+        # The score of a closed forecast isn't known until it is built
+        self.assertTrue(Where("score > 0.5").admits(closed))
+        self.assertTrue(Where("not score > 0.5").admits(closed))
+        self.assertFalse(Where("score > 0.5 and type = choice").admits(closed))
+        self.assertTrue(Where("score > 0.5 or type = choice").admits(closed))
+        # An open forecast has no score
+        self.assertFalse(Where("score > 0.5").admits(opened))
+        self.assertTrue(Where("not score > 0.5").admits(opened))
+        # Tags are read as the forecast reads them
+        self.assertTrue(Where("tag = x").admits(dict(opened, tags="x")))
+        self.assertFalse(Where("tag = x").admits(dict(opened, tags=None)))
+        # Headers the forecast can't read are left for it to report
+        self.assertTrue(Where("type = choice").admits(dict(opened, end_date="soon")))
+        self.assertTrue(Where("type = choice").admits({"type": "pert"}))
+
+
+class TestSort(unittest.TestCase):
+
+    def forecasts(self) -> list:
+        rng = random.Random(4)
+        items = []
+        for i in range(200):
+            item = mock.Mock(spec=["scenario", "type", "end_date", "score"])
+            item.scenario = f"s{rng.randrange(20)}"
+            item.type = rng.choice(["pert", "choice"])
+            item.end_date = TODAY + datetime.timedelta(rng.randrange(10))
+            if rng.random() < 0.5:
+                item.outcome = 1
+                item.score.return_value = rng.choice([0.1, 0.5, 0.9])
+            items.append(item)
+        return items
+
+    def test_parse(self) -> None:
+        self.assertEqual(
+            [tuple(k) for k in parse_sort("type, -score")],
+            [("type", False, "brier"), ("score", True, "brier")],
+        )
+        self.assertEqual(
+            parse_sort("type,score", "crps"),
+            (SortKey("type"), SortKey("score", False, "crps")),
+        )
+        with self.assertRaises(ValueError):
+            parse_sort("size")
+
+    def test_keys(self) -> None:
+        items = self.forecasts()
+        ordered = sorted(items, key=sort_key(parse_sort("-scenario,end_date")))
+        pairs = [(f.scenario, f.end_date) for f in ordered]
+        by_date = sorted(pairs, key=lambda p: p[1])
+        self.assertEqual(pairs, sorted(by_date, key=lambda p: p[0], reverse=True))
+        ordered = sorted(items, key=sort_key(parse_sort("-score")))
+        scores = [f.score() if hasattr(f, "outcome") else None for f in ordered]
+        scored = [s for s in scores if s is not None]
+        self.assertEqual(scored, sorted(scored, reverse=True))
+        self.assertEqual(scores[len(scored) :], [None] * (len(items) - len(scored)))
+
+    def test_top_k_is_a_stable_prefix(self) -> None:
+        items = self.forecasts()
+        keys = parse_sort("type,-score")
+        expected = sorted(items, key=sort_key(keys))
+        for limit in (1, 7, 50, 500):
+            self.assertEqual(top_k(iter(items), keys, limit), expected[:limit])
+        self.assertEqual(top_k(items, keys, None), expected)
+
+
+class TestPushdown(IndexTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        for i in range(20):
+            end = TODAY + datetime.timedelta(i * 7 - 30)
+            tags = [["infra"], ["ops"], ["infra", "ops"], []][i % 4]
+            self.write(
+                f"extra-{i}.forecast",
+                forecast_text(
+                    f"extra {i}", ["pert", "interval"][i % 2], tags, end, i % 3 == 0
+                ),
+            )
+
+    def test_header_filters_skip_building(self) -> None:
+        where = Where("type = interval and open")
+        with mock.patch.object(
+            loader, "create_forecast", wraps=loader.create_forecast
+        ) as create:
+            items = list(iter_forecasts(self.dir.name, where=where))
+        forecasts = [i for i in items if not isinstance(i, ForecastError)]
+        self.assertTrue(forecasts)
+        for item in forecasts:
+            self.assertEqual((item.type, hasattr(item, "outcome")), ("interval", False))
+        # Built once, only for matches; the broken header is still tried, so its
+        # error is reported
+        self.assertEqual(len(items) - len(forecasts), 1)
+        self.assertEqual(create.call_count, len(forecasts) + 1)
+
+    def test_backends_agree(self) -> None:
+        files = FileStorage(self.dir.name)
+        sqlite = SQLiteStorage(self.dir.name)
+        try:
+            for text, rule in itertools.product(EXPRESSIONS, SCORING_RULES):
+                for sort, limit in (("end_date", None), ("-score,scenario", 5)):
+                    where = Where(text, rule=rule)
+                    query = Query(where=where, sort=parse_sort(sort, rule), limit=limit)
+                    with self.subTest(where=text, rule=rule, sort=sort):
+                        expected = [getattr(i, "path") for i in files.select(query)]
+                        found = [getattr(i, "path") for i in sqlite.select(query)]
+                        self.assertEqual(found, expected)
+        finally:
+            sqlite.close()
+
+    def test_limit_across_roots(self) -> None:
+        other = os.path.join(self.dir.name, "other")
+        os.mkdir(other)
+        for i in range(5):
+            with open(os.path.join(other, f"o{i}.forecast"), "w") as f:
+                f.write(
+                    forecast_text(
+                        f"o{i}", "pert", [], TODAY + datetime.timedelta(i), False
+                    )
+                )
+        keys = parse_sort("-end_date")
+        every = process_forecast_files(
+            [self.dir.name, other], None, None, include=["*.forecast"], sort=keys
+        )
+        first = process_forecast_files(
+            [self.dir.name, other],
+            None,
+            None,
+            include=["*.forecast"],
+            sort=keys,
+            limit=4,
+        )
+        self.assertEqual([f.path for f in first], [f.path for f in every[:4]])
+
+
+class TestCli(IndexTestCase):
+
+    def test_where_sort_limit(self) -> None:
+        runner = CliRunner()
+        args = ["--root", self.dir.name, "--where", "tag = ops or tag = infra"]
+        args += ["--sort", "-end_date", "--limit", "2"]
+        files = runner.invoke(entrypoint, args)
+        sqlite = runner.invoke(entrypoint, args + ["--storage", "sqlite"])
+        self.assertEqual(files.exit_code, 0, files.output)
+        self.assertEqual(sqlite.output, files.output)
+        self.assertLess(files.output.index("later"), files.output.index("soon"))
+        self.assertNotIn("late ", files.output)
+
+    def test_score_follows_the_rule(self) -> None:
+        # Wider forecasts have lower Brier scores here, but higher CRPS
+        for i, (high, outcome) in enumerate(((10, 5), (50, 10), (100, 10))):
+            text = forecast_text(f"pert {i}", "pert", [], TODAY, True)
+            text = text.replace("max: 10", f"max: {high}")
+            self.write(
+                f"p{i}.forecast", text.replace("outcome: 5", f"outcome: {outcome}")
+            )
+        runner = CliRunner()
+        args = ["--root", self.dir.name, "--score", "crps", "--sort", "score"]
+        args += ["--where", "score > 0.05"]
+        files = runner.invoke(entrypoint, args)
+        sqlite = runner.invoke(entrypoint, args + ["--storage", "sqlite"])
+        self.assertEqual(files.exit_code, 0, files.output)
+        self.assertEqual(sqlite.output, files.output)
+        # The interval has a Brier score but no CRPS, so it doesn't match
+        self.assertNotIn("done", files.output)
+        forecasts = [
+            i
+            for i in iter_forecasts(self.dir.name, type="pert")
+            if hasattr(i, "outcome")
+        ]
+        by_crps = sorted(forecasts, key=lambda f: f.score("crps"))
+        by_brier = sorted(forecasts, key=lambda f: f.score())
+        self.assertNotEqual(by_crps, by_brier)
+        positions = [files.output.index(f.scenario) for f in by_crps]
+        self.assertEqual(positions, sorted(positions))
+
+    def test_bad_arguments(self) -> None:
+        runner = CliRunner()
+        root = ["--root", self.dir.name]
+        for args in (
+            ["--where", "size > 2"],
+            ["--sort", "size"],
+            ["--limit", "0"],
+            ["--format", "csv", "--sort", "score"],
+            ["--watch", "--where", "open"],
+        ):
+            result = runner.invoke(entrypoint, root + args)
+            self.assertEqual(result.exit_code, 2, args)
+
+
+if __name__ == "__main__":
+    unittest.main()
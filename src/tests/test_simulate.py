@@ -0,0 +1,188 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from click.testing import CliRunner
+
+from forecast.factory import create_forecast
+from forecast.forecast import entrypoint
+from forecast.header import Metadata
+from forecast.models.math.normal import Z95
+
+try:
+    import numpy as np  # type: ignore
+
+    from forecast import simulate
+except ImportError:
+    np = None
+
+
+def make(type: str, path: str, **fields: object) -> object:
+    metadata = {"scenario": path, "end_date": "2030-01-01", "type": type, "tags": []}
+    metadata.update(fields)
+    forecast = create_forecast(Metadata(metadata))
+    forecast.path = path
+    return forecast
+
+
+def portfolio(*forecasts: object) -> "simulate.Portfolio":
+    result = simulate.Portfolio()
+    for forecast in forecasts:
+        result.add(forecast)
+    return result
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestSimulate(unittest.TestCase):
+
+    def test_pert_moments(self) -> None:
+        # PERT(0, 3, 12): mean (0 + 4 * 3 + 12) / 6 = 4
+        result = simulate.simulate(
+            portfolio(make("pert", "a", min=0, mode=3, max=12)), 200_000, seed=1
+        )
+        self.assertAlmostEqual(result.mean, 4, delta=0.03)
+        self.assertGreaterEqual(result.low, 0)
+        self.assertLessEqual(result.high, 12)
+
+    def test_lognormal_quantiles(self) -> None:
+        result = simulate.simulate(
+            portfolio(make("lognormal", "a", p5=2, p50=4, p95=8)),
+            200_000,
+            seed=2,
+            chunk_size=30_000,
+        )
+        self.assertAlmostEqual(result.quantile(0.5), 4, delta=0.05)
+        self.assertAlmostEqual(result.quantile(0.95), 8, delta=0.15)
+        self.assertAlmostEqual(result.quantile(0.05), 2, delta=0.05)
+
+    def test_pareto_exceedance(self) -> None:
+        result = simulate.simulate(
+            portfolio(make("pareto", "a", p90=10, p99=40)),
+            200_000,
+            seed=3,
+            thresholds=[10, 40],
+        )
+        (t10, p10), (t40, p40) = result.exceedance()
+        self.assertAlmostEqual(p10, 0.10, delta=0.005)
+        self.assertAlmostEqual(p40, 0.01, delta=0.002)
+
+    def test_sum_of_components(self) -> None:
+        forecasts = [
+            make("pert", "a", min=1, mode=2, max=6),
+            make("pert", "b", min=0, mode=5, max=5),
+            make("lognormal", "c", p5=1, p50=2, p95=4),
+        ]
+        result = simulate.simulate(portfolio(*forecasts), 100_000, seed=4)
+        lognormal_mean = 2 * np.exp((np.log(4) - np.log(1)) ** 2 / (8 * Z95**2))
+        expected = (1 + 8 + 6) / 6 + (0 + 20 + 5) / 6 + lognormal_mean
+        self.assertAlmostEqual(result.mean, expected, delta=0.03)
+
+    def test_parameters_come_from_the_fit(self) -> None:
+        pert = make("pert", "a", min=1, mode=2, max=6)
+        lognormal = make("lognormal", "b", p5=1, p50=2, p95=4)
+        pareto = make("pareto", "c", p90=10, p99=40)
+        p = portfolio(pert, lognormal, pareto)
+        fit = pert.distribution()
+        self.assertEqual(p.pert, [("a", fit.xmin, fit.range, fit.alpha, fit.beta)])
+        fit = lognormal.distribution()
+        self.assertEqual(p.lognormal, [("b", fit.mu, fit.sigma)])
+        fit = pareto.distribution()
+        self.assertEqual(p.pareto, [("c", fit.alpha, fit.xmin)])
+        with self.assertRaises(ValueError):
+            p.add(make("pert", "d", min=3, mode=1, max=2))
+
+    def test_closed_and_other_types_are_skipped(self) -> None:
+        p = simulate.Portfolio()
+        self.assertFalse(p.add(make("pert", "a", min=0, mode=1, max=2, outcome=1)))
+        self.assertFalse(p.add(make("interval", "b", min=0, max=1, confidence=0.9)))
+        self.assertEqual(len(p), 0)
+        with self.assertRaises(ValueError):
+            simulate.simulate(p, 10)
+
+    def test_reproducible_across_jobs_and_order(self) -> None:
+        forecasts = [
+            make("pert", "a", min=1, mode=2, max=6),
+            make("lognormal", "b", p5=1, p50=2, p95=4),
+            make("pareto", "c", p90=3, p99=9),
+        ]
+        args = dict(seed=5, chunk_size=1000, thresholds=[10])
+        serial = simulate.simulate(portfolio(*forecasts), 7_500, jobs=1, **args)
+        parallel = simulate.simulate(
+            portfolio(*reversed(forecasts)), 7_500, jobs=2, **args
+        )
+        self.assertEqual(serial.count, 7_500)
+        self.assertEqual(serial.mean, parallel.mean)
+        self.assertEqual(serial.m2, parallel.m2)
+        self.assertEqual(serial.exceedance(), parallel.exceedance())
+        self.assertTrue(np.array_equal(serial.histogram, parallel.histogram))
+
+    def test_chunks_are_bounded(self) -> None:
+        with mock.patch.object(
+            simulate, "draw_chunk", wraps=simulate.draw_chunk
+        ) as draw:
+            simulate.simulate(
+                portfolio(make("pert", "a", min=0, mode=1, max=2)),
+                2_500,
+                chunk_size=1000,
+            )
+        self.assertEqual(
+            [c.args[2:] for c in draw.call_args_list], [(0, 1000), (1, 1000), (2, 500)]
+        )
+
+    def test_quantile_matches_exact(self) -> None:
+        forecasts = [make("lognormal", "a", p5=1, p50=3, p95=20)]
+        params = portfolio(*forecasts).params()
+        exact = np.concatenate(
+            [simulate.draw_chunk(params, 6, i, 10_000) for i in range(5)]
+        )
+        result = simulate.simulate(
+            portfolio(*forecasts), 50_000, seed=6, chunk_size=10_000
+        )
+        for q in (0, 0.01, 0.5, 0.9, 0.999, 1):
+            # Within a bin's worth of probability of the exact sample quantile
+            low, high = np.quantile(exact, [max(q - 5e-4, 0), min(q + 5e-4, 1)])
+            self.assertTrue(low <= result.quantile(q) <= high, q)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestSimulateCommand(unittest.TestCase):
+
+    def test_simulate_tag(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            for name, type, tag, fields in [
+                ("a", "pert", "q3", "min: 1\nmode: 2\nmax: 3"),
+                ("b", "pert", "q3", "min: 10\nmode: 20\nmax: 30"),
+                ("c", "pert", "q4", "min: 100\nmode: 200\nmax: 300"),
+            ]:
+                with open(os.path.join(root, f"{name}.forecast"), "w") as f:
+                    f.write(
+                        f"---\nscenario: {name}\ntype: {type}\nend_date: 2030-01-01\n"
+                        f"tags: [{tag}]\n{fields}\n---\n"
+                    )
+            result = CliRunner().invoke(
+                entrypoint,
+                [
+                    "simulate",
+                    "--tag",
+                    "q3",
+                    "--samples",
+                    "20000",
+                    "--threshold",
+                    "22",
+                    "--root",
+                    root,
+                    "--jobs",
+                    "1",
+                    "--no-cache",
+                ],
+            )
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("P50", result.output)
+        self.assertIn("2 open forecasts (2 pert, 0 lognormal, 0 pareto)", result.output)
+        mean = [line for line in result.output.splitlines() if "Mean" in line][0]
+        self.assertAlmostEqual(float(mean.split("│")[2]), 22, delta=0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
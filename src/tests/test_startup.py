@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+import unittest
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+# Cumulative import time allowed for the `forecast` package, in microseconds
+IMPORT_BUDGET_US = 100_000
+
+# Heavy modules that must only be imported once they are actually needed
+DEFERRED_MODULES = ("rich", "yaml", "frontmatter", "numpy", "concurrent")
+
+
+def run(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        env=dict(os.environ, PYTHONPATH=SRC_DIR),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def loaded_modules(statement: str) -> set:
+    """Run `statement` in a fresh interpreter and return the modules it loaded."""
+    proc = run("-c", f"{statement}\nimport sys\nprint('\\n'.join(sys.modules))")
+    return set(proc.stdout.split())
+
+
+def import_times(statement: str) -> dict:
+    """Run `statement` in a fresh interpreter under -X importtime and return
+    {module: cumulative microseconds}."""
+    proc = run("-X", "importtime", "-c", statement)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        name = name.strip()
+        times[name] = max(times.get(name, 0), int(cumulative))
+    return times
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_cli_import_defers_heavy_modules(self) -> None:
+        for name in loaded_modules("import forecast.forecast"):
+            self.assertFalse(
+                name.split(".")[0] in DEFERRED_MODULES,
+                f"'{name}' is imported at startup",
+            )
+
+    def test_model_modules_load_on_first_use(self) -> None:
+        modules = loaded_modules(
+            "from forecast.factory import forecast_class; forecast_class('pert')"
+        )
+        self.assertIn("forecast.models.pert", modules)
+        self.assertNotIn("forecast.models.choice", modules)
+
+    def test_cli_import_within_budget(self) -> None:
+        times = import_times("import forecast.forecast")
+        self.assertLess(
+            times["forecast"],
+            IMPORT_BUDGET_US,
+            f"importing forecast took {times['forecast'] / 1000:.1f}ms",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
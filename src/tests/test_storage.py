@@ -0,0 +1,169 @@
+import datetime
+import os
+import sqlite3
+import unittest
+from unittest import mock
+
+from click.testing import CliRunner
+
+import forecast.loader as loader
+from forecast.forecast import entrypoint
+from forecast.loader import ForecastError
+from forecast.query import Where, parse_sort
+from forecast.storage import (
+    DATABASE_FILE,
+    FileStorage,
+    Query,
+    SQLiteStorage,
+    StorageError,
+)
+from tests.test_index import TODAY, IndexTestCase, forecast_text
+
+QUERIES = [
+    Query(),
+    Query(type="pert"),
+    Query(type="pert", tag="infra"),
+    Query(tag="ops"),
+    Query(where=Where("end_date <= today+14d and open", TODAY)),
+    Query(where=Where("end_date >= today and end_date <= today+60d", TODAY)),
+    Query(where=Where("closed")),
+    Query(where=Where("score >= 0 and score <= 1")),
+    Query(where=Where("score <= -1")),
+]
+
+
+def names(items: list) -> list:
+    return [
+        item.filename if isinstance(item, ForecastError) else item.scenario
+        for item in items
+    ]
+
+
+class TestSQLiteStorage(IndexTestCase):
+
+    def select(self, query: Query) -> list:
+        storage = SQLiteStorage(self.dir.name)
+        try:
+            return list(storage.select(query))
+        finally:
+            storage.close()
+
+    def test_matches_files(self) -> None:
+        files = FileStorage(self.dir.name)
+        for query in QUERIES:
+            with self.subTest(query=query):
+                expected = list(files.select(query))
+                found = self.select(query)
+                self.assertEqual(names(found), names(expected))
+                for a, b in zip(found, expected):
+                    if not isinstance(a, ForecastError):
+                        self.assertEqual(a.brier, b.brier)
+                        self.assertEqual(a.path, b.path)
+        self.assertEqual(
+            names(self.select(Query(type="pert"))), ["broken.forecast", "late", "later"]
+        )
+
+    def test_sync_only_reads_changed_files(self) -> None:
+        self.select(Query())
+        self.write("soon.forecast", forecast_text("soon", "pert", ["x"], TODAY, False))
+        os.remove(os.path.join(self.dir.name, "done.forecast"))
+        with mock.patch.object(loader, "load_file", wraps=loader.load_file) as load:
+            found = self.select(Query(type="pert", tag="x"))
+        self.assertEqual([c.args[1] for c in load.call_args_list], ["soon.forecast"])
+        self.assertEqual(names(found), ["broken.forecast", "soon"])
+        self.assertNotIn("done", names(self.select(Query())))
+
+    def test_edit_while_syncing_is_reloaded(self) -> None:
+        load_files = loader.load_files
+        text = forecast_text("noon", "interval", ["infra"], TODAY, False)
+
+        def edit_after_loading(*args, **kwargs):
+            for result in load_files(*args, **kwargs):
+                if result.filename == "soon.forecast":
+                    # Same size, so only the fingerprint can tell
+                    self.write("soon.forecast", text)
+                    os.utime(os.path.join(self.dir.name, "soon.forecast"), ns=(1, 1))
+                yield result
+
+        with mock.patch.object(loader, "load_files", edit_after_loading):
+            self.assertIn("soon", names(self.select(Query())))
+        self.assertIn("noon", names(self.select(Query())))
+
+    def test_touch_reads_nothing(self) -> None:
+        self.select(Query())
+        os.utime(os.path.join(self.dir.name, "late.forecast"), ns=(0, 0))
+        with mock.patch.object(loader, "load_file") as load:
+            self.select(Query())
+        load.assert_not_called()
+
+    def test_filters_run_in_sql(self) -> None:
+        storage = SQLiteStorage(self.dir.name)
+        storage.sync()
+        plan = storage.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT filename FROM forecasts "
+            "WHERE error IS NULL AND type = ? ORDER BY end_date",
+            ("pert",),
+        ).fetchall()
+        storage.close()
+        self.assertIn("forecasts_type", str(plan))
+
+    def test_damaged_database_is_rebuilt(self) -> None:
+        path = os.path.join(self.dir.name, ".cache", DATABASE_FILE)
+        self.select(Query())
+        with open(path, "wb") as f:
+            f.write(b"not a database" * 100)
+        self.assertEqual(len(self.select(Query())), 5)
+        with sqlite3.connect(path) as connection:
+            connection.execute("UPDATE header SET value = 'old' WHERE key = 'scoring'")
+        self.assertEqual(len(self.select(Query())), 5)
+
+    def test_unwritable(self) -> None:
+        with mock.patch("sqlite3.connect", side_effect=sqlite3.OperationalError("ro")):
+            with self.assertRaises(StorageError):
+                SQLiteStorage(self.dir.name)
+
+
+class TestCli(IndexTestCase):
+
+    def test_sqlite_matches_files(self) -> None:
+        runner = CliRunner()
+        for args in ([], ["--tag", "ops"], ["--type", "pert"]):
+            root = ["--root", self.dir.name]
+            files = runner.invoke(entrypoint, root + args)
+            sqlite = runner.invoke(entrypoint, root + args + ["--storage", "sqlite"])
+            self.assertEqual(sqlite.exit_code, 0, sqlite.output)
+            self.assertEqual(sqlite.output, files.output)
+        self.assertIn("broken.forecast", sqlite.output)
+
+    def test_ties_come_by_file_name(self) -> None:
+        # Discovery lists the top level before subdirectories, so "b" comes
+        # before "a/x" unless ties are broken by file name
+        end = TODAY + datetime.timedelta(3)
+        self.write("b.forecast", forecast_text("b", "pert", [], end, False))
+        os.mkdir(os.path.join(self.dir.name, "a"))
+        self.write("a/x.forecast", forecast_text("a/x", "pert", [], end, False))
+        query = Query(type="pert", sort=parse_sort("end_date"))
+        files = names(list(FileStorage(self.dir.name).select(query)))
+        storage = SQLiteStorage(self.dir.name)
+        try:
+            sqlite = names(list(storage.select(query)))
+        finally:
+            storage.close()
+        self.assertEqual(files, sqlite)
+        self.assertLess(files.index("a/x"), files.index("b"))
+        runner = CliRunner()
+        root = ["--root", self.dir.name]
+        self.assertEqual(
+            runner.invoke(entrypoint, root).output,
+            runner.invoke(entrypoint, root + ["--storage", "sqlite"]).output,
+        )
+
+    def test_sqlite_rejects_other_modes(self) -> None:
+        result = CliRunner().invoke(
+            entrypoint, ["--storage", "sqlite", "--format", "csv"]
+        )
+        self.assertNotEqual(result.exit_code, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
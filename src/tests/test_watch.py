@@ -0,0 +1,156 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from forecast import watch
+from forecast.watch import ForecastState, InotifyWatcher, PollingWatcher
+
+
+def forecast_text(scenario: str, outcome: float = 5) -> str:
+    return (
+        f"---\nscenario: {scenario}\nend_date: 2025-01-01\ntype: interval\n"
+        f"min: 1\nmax: 10\nconfidence: 0.9\noutcome: {outcome}\n---\n"
+    )
+
+
+class WatchTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def write(self, filename: str, text: str) -> None:
+        path = os.path.join(self.dir.name, filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def remove(self, filename: str) -> None:
+        os.remove(os.path.join(self.dir.name, filename))
+
+
+class TestPollingWatcher(WatchTestCase):
+
+    def test_detects_changes(self) -> None:
+        self.write("a.forecast", forecast_text("a"))
+        watcher = PollingWatcher(self.dir.name, interval=0.01)
+        self.assertEqual(watcher.wait(0), set())
+
+        self.write("b.forecast", forecast_text("b"))
+        self.write("notes.txt", "ignored")
+        self.assertEqual(watcher.wait(1), {"b.forecast"})
+
+        self.remove("a.forecast")
+        self.assertEqual(watcher.wait(1), {"a.forecast"})
+
+    def test_searches_subdirectories(self) -> None:
+        watcher = PollingWatcher(self.dir.name, interval=0.01)
+        self.write("team/a.forecast", forecast_text("a"))
+        self.write("drafts/b.forecast", forecast_text("b"))
+        self.assertEqual(watcher.wait(1), {"team/a.forecast", "drafts/b.forecast"})
+        self.write(".gitignore", "drafts/\n")
+        self.assertEqual(watcher.wait(1), {"drafts/b.forecast"})
+
+
+class TestInotifyWatcher(WatchTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        try:
+            self.watcher = InotifyWatcher(self.dir.name)
+        except OSError:
+            self.skipTest("inotify is not available")
+        self.addCleanup(self.watcher.close)
+
+    def test_detects_changes(self) -> None:
+        self.assertEqual(self.watcher.wait(0), set())
+
+        self.write("a.forecast", forecast_text("a"))
+        self.write("notes.txt", "ignored")
+        self.assertEqual(self.watcher.wait(1), {"a.forecast"})
+
+        self.remove("a.forecast")
+        self.assertEqual(self.watcher.wait(1), {"a.forecast"})
+
+    def test_watches_new_subdirectories(self) -> None:
+        os.makedirs(os.path.join(self.dir.name, "team", "infra"))
+        self.assertEqual(self.watcher.wait(1), {"team/"})
+        self.write("team/infra/a.forecast", forecast_text("a"))
+        self.assertEqual(self.watcher.wait(1), {"team/infra/a.forecast"})
+        self.write("team/.forecastignore", "*.forecast\n")
+        self.assertEqual(self.watcher.wait(1), {"team/.forecastignore"})
+
+
+class TestForecastState(WatchTestCase):
+
+    def test_update_only_reloads_changed_files(self) -> None:
+        self.write("a.forecast", forecast_text("a"))
+        self.write("b.forecast", forecast_text("b"))
+        state = ForecastState(self.dir.name)
+        self.assertEqual(state.load_all(jobs=1), [])
+        self.assertEqual([f.scenario for f in state.view(None, None)], ["a", "b"])
+
+        self.write("b.forecast", forecast_text("b", outcome=50))
+        with mock.patch.object(watch, "load_file", wraps=watch.load_file) as load:
+            self.assertEqual(state.update({"b.forecast"}), [])
+        load.assert_called_once_with(self.dir.name, "b.forecast", False)
+        self.assertAlmostEqual(state.forecasts["b.forecast"].score(), 1.62)
+        self.assertAlmostEqual(state.forecasts["a.forecast"].score(), 0.02)
+
+    def test_update_drops_deleted_files(self) -> None:
+        self.write("a.forecast", forecast_text("a"))
+        state = ForecastState(self.dir.name)
+        state.load_all(jobs=1)
+        self.remove("a.forecast")
+        self.assertEqual(state.update({"a.forecast"}), [])
+        self.assertEqual(state.view(None, None), [])
+
+    def test_update_reports_broken_files(self) -> None:
+        self.write("a.forecast", forecast_text("a"))
+        state = ForecastState(self.dir.name)
+        state.load_all(jobs=1)
+        self.write("a.forecast", "---\nscenario: [unterminated\n---\n")
+        errors = state.update({"a.forecast"})
+        self.assertEqual([e.filename for e in errors], ["a.forecast"])
+        self.assertNotIn("a.forecast", state.forecasts)
+
+    def test_matches_discovery(self) -> None:
+        self.write("a.forecast", forecast_text("a"))
+        self.write("team/b.forecast", forecast_text("b"))
+        self.write("drafts/c.forecast", forecast_text("c"))
+        self.write(".gitignore", "drafts/\n")
+        state = ForecastState(self.dir.name)
+        state.load_all(jobs=1)
+        self.assertEqual(sorted(state.forecasts), ["a.forecast", "team/b.forecast"])
+        # Un-ignoring a directory loads its files, whichever names were reported
+        self.write(".gitignore", "")
+        self.remove("team/b.forecast")
+        state.update({".gitignore"})
+        self.assertEqual(sorted(state.forecasts), ["a.forecast", "drafts/c.forecast"])
+
+    def test_errors_persist_until_fixed(self) -> None:
+        self.write("a.forecast", forecast_text("a"))
+        self.write("broken.forecast", "---\nscenario: [unterminated\n---\n")
+        self.write("gone.forecast", "---\nscenario: [unterminated\n---\n")
+        state = ForecastState(self.dir.name)
+        errors = state.load_all(jobs=1)
+        self.assertEqual(
+            [e.filename for e in errors], ["broken.forecast", "gone.forecast"]
+        )
+        # An unrelated edit still reports the files that are broken
+        self.write("a.forecast", forecast_text("a", outcome=50))
+        errors = state.update({"a.forecast"})
+        self.assertEqual(
+            [e.filename for e in errors], ["broken.forecast", "gone.forecast"]
+        )
+        self.remove("gone.forecast")
+        self.write("broken.forecast", forecast_text("fixed"))
+        self.assertEqual(state.update({"broken.forecast", "gone.forecast"}), [])
+        self.assertIn("broken.forecast", state.forecasts)
+
+
+if __name__ == "__main__":
+    unittest.main()